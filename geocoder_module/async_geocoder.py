@@ -0,0 +1,867 @@
+import asyncio
+import copy
+import inspect
+import time
+from typing import Any, AsyncIterator, Dict, Generator, List, Tuple, Union
+
+import aiohttp
+from logger.logging import logging
+
+from geocoder_module.backends import Backend
+from geocoder_module.cassette import Cassette
+from geocoder_module.geocoder import Geocoder
+from geocoder_module.transport import (
+    RETRYABLE_STATUS_CODES,
+    UPSTREAM_SERVERS,
+    AdaptiveConcurrencyLimiter,
+    CircuitOpenError,
+    Endpoint,
+    backoff_delay,
+)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Asyncio version of transport.is_retryable, for the errors raised by aiohttp.
+
+    :param error:       exception raised by the query
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUS_CODES
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def is_upstream_failure(error: Exception) -> bool:
+    """
+    Asyncio version of transport.is_upstream_failure, for the errors raised
+    by aiohttp.
+
+    :param error:       exception raised by the query
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or is_retryable(error)
+    return is_retryable(error)
+
+
+class AsyncAdaptiveConcurrencyLimiter(AdaptiveConcurrencyLimiter):
+    """
+    Asyncio version of transport.AdaptiveConcurrencyLimiter,
+    it has to be created inside the running event loop.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: float, failed: bool) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._update(latency, failed)
+            self._condition.notify_all()
+
+
+class AsyncGeocoder(Geocoder):
+    def __init__(self, config: Dict[str, Any] = None) -> None:
+        """
+        This class is the asyncio version of the Geocoder module: it exposes
+        the same public methods as coroutines, so that it can be used inside
+        an event loop without blocking it while the upstream services answer.
+        All the queries share a single pool of connections and are bounded
+        by the max_concurrency config field.
+
+        :param config: dictionary of parameters overriding the default
+                       configuration (default None)
+        """
+        super().__init__(config)
+        self.session = None
+        self.semaphore = None
+
+    def _create_sessions(self) -> Dict[str, Any]:
+        """
+        The aiohttp session has to be created inside the running event loop,
+        so it is created with the first query (see _get_session).
+        """
+        return {}
+
+    def _create_executors(self) -> Tuple[None, None, None]:
+        """
+        The hits are validated, the hedged requests sent and the lists of
+        locations resolved concurrently inside the event loop, no thread
+        pool is needed.
+        """
+        return None, None, None
+
+    def _create_concurrency_limiters(self) -> Dict[str, Any]:
+        """
+        The adaptive concurrency limiters have to be created inside the
+        running event loop, so they are created with the first query
+        (see _get_session).
+        """
+        return {upstream: None for upstream in UPSTREAM_SERVERS}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        This function returns the aiohttp session shared by all the queries,
+        creating it alongside with the concurrency limit if needed.
+        """
+        if self.session is None or self.session.closed:
+            # every upstream can take all the queries in flight, pool_size
+            # only bounds the connections of the synchronous Geocoder
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.config["max_concurrency"],
+                    limit_per_host=self.config["max_concurrency"],
+                )
+            )
+            self.semaphore = asyncio.Semaphore(self.config["max_concurrency"])
+            if self.config["adaptive_concurrency"]:
+                self.concurrency_limiters = {
+                    upstream: AsyncAdaptiveConcurrencyLimiter(
+                        self.config["adaptive_concurrency_max"],
+                        self.config["adaptive_latency_target"],
+                    )
+                    for upstream in UPSTREAM_SERVERS
+                }
+        return self.session
+
+    async def close(self) -> None:
+        """
+        This function closes the session used to query the upstream
+        services, releasing all its open connections.
+        """
+        if self.session is not None:
+            await self.session.close()
+        for session in self.sessions.values():
+            session.close()
+        for executor in (
+            self.validation_executor,
+            self.hedge_executor,
+            self.query_executor,
+        ):
+            if executor is not None:
+                executor.shutdown(wait=False)
+        if self.persistent_cache is not None:
+            self.persistent_cache.close()
+        if self.cassette is not None and self.cassette.mode == Cassette.RECORD:
+            self.cassette.save()
+
+    async def __aenter__(self) -> "AsyncGeocoder":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _query_upstream(
+        self, upstream: str, endpoint: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        This function sends a query to one of the upstream services
+        through the shared session and returns the decoded json response.
+
+        :param upstream:    string, name of the upstream service
+                            ("photon" or "geonames")
+        :param endpoint:    string, key of the config field holding the
+                            api endpoint to query
+        :param params:      dictionary of query parameters
+        """
+        response = self._get_persistent_response(upstream, endpoint, params)
+        if response is not None:
+            return response
+
+        breaker = self.breakers[upstream]
+        connect_timeout, read_timeout = self.config["timeouts"][upstream]
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout
+        )
+
+        self._get_session()
+        for attempt in range(self.config["max_retries"] + 1):
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Circuit breaker of {upstream} is open")
+            try:
+                response = await self._send_query(
+                    upstream, self.config[endpoint], params, timeout
+                )
+            except Exception as error:
+                if not is_upstream_failure(error):
+                    # the upstream answered, the query itself is wrong
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if not is_retryable(error) or attempt == self.config["max_retries"]:
+                    raise
+                logging.warning(f"Retrying query to {upstream} after error: {error}")
+                await asyncio.sleep(
+                    backoff_delay(
+                        attempt,
+                        self.config["retry_backoff"],
+                        self.config["retry_backoff_max"],
+                    )
+                )
+                continue
+            breaker.record_success()
+            break
+
+        self._set_persistent_response(upstream, endpoint, params, response)
+        return response
+
+    async def _send_query(
+        self,
+        upstream: str,
+        path: str,
+        params: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout,
+    ) -> Dict[str, Any]:
+        """
+        Asyncio version of Geocoder._send_query.
+
+        :param upstream:    string, name of the upstream service
+        :param path:        string, api endpoint to query
+        :param params:      dictionary of query parameters
+        :param timeout:     aiohttp timeout of the query
+        """
+        if self.cassette is None:
+            return await self._send_to_replicas(upstream, path, params, timeout)
+
+        if self.cassette.mode == Cassette.REPLAY:
+            response, latency = self.cassette.play(upstream, path, params)
+            await asyncio.sleep(latency)
+            return self.json_loads(response)
+
+        start = time.monotonic()
+        response = await self._send_to_replicas(upstream, path, params, timeout)
+        self.cassette.record(upstream, path, params, response, time.monotonic() - start)
+        return response
+
+    async def _send_to_replicas(
+        self,
+        upstream: str,
+        path: str,
+        params: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout,
+    ) -> Dict[str, Any]:
+        """
+        Asyncio version of Geocoder._send_to_replicas, the slower of two
+        hedged queries is cancelled.
+
+        :param upstream:    string, name of the upstream service
+        :param path:        string, api endpoint to query
+        :param params:      dictionary of query parameters
+        :param timeout:     aiohttp timeout of the query
+        """
+        pool = self.endpoint_pools[upstream]
+        primary = pool.acquire()
+        if not self.config["hedged_requests"] or len(pool) < 2:
+            return await self._send_to_endpoint(
+                upstream, primary, path, params, timeout
+            )
+
+        tasks = {
+            asyncio.ensure_future(
+                self._send_to_endpoint(upstream, primary, path, params, timeout)
+            )
+        }
+        hedge_delay = pool.latency_percentile(self.config["hedge_percentile"])
+        done, _ = await asyncio.wait(
+            tasks, timeout=hedge_delay or self.config["hedge_delay"]
+        )
+        if not done:
+            secondary = pool.acquire(exclude=primary)
+            tasks.add(
+                asyncio.ensure_future(
+                    self._send_to_endpoint(upstream, secondary, path, params, timeout)
+                )
+            )
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    return await task
+                except Exception as error:
+                    last_error = error
+            raise last_error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send_to_endpoint(
+        self,
+        upstream: str,
+        endpoint: Endpoint,
+        path: str,
+        params: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout,
+    ) -> Dict[str, Any]:
+        """
+        Asyncio version of Geocoder._send_to_endpoint.
+
+        :param upstream:    string, name of the upstream service
+        :param endpoint:    replica acquired from the endpoint pool of the upstream
+        :param path:        string, api endpoint to query
+        :param params:      dictionary of query parameters
+        :param timeout:     aiohttp timeout of the query
+        """
+        rate_limiter = self.rate_limiters[upstream]
+        if rate_limiter is not None:
+            await asyncio.sleep(rate_limiter.reserve())
+
+        concurrency_limiter = self.concurrency_limiters[upstream]
+        if concurrency_limiter is not None:
+            await concurrency_limiter.acquire()
+        start = time.monotonic()
+        failed = True
+        try:
+            async with self.semaphore:
+                async with self._get_session().get(
+                    endpoint.url + path, params=params, timeout=timeout
+                ) as response:
+                    response.raise_for_status()
+                    response = self.json_loads(await response.read())
+            failed = False
+            return response
+        except asyncio.CancelledError:
+            # the hedged query was answered by another replica
+            failed = False
+            raise
+        except Exception as error:
+            failed = is_upstream_failure(error)
+            raise
+        finally:
+            latency = time.monotonic() - start
+            if concurrency_limiter is not None:
+                await concurrency_limiter.release(latency, failed)
+            self.endpoint_pools[upstream].release(endpoint, latency, failed)
+
+    async def check_endpoints(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Asyncio version of Geocoder.check_endpoints.
+        """
+        session = self._get_session()
+        for upstream, pool in self.endpoint_pools.items():
+            connect_timeout, read_timeout = self.config["timeouts"][upstream]
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=connect_timeout, sock_read=read_timeout
+            )
+            for endpoint in pool.endpoints:
+                try:
+                    async with session.get(endpoint.url, timeout=timeout) as response:
+                        healthy = response.status < 500
+                except Exception as error:
+                    logging.warning(
+                        f"Replica {endpoint.url} of {upstream} is down: {error}"
+                    )
+                    healthy = False
+                pool.mark(endpoint, healthy)
+        return self.endpoint_states()
+
+    async def _resolve(
+        self, operation: str, *args, skip: Backend = None
+    ) -> Tuple[Any, Union[Backend, None]]:
+        """
+        Asyncio version of Geocoder._resolve, the answers of the remote
+        tiers are awaited.
+
+        :param operation:   string, one of "search", "validate" and "reverse"
+        :param args:        arguments of the operation
+        :param skip:        Backend, tier already queried by the caller, left
+                            out of the chain but still offered the answer
+                            (default None)
+        """
+        missed = []
+        for backend in self.backend_chains[operation]:
+            if backend is skip:
+                missed.append(backend)
+                continue
+            counters = self.backend_counters[operation][backend.name]
+            start = time.perf_counter()
+            try:
+                result = getattr(backend, operation)(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as error:
+                counters.record(time.perf_counter() - start, error=True)
+                logging.error(f"Error in {operation} {args} on {backend.name}: {error}")
+                continue
+            counters.record(time.perf_counter() - start, hit=result is not None)
+            if result is not None:
+                for previous in missed:
+                    previous.store(operation, args, result)
+                return result, backend
+            missed.append(backend)
+        return None, None
+
+    async def _get_geonames_info(
+        self, location: str, country: str
+    ) -> List[Dict[str, any]]:
+        """
+        Asyncio version of Geocoder._get_geonames_info.
+
+        :param location:       string that represents the location to query for
+        :param country:        string that represents the country where to search
+                               the input location
+        """
+        try:
+            response = await self._query_upstream(
+                "geonames",
+                "geonames_api_endpoint",
+                {"country": country.lower(), "local_location": location.lower()},
+            )
+        except Exception as error:
+            logging.error(f"Error in querying location {location}: {error} ")
+            return []
+        return self._parse_geonames_response(response, country)
+
+    async def _get_geocode_info(
+        self,
+        location: str,
+        best_matching: bool = True,
+        country: str = None,
+        lat: float = None,
+        lon: float = None,
+        location_bias_scale: float = 0.1,
+    ) -> List[Dict[str, any]]:
+        """
+        Asyncio version of Geocoder._get_geocode_info.
+
+        :param location:       string that represents the location to query for
+        :param best_matching:  bool, if True the first results is returend,
+                               otherwise all the results are returned
+                               (default True)
+        :param country:        string that represents the country where to search
+                               the input location (default None)
+        :params lat:        float representing the latitude coordinates
+        :params lon:        float representing the longiture coordinates
+        """
+        results, _ = await self._resolve(
+            "search", location, best_matching, country, lat, lon, location_bias_scale
+        )
+        return results if results is not None else []
+
+    async def _search_photon(
+        self,
+        location: str,
+        best_matching: bool = True,
+        country: str = None,
+        lat: float = None,
+        lon: float = None,
+        location_bias_scale: float = 0.1,
+    ) -> List[Dict[str, any]]:
+        """
+        Asyncio version of Geocoder._search_photon.
+
+        :param location:       string that represents the location to query for
+        :param best_matching:  bool, if True the first results is returend,
+                               otherwise all the results are returned
+                               (default True)
+        :param country:        string that represents the country where to search
+                               the input location (default None)
+        :params lat:        float representing the latitude coordinates
+        :params lon:        float representing the longiture coordinates
+        """
+        query_params = self._build_geocode_params(
+            location, lat, lon, location_bias_scale, best_matching, country
+        )
+        response = await self._query_upstream(
+            "photon", "url_api_endpoint", query_params
+        )
+        return self._parse_geocode_response(response, location, best_matching, country)
+
+    async def _validate_locations(
+        self,
+        initial_results: List[Dict[str, any]],
+        location: str,
+        backend: Backend = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Asyncio version of Geocoder._validate_locations, every distinct
+        (name, country) pair is validated concurrently.
+
+        :params initial_results:        List of locations obtained from the Photon geocoder
+        :params locations:              String of containing location to be validated
+        :params backend:                tier of the search chain that found the hits
+                                        (default None)
+        """
+        # Check for initial results
+        if not initial_results:
+            logging.warning(
+                f"Can't validate location {location}. Empty Geocoder hits: {initial_results}"
+            )
+            return []
+        for geocode_hit in initial_results:
+            logging.info(f"Validating location {location}. Geocoder hit: {geocode_hit}")
+        # Validate with geonames the hits not decided by the policies
+        verdicts, validation_keys = self._decide_validation(initial_results, backend)
+        verdicts.update(
+            zip(
+                validation_keys,
+                await asyncio.gather(
+                    *[
+                        self._validate_name_country(*key, skip=self.policy_cache_tier)
+                        for key in validation_keys
+                    ]
+                ),
+            )
+        )
+        return self._collect_validated_hits(initial_results, verdicts, location)
+
+    async def _validate_name_country(
+        self, name: str, country: str, skip: Backend = None
+    ) -> bool:
+        """
+        Asyncio version of Geocoder._validate_name_country.
+
+        :params name:       normalized name of the location to validate
+        :params country:    normalized name of its country
+        :params skip:       Backend, tier of the validation chain already
+                            queried (default None)
+        """
+        verdict, _ = await self._resolve("validate", name, country, skip=skip)
+        return bool(verdict)
+
+    async def _validate_with_geonames(self, name: str, country: str) -> bool:
+        """
+        Asyncio version of Geocoder._validate_with_geonames.
+
+        :params name:       normalized name of the location to validate
+        :params country:    normalized name of its country
+        """
+        response = await self._query_upstream(
+            "geonames",
+            "geonames_api_endpoint",
+            {"country": country, "local_location": name},
+        )
+        return self._is_validated(
+            name, country, self._parse_geonames_response(response, country)
+        )
+
+    async def get_location_info(
+        self,
+        location: str,
+        best_matching: bool = True,
+        country: str = None,
+        lat: str = None,
+        lon: str = None,
+        location_bias_scale: float = 0.1,
+        validate: bool = True,
+    ) -> List[Dict[str, any]]:
+        """
+        Asyncio version of Geocoder.get_location_info.
+
+        :param location:       string that represents the location to query for
+        :param best_matching:  bool, if True the first results is returend,
+                               otherwise all the results are returned
+                               (default True)
+        :param country:        string that represents the country where to search
+                               the input location (default None)
+        :params lat:           float representing the latitude coordinates
+        :params lon:           float representing the longiture coordinates
+        :location_bias_scale:  float representing the amount of location bias
+                               desired towards coordinates. lower values represent more narrow search
+        :validate:             boolean that trigger validation process using geonames server
+        """
+        # Check validity of location
+        location = self.check_valid_location(location)
+        if location is False:
+            return []
+        # Query geocoder to find the best location in photon for that particular query
+        initial_results, backend = await self._resolve(
+            "search", location, best_matching, country, lat, lon, location_bias_scale
+        )
+        # Validate result with geonames service
+        if validate:
+            return await self._validate_locations(
+                initial_results or [], location, backend
+            )
+
+        return initial_results or []
+
+    async def _get_location_info_safe(
+        self, query: Tuple[str, str, float, float], **kwargs
+    ) -> Tuple[Tuple[str, str, float, float], List[Dict[str, Any]]]:
+        """
+        Asyncio version of Geocoder._get_location_info_safe, the query is
+        returned alongside with its result.
+
+        :params query:      tuple of location, country, latitude and longitude
+        :params kwargs:     parameters forwarded to get_location_info
+        """
+        location, country, lat, lon = query
+        try:
+            result = await self.get_location_info(
+                location, country=country, lat=lat, lon=lon, **kwargs
+            )
+        except Exception as error:
+            logging.error(f"Error in querying location {location}: {error}")
+            result = []
+        return query, result
+
+    async def iter_location_info_many(
+        self,
+        locations: List[Union[str, Dict[str, Any]]],
+        best_matching: bool = True,
+        location_bias_scale: float = 0.1,
+        validate: bool = True,
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Asyncio version of Geocoder.iter_location_info_many, the concurrency
+        is bounded by the max_concurrency config field.
+
+        :params locations:              list of strings or dictionaries
+                                        representing the locations to query for
+        :params best_matching:          bool, if True the first results is returned,
+                                        otherwise all the results are returned
+        :params location_bias_scale:    float representing the amount of location bias
+                                        desired towards coordinates
+        :params validate:               boolean that trigger validation process
+                                        using geonames server
+        """
+        positions = self._location_queries_positions(locations)
+        for future in asyncio.as_completed(
+            [
+                self._get_location_info_safe(
+                    query,
+                    best_matching=best_matching,
+                    location_bias_scale=location_bias_scale,
+                    validate=validate,
+                )
+                for query in positions
+            ]
+        ):
+            query, result = await future
+            first, *others = positions[query]
+            yield first, result
+            for index in others:
+                yield index, copy.deepcopy(result)
+
+    async def get_location_info_many(
+        self,
+        locations: List[Union[str, Dict[str, Any]]],
+        best_matching: bool = True,
+        location_bias_scale: float = 0.1,
+        validate: bool = True,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Asyncio version of Geocoder.get_location_info_many, the concurrency
+        is bounded by the max_concurrency config field.
+
+        :params locations:              list of strings or dictionaries
+                                        representing the locations to query for
+        :params best_matching:          bool, if True the first results is returned,
+                                        otherwise all the results are returned
+        :params location_bias_scale:    float representing the amount of location bias
+                                        desired towards coordinates
+        :params validate:               boolean that trigger validation process
+                                        using geonames server
+        """
+        results = [[] for _ in locations]
+        async for index, result in self.iter_location_info_many(
+            locations, best_matching, location_bias_scale, validate
+        ):
+            results[index] = result
+        return results
+
+    async def _get_reverse_info(
+        self, lat: float, lon: float, radius: float = 50, skip: Backend = None
+    ):
+        """
+        Asyncio version of Geocoder._get_reverse_info.
+
+        :params lat:        float representing the latitude coordinates
+        :params lon:        float representing the longiture coordinates
+        :params radius:     float representing the radius around the coordinates
+        :params skip:       Backend, tier of the reverse chain already queried
+                            (default None)
+        """
+        location, _ = await self._resolve("reverse", lat, lon, radius, skip=skip)
+        return location if location is not None else {}
+
+    async def _reverse_photon(
+        self, lat: float, lon: float, radius: float = 50
+    ) -> Dict[str, Any]:
+        """
+        Asyncio version of Geocoder._reverse_photon.
+
+        :params lat:        float representing the latitude coordinates
+        :params lon:        float representing the longiture coordinates
+        :params radius:     float representing the radius around the coordinates
+        """
+        response = await self._query_upstream(
+            "photon",
+            "url_reverse_endpoint",
+            {
+                "lat": lat,
+                "lon": lon,
+                "radius": radius,
+                "lang": self.config["lang"],
+            },
+        )
+        return self._parse_reverse_response(response, lat, lon)
+
+    async def get_location_from_coordinates(
+        self,
+        lat: float,
+        lon: float,
+        radius: float = 50,
+    ) -> Dict[str, Any]:
+        """
+        Asyncio version of Geocoder.get_location_from_coordinates.
+
+        :params lat:                    float representing the latitude coordinates
+        :params lon:                    float representing the longiture coordinates
+        :params radius:                 float representing the radius around the coordinates
+        """
+        return await self._get_reverse_info(lat, lon, radius)
+
+    async def get_locations_from_coordinates(
+        self,
+        coordinates: List[Tuple[float, float]],
+        radius: float = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Asyncio version of Geocoder.get_locations_from_coordinates, the
+        concurrency is bounded by the max_concurrency config field.
+
+        :params coordinates:    list of (latitude, longitude) pairs
+        :params radius:         float representing the radius around the coordinates
+        """
+        results, offline_backend = self._get_offline_reverse_info_many(
+            coordinates, radius
+        )
+        missing = [index for index, location in enumerate(results) if location is None]
+        positions = self._coordinates_cells_positions(
+            [coordinates[index] for index in missing], radius
+        )
+        cells_locations = await asyncio.gather(
+            *[
+                self._get_reverse_info(
+                    *coordinates[missing[indexes[0]]], radius, skip=offline_backend
+                )
+                for indexes in positions.values()
+            ]
+        )
+        for indexes, location in zip(positions.values(), cells_locations):
+            first, *others = indexes
+            results[missing[first]] = location
+            for index in others:
+                results[missing[index]] = copy.deepcopy(location)
+        return results
+
+    async def _run_location_queries(self, steps: Generator) -> Any:
+        """
+        Asyncio version of Geocoder._run_location_queries, the distinct
+        queries of every list yielded by the generator that were not
+        resolved yet are resolved concurrently.
+
+        :params steps:      generator yielding lists of (name, country) queries
+        """
+        resolved = {}
+        try:
+            queries = next(steps)
+            while True:
+                pending = self._pending_location_queries(queries, resolved)
+                if pending:
+                    results = await self.get_location_info_many(
+                        [
+                            {"location": name, "country": country}
+                            for name, country in pending
+                        ]
+                    )
+                    resolved.update(zip(pending, results))
+                queries = steps.send(
+                    [copy.deepcopy(resolved[query]) for query in queries]
+                )
+        except StopIteration as stop:
+            return stop.value
+
+    async def update_mapping_countries(
+        self,
+        mapping_countries: Dict[str, any],
+        name: str,
+        old_country: str,
+        new_country: str,
+    ):
+        """
+        Asyncio version of Geocoder.update_mapping_countries.
+
+        :params mapping_countries:          Dictionary of locations to be updated
+        :params name:                       String of Local Location to be updated
+        :params old_country:                String of Country to be updated
+        :params new_country:                String containing country to be used
+                                            to update mappings_country dictionary
+        """
+        return await self._run_location_queries(
+            self._update_mapping_countries_steps(
+                mapping_countries, [(name, old_country, new_country)]
+            )
+        )
+
+    async def double_check_countries(
+        self,
+        locations: List[Dict[str, any]],
+        ner_tags: List[Dict[str, any]],
+        top_countries: int = None,
+    ) -> List[Dict[str, any]]:
+        """
+        Asyncio version of Geocoder.double_check_countries.
+
+        :param locations:           list of dictionaries that represents a location
+                                    as produced by the get_location_info method
+        :param top_countries:       integer that put a maximum bound on the
+                                    number of countries to check as a reference
+        :param ner_location_tags:   list of ner tags associated to locations to
+                                    be filtered to countries
+        """
+        if self.config["double_check_mode"] == "lattice":
+            return await self.disambiguate_countries(locations, ner_tags)
+        return await self._run_location_queries(
+            self._double_check_countries_steps(locations, ner_tags, top_countries)
+        )
+
+    async def disambiguate_countries(
+        self,
+        locations: List[Dict[str, any]],
+        ner_tags: List[Dict[str, any]],
+        validate: bool = True,
+    ) -> List[Dict[str, any]]:
+        """
+        Asyncio version of Geocoder.disambiguate_countries.
+
+        :param locations:           list of dictionaries that represents a location
+                                    as produced by the get_location_info method
+        :param ner_tags:            list of ner tags associated to locations to
+                                    be filtered to countries
+        :param validate:            bool, if True the candidates are validated
+                                    with the geonames service, as the queries
+                                    of double_check_countries (default True)
+        """
+        names = self._lattice_queries(locations)
+        candidates = await self.get_location_info_many(
+            names, best_matching=False, validate=validate
+        )
+        return self._assign_lattice_candidates(
+            locations, ner_tags, dict(zip(names, candidates))
+        )
+
+    async def update_country_for_locations(
+        self,
+        locations: List[Dict[str, Any]],
+        mapping_countries: Dict[str, int],
+        only_countries: Dict,
+    ) -> List[Dict[str, Any]]:
+        """
+        Asyncio version of Geocoder.update_country_for_locations.
+
+        :params locations:          List of locations to be updated
+        :params mapping_countries:  Dict containing mappings between local locations and countries
+        :params only_countries:     Dict containing only country locations
+        """
+        return await self._run_location_queries(
+            self._update_country_for_locations_steps(
+                locations, mapping_countries, only_countries
+            )
+        )
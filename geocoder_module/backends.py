@@ -0,0 +1,306 @@
+import threading
+from typing import Any, Dict, List, Tuple, Union
+
+from geocoder_module.countries import CountryResolver
+from geocoder_module.gazetteer import Gazetteer
+from geocoder_module.reverse import ReverseGeocoder
+
+OPERATIONS = ("search", "validate", "reverse")
+
+# Tiers queried, in order, by every operation of the geocoder
+DEFAULT_BACKEND_CHAINS = {
+    "search": ["countries", "cache", "gazetteer", "photon"],
+    "validate": ["countries", "cache", "gazetteer", "geonames"],
+    "reverse": ["cache", "gazetteer", "photon"],
+}
+
+
+class Backend:
+    name = None
+
+    def __init__(self, authoritative: bool = False) -> None:
+        """
+        This class is the interface of a tier of the resolution chains of the
+        geocoder. Every operation returns None when the tier cannot answer the
+        query, so that the next tier of the chain is queried; any other value,
+        including empty results, is the answer of the chain. Remote tiers can
+        return coroutines, awaited by the AsyncGeocoder.
+
+        :param authoritative:   bool, if True the locations found by the tier
+                                are not validated with Geonames (default False)
+        """
+        self.authoritative = authoritative
+
+    def supports(self, operation: str) -> bool:
+        """
+        This function returns True if the tier can answer the operation
+        passed in input, tiers that cannot are left out of the chains.
+
+        :param operation:   string, one of "search", "validate" and "reverse"
+        """
+        return getattr(type(self), operation) is not getattr(Backend, operation)
+
+    def search(
+        self,
+        location: str,
+        best_matching: bool,
+        country: str,
+        lat: float,
+        lon: float,
+        location_bias_scale: float,
+    ) -> Union[List[Dict[str, Any]], None]:
+        """
+        This function returns the locations matching the query, formatted as
+        the results of Geocoder._get_geocode_info.
+        """
+        return None
+
+    def validate(self, name: str, country: str) -> Union[bool, None]:
+        """
+        This function returns True if a location with the normalized name
+        exists in the normalized country, False if it does not.
+        """
+        return None
+
+    def reverse(
+        self, lat: float, lon: float, radius: float
+    ) -> Union[Dict[str, Any], None]:
+        """
+        This function returns the location found at the coordinates, formatted
+        as the results of Geocoder.get_location_from_coordinates.
+        """
+        return None
+
+    def store(self, operation: str, args: Tuple, result: Any) -> None:
+        """
+        This function is called with the answer of a later tier of the chain
+        when this tier could not answer, e.g. to fill a cache.
+
+        :param operation:   string, name of the operation
+        :param args:        tuple of the arguments of the operation
+        :param result:      answer of the chain
+        """
+
+
+class CacheBackend(Backend):
+    name = "cache"
+
+    def __init__(self, geocoder: Any, authoritative: bool = False) -> None:
+        """
+        This class is the tier of the in-memory caches of the geocoder,
+        filled with the answers of the following tiers. Every operation is
+        supported only when its cache is enabled.
+
+        :param geocoder:        Geocoder owning the caches
+        :param authoritative:   bool, if True the cached locations are not
+                                validated with Geonames (default False)
+        """
+        super().__init__(authoritative)
+        self.geocoder = geocoder
+        self.caches = {
+            "search": geocoder.photon_cache,
+            "validate": geocoder.validation_cache,
+            "reverse": geocoder.reverse_cache,
+        }
+
+    def supports(self, operation: str) -> bool:
+        return self.caches[operation] is not None
+
+    def _key(self, operation: str, args: Tuple) -> Tuple:
+        if operation == "search":
+            location, best_matching, country, lat, lon, location_bias_scale = args
+            query_params = self.geocoder._geocode_query_params(
+                location, lat, lon, location_bias_scale, best_matching, country
+            )
+            return self.geocoder._geocode_cache_key(
+                query_params, best_matching, country
+            )
+        if operation == "reverse":
+            return self.geocoder._reverse_cache_key(*args)
+        return args
+
+    def search(self, *args) -> Union[List[Dict[str, Any]], None]:
+        return self.caches["search"].get(self._key("search", args))
+
+    def validate(self, *args) -> Union[bool, None]:
+        return self.caches["validate"].get(self._key("validate", args))
+
+    def reverse(self, *args) -> Union[Dict[str, Any], None]:
+        return self.caches["reverse"].get(self._key("reverse", args))
+
+    def store(self, operation: str, args: Tuple, result: Any) -> None:
+        self.caches[operation].set(self._key(operation, args), result)
+
+
+class CountryBackend(Backend):
+    name = "countries"
+
+    def __init__(self, resolver: CountryResolver, authoritative: bool = False) -> None:
+        """
+        This class is the tier of the local country resolver: it answers the
+        searches of country names and acronyms, and validates the countries
+        themselves, so that country mentions never reach the upstream services.
+
+        :param resolver:        CountryResolver built from the shipped files
+        :param authoritative:   bool, if True the countries found are not
+                                validated with Geonames (default False)
+        """
+        super().__init__(authoritative)
+        self.resolver = resolver
+
+    def search(
+        self,
+        location: str,
+        best_matching: bool,
+        country: str,
+        lat: float,
+        lon: float,
+        location_bias_scale: float,
+    ) -> Union[List[Dict[str, Any]], None]:
+        return self.resolver.lookup(location, country) or None
+
+    def validate(self, name: str, country: str) -> Union[bool, None]:
+        key = self.resolver.resolve(name)
+        return True if key is not None and key == country else None
+
+
+class GazetteerBackend(Backend):
+    name = "gazetteer"
+
+    def __init__(
+        self,
+        gazetteer: Gazetteer = None,
+        reverse_geocoder: ReverseGeocoder = None,
+        authoritative: bool = False,
+    ) -> None:
+        """
+        This class is the tier of the offline gazetteer: it answers the
+        searches and validations of the places it knows, and the reverse
+        queries when the offline reverse geocoder is enabled.
+        Searches biased towards coordinates are left to the following tiers.
+
+        :param gazetteer:           Gazetteer, None disables the tier (default None)
+        :param reverse_geocoder:    ReverseGeocoder over the gazetteer, None
+                                    disables the reverse queries (default None)
+        :param authoritative:       bool, if True the locations found in the
+                                    gazetteer are not validated with Geonames
+                                    (default False)
+        """
+        super().__init__(authoritative)
+        self.gazetteer = gazetteer
+        self.reverse_geocoder = reverse_geocoder
+
+    def supports(self, operation: str) -> bool:
+        if operation == "reverse":
+            return self.reverse_geocoder is not None
+        return self.gazetteer is not None
+
+    def search(
+        self,
+        location: str,
+        best_matching: bool,
+        country: str,
+        lat: float,
+        lon: float,
+        location_bias_scale: float,
+    ) -> Union[List[Dict[str, Any]], None]:
+        if lat and lon:
+            return None
+        return self.gazetteer.lookup(location, country, best_matching) or None
+
+    def validate(self, name: str, country: str) -> Union[bool, None]:
+        # unknown places can still exist, the following tiers decide
+        return True if self.gazetteer.lookup(name, country) else None
+
+    def reverse(
+        self, lat: float, lon: float, radius: float
+    ) -> Union[Dict[str, Any], None]:
+        return self.reverse_geocoder.lookup(lat, lon, radius) or None
+
+
+class PhotonBackend(Backend):
+    name = "photon"
+
+    def __init__(self, geocoder: Any, authoritative: bool = False) -> None:
+        """
+        This class is the tier of the Photon geocoder, queried through
+        the upstream transport of the geocoder.
+
+        :param geocoder:        Geocoder sending the queries
+        :param authoritative:   bool, if True the locations found by Photon are
+                                not validated with Geonames (default False)
+        """
+        super().__init__(authoritative)
+        self.geocoder = geocoder
+
+    def search(self, *args) -> Any:
+        return self.geocoder._search_photon(*args)
+
+    def reverse(self, *args) -> Any:
+        return self.geocoder._reverse_photon(*args)
+
+
+class GeonamesBackend(Backend):
+    name = "geonames"
+
+    def __init__(self, geocoder: Any, authoritative: bool = False) -> None:
+        """
+        This class is the tier of the Geonames service, queried through
+        the upstream transport of the geocoder.
+
+        :param geocoder:        Geocoder sending the queries
+        :param authoritative:   bool, unused as the tier only validates
+                                (default False)
+        """
+        super().__init__(authoritative)
+        self.geocoder = geocoder
+
+    def validate(self, *args) -> Any:
+        return self.geocoder._validate_with_geonames(*args)
+
+
+class BackendStats:
+    def __init__(self) -> None:
+        """
+        This class counts the queries sent to a tier of a resolution chain:
+        the queries it answered (hits), the ones it passed to the following
+        tiers (misses) and the failed ones (errors), alongside with the time
+        spent in the tier. It can be shared by several threads.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.latency = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, hit: bool = False, error: bool = False) -> None:
+        """
+        This function records a query sent to the tier.
+
+        :param latency:     float, seconds spent in the tier
+        :param hit:         bool, True if the tier answered the query
+        :param error:       bool, True if the query failed
+        """
+        with self._lock:
+            if error:
+                self.errors += 1
+            elif hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.latency += latency
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        This function returns the counters of the tier alongside with the
+        mean latency of its queries, in seconds.
+        """
+        with self._lock:
+            calls = self.hits + self.misses + self.errors
+            return {
+                "calls": calls,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "mean_latency": self.latency / calls if calls else 0.0,
+            }
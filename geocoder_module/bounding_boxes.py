@@ -0,0 +1,156 @@
+from logger.logging import logging
+from typing import Dict, Tuple
+
+import numpy as np
+
+from geocoder_module.distances import _as_array, pairwise_distances
+from geocoder_module.utils import EARTH_RADIUS
+
+
+def sanitize_bounding_boxes(
+    bounding_boxes: np.ndarray,
+) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    This is the vectorized version of utils.gps_sanity_check: it swaps the
+    corners of the bounding boxes so that every box is (min lon, max lat,
+    max lon, min lat). Instead of a warning for every box changed, the number
+    of boxes whose longitudes and latitudes were swapped is returned and
+    logged once.
+
+    :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+    """
+    bounding_boxes = _as_array(bounding_boxes, 4).copy()
+
+    flipped_longitudes = ~(bounding_boxes[:, 0] < bounding_boxes[:, 2])
+    bounding_boxes[flipped_longitudes] = bounding_boxes[flipped_longitudes][
+        :, [2, 1, 0, 3]
+    ]
+    flipped_latitudes = ~(bounding_boxes[:, 1] > bounding_boxes[:, 3])
+    bounding_boxes[flipped_latitudes] = bounding_boxes[flipped_latitudes][
+        :, [0, 3, 2, 1]
+    ]
+
+    counts = {
+        "longitudes": int(flipped_longitudes.sum()),
+        "latitudes": int(flipped_latitudes.sum()),
+    }
+    if counts["longitudes"] or counts["latitudes"]:
+        logging.warning(
+            "{} of {} bounding boxes were not in the right format, changed them! "
+            "({} swapped longitudes, {} swapped latitudes)".format(
+                int((flipped_longitudes | flipped_latitudes).sum()),
+                len(bounding_boxes),
+                counts["longitudes"],
+                counts["latitudes"],
+            )
+        )
+    return bounding_boxes, counts
+
+
+def edit_bounding_boxes(
+    bounding_boxes: np.ndarray,
+    distances_to_add: np.ndarray = 50000,
+    add: bool = True,
+) -> np.ndarray:
+    """
+    This is the vectorized version of utils.edit_bounding_box: it increases
+    or decreases the diagonal of every bounding box by the corresponding
+    distance, then sanitizes the boxes.
+
+    :param bounding_boxes:      array of shape (N, 4) of bounding boxes
+    :param distances_to_add:    float or array of N floats, distances in
+                                meters added to the diagonals (default 50000)
+    :param add:                 bool value if True the distances are added
+                                otherwise are subtracted
+    """
+    bounding_boxes = _as_array(bounding_boxes, 4)
+
+    dist = np.asarray(distances_to_add, dtype=np.float64) / 2
+    dist = -dist if not add else dist
+
+    m = 1 / ((2 * np.pi / 360) * EARTH_RADIUS)
+
+    lon_1, lat_1, lon_2, lat_2 = bounding_boxes.T
+    edited = np.stack(
+        [
+            lon_1 - (dist * m) / np.cos(np.radians(lat_1)),
+            lat_1 + dist * m,
+            lon_2 + (dist * m) / np.cos(np.radians(lat_2)),
+            lat_2 - dist * m,
+        ],
+        axis=1,
+    )
+    return sanitize_bounding_boxes(edited)[0]
+
+
+def enlarge_bounding_boxes(bounding_boxes: np.ndarray, distance: float) -> np.ndarray:
+    """
+    This is the vectorized version of Geocoder.enlarge_bounding_box: the
+    bounding boxes whose diagonal is shorter than the distance passed in
+    input are enlarged until it reaches the distance, the others are
+    returned unchanged.
+
+    :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+    :param distance:        float, required distance in meters between
+                            the corners of the bounding boxes
+    """
+    bounding_boxes = _as_array(bounding_boxes, 4)
+    diagonals = pairwise_distances(bounding_boxes[:, :2], bounding_boxes[:, 2:])
+    small = ~(diagonals > distance)
+
+    enlarged = bounding_boxes.copy()
+    if small.any():
+        enlarged[small] = edit_bounding_boxes(
+            bounding_boxes[small], distance - diagonals[small], add=True
+        )
+    return enlarged
+
+
+def merge_bounding_boxes(
+    bounding_boxes: np.ndarray, groups: np.ndarray = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This is the vectorized version of Geocoder.merge_bounding_boxes: it merges
+    the bounding boxes sharing the same group, producing their union, and
+    returns the merged boxes alongside with the sorted distinct groups they
+    belong to.
+
+    :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+    :param groups:          array of N group labels, None merges all the
+                            boxes together (default None)
+    """
+    bounding_boxes = _as_array(bounding_boxes, 4)
+    if groups is None:
+        groups = np.zeros(len(bounding_boxes), dtype=np.int64)
+    labels, group_ids = np.unique(np.asarray(groups), return_inverse=True)
+
+    merged = np.empty((len(labels), 4))
+    merged[:, [0, 3]] = np.inf
+    merged[:, [1, 2]] = -np.inf
+    for column, reduce in ((0, np.minimum), (1, np.maximum)):
+        reduce.at(merged[:, column], group_ids, bounding_boxes[:, column])
+    for column, reduce in ((2, np.maximum), (3, np.minimum)):
+        reduce.at(merged[:, column], group_ids, bounding_boxes[:, column])
+
+    return sanitize_bounding_boxes(merged)[0], labels
+
+
+def check_large_bounding_boxes(
+    bounding_boxes: np.ndarray, threshold: float = 175
+) -> np.ndarray:
+    """
+    This is the vectorized version of Geocoder.check_large_bounding_box: it
+    flags the bounding boxes with a pair of coordinates below -threshold and
+    above threshold at the two ends, as the boxes spanning the antimeridian.
+
+    :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+    :param threshold:       float refering to the limit in which a bounding
+                            box is considered too large (default 175)
+    """
+    bounding_boxes = _as_array(bounding_boxes, 4)
+    threshold = abs(threshold)
+
+    low = bounding_boxes <= -threshold
+    high = bounding_boxes >= threshold
+    # (x1, x2) and (y1, y2), in any order
+    return ((low[:, :2] & high[:, 2:]) | (low[:, 2:] & high[:, :2])).any(axis=1)
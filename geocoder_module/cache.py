@@ -0,0 +1,266 @@
+import os
+import copy
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = None) -> None:
+        """
+        This class is a bounded in-memory cache: when it is full the least
+        recently used entry is evicted, and entries older than ttl seconds
+        are discarded. It can be shared by several threads.
+        Values are copied when stored and when returned, so that callers
+        can freely modify them.
+
+        :param maxsize:     int, maximum number of entries (default 1024)
+        :param ttl:         float, number of seconds an entry is valid,
+                            None means entries never expire (default None)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        This function returns the value stored for the key passed in input,
+        or the default value if the key is missing or expired.
+
+        :param key:         hashable key of the entry
+        :param default:     value returned on a miss (default None)
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] is not None and item[0] <= time.monotonic():
+                del self._data[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(item[1])
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        This function stores a value for the key passed in input, evicting
+        the least recently used entries if the cache is full.
+
+        :param key:         hashable key of the entry
+        :param value:       value to be stored
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        This function removes all the entries and resets the counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        This function returns the hit and miss counters alongside
+        with the current and maximum size of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    def __init__(
+        self, path: str, version: str = "1", ttl: float = None, timeout: float = 30.0
+    ) -> None:
+        """
+        This class is a persistent cache of json serializable values stored
+        in a SQLite database in WAL mode, so that it can be read and written
+        by several threads and processes at the same time and survives
+        between runs. Entries are grouped by namespace and tagged with the
+        version passed in input: entries with a different version are
+        ignored and can be removed in bulk with invalidate.
+
+        :param path:        string path of the SQLite database file
+        :param version:     string tag stored with every entry, it has to be
+                            changed when the schema of the cached values or the
+                            upstream data change (default "1")
+        :param ttl:         float, number of seconds an entry is valid,
+                            None means entries never expire (default None)
+        :param timeout:     float, number of seconds to wait for a lock held
+                            by another process (default 30.0)
+        """
+        self.path = path
+        self.version = str(version)
+        self.ttl = ttl
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # connections opened by every thread, closed together by close
+        self._connections = []
+        self._generation = 0
+
+        self._connection().execute("""CREATE TABLE IF NOT EXISTS responses (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                version TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )""")
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        This function returns the connection of the current thread, opening
+        a new one for new threads, for processes forked from this one and
+        after the connections were closed. Every connection is only used by
+        the thread that opened it, but it can be closed by any thread.
+        """
+        connection = getattr(self._local, "connection", None)
+        if (
+            connection is None
+            or self._local.pid != os.getpid()
+            or self._local.generation != self._generation
+        ):
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with self._lock:
+                self._connections.append((os.getpid(), connection))
+                self._local.generation = self._generation
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        """
+        This function returns the value stored for the key passed in input,
+        or the default value if the key is missing, expired or was stored
+        with a different version.
+
+        :param namespace:   string that groups the entries, e.g. the upstream
+        :param key:         json serializable key of the entry
+        :param default:     value returned on a miss (default None)
+        """
+        row = (
+            self._connection()
+            .execute(
+                "SELECT created_at, value FROM responses "
+                "WHERE namespace = ? AND key = ? AND version = ?",
+                (namespace, json.dumps(key), self.version),
+            )
+            .fetchone()
+        )
+        if row is None or (self.ttl is not None and row[0] + self.ttl <= time.time()):
+            self._count(hit=False)
+            return default
+        self._count(hit=True)
+        return json.loads(row[1])
+
+    def set(self, namespace: str, key: Hashable, value: Any) -> None:
+        """
+        This function stores a value for the key passed in input.
+
+        :param namespace:   string that groups the entries, e.g. the upstream
+        :param key:         json serializable key of the entry
+        :param value:       json serializable value to be stored
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (namespace, json.dumps(key), self.version, time.time(), json.dumps(value)),
+        )
+
+    def invalidate(self, namespace: str = None) -> int:
+        """
+        This function removes the entries stored with a version different
+        from the current one, returning how many entries were removed.
+
+        :param namespace:   string, if given only the entries of this
+                            namespace are removed (default None)
+        """
+        query = "DELETE FROM responses WHERE version != ?"
+        params = (self.version,)
+        if namespace is not None:
+            query += " AND namespace = ?"
+            params += (namespace,)
+        return self._connection().execute(query, params).rowcount
+
+    def clear(self, namespace: str = None) -> None:
+        """
+        This function removes all the entries and resets the counters.
+
+        :param namespace:   string, if given only the entries of this
+                            namespace are removed (default None)
+        """
+        if namespace is None:
+            self._connection().execute("DELETE FROM responses")
+        else:
+            self._connection().execute(
+                "DELETE FROM responses WHERE namespace = ?", (namespace,)
+            )
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        This function returns the hit and miss counters of this process
+        alongside with the number of entries stored with the current version.
+        """
+        size = (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM responses WHERE version = ?", (self.version,)
+            )
+            .fetchone()[0]
+        )
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": size}
+
+    def close(self) -> None:
+        """
+        This function closes the connections opened by all the threads of
+        this process, the next query of a thread opens a new one.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for pid, connection in connections:
+            # the connections inherited from the parent process are its own
+            if pid == os.getpid():
+                connection.close()
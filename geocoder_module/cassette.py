@@ -0,0 +1,136 @@
+import gzip
+import json
+import random
+import threading
+from typing import Any, Dict, Tuple
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised when a query replayed from a cassette was never recorded.
+    """
+
+
+class Cassette:
+    RECORD = "record"
+    REPLAY = "replay"
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+    ) -> None:
+        """
+        This class stores the exchanges with the upstream services in a
+        gzip compressed json lines file (a cassette), so that they can be
+        replayed offline. In record mode the queries are sent upstream and
+        their responses and latencies are recorded, in replay mode the
+        recorded responses are returned after the injected latency.
+
+        :param path:        string path of the cassette file
+        :param mode:        string, "record" or "replay" (default "replay")
+        :param latency:     float, seconds every replayed query takes, None
+                            replays the recorded latencies (default 0.0)
+        :param jitter:      float, maximum number of seconds randomly added
+                            to the latency of every replayed query (default 0.0)
+        """
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f"Unknown cassette mode {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.interactions = {}
+        self._lock = threading.Lock()
+        if mode == self.REPLAY:
+            self.load()
+
+    @staticmethod
+    def _key(upstream: str, path: str, params: Dict[str, Any]) -> str:
+        # query strings carry only strings, e.g. 1.0 and "1.0" are the same query
+        return json.dumps(
+            [upstream, path, sorted((key, str(value)) for key, value in params.items())]
+        )
+
+    def load(self) -> None:
+        """
+        This function loads the exchanges recorded in the cassette file.
+        """
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                interaction = json.loads(line)
+                key = self._key(
+                    interaction["upstream"], interaction["path"], interaction["params"]
+                )
+                # responses are kept encoded, so that every replay gets its own copy
+                self.interactions[key] = (
+                    json.dumps(interaction["response"]),
+                    interaction["latency"],
+                )
+
+    def save(self) -> None:
+        """
+        This function writes the recorded exchanges to the cassette file.
+        """
+        with self._lock:
+            interactions = list(self.interactions.items())
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            for key, (response, latency) in interactions:
+                upstream, path, params = json.loads(key)
+                interaction = {
+                    "upstream": upstream,
+                    "path": path,
+                    "params": dict(params),
+                    "latency": latency,
+                    "response": json.loads(response),
+                }
+                f.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+
+    def record(
+        self,
+        upstream: str,
+        path: str,
+        params: Dict[str, Any],
+        response: Any,
+        latency: float,
+    ) -> None:
+        """
+        This function records the response of a query.
+
+        :param upstream:    string, name of the upstream service
+        :param path:        string, api endpoint queried
+        :param params:      dictionary of query parameters
+        :param response:    decoded json response
+        :param latency:     float, seconds the query took
+        """
+        with self._lock:
+            self.interactions[self._key(upstream, path, params)] = (
+                json.dumps(response),
+                latency,
+            )
+
+    def play(
+        self, upstream: str, path: str, params: Dict[str, Any]
+    ) -> Tuple[str, float]:
+        """
+        This function returns the recorded json response of a query, still
+        encoded, alongside with the number of seconds to wait before using it.
+
+        :param upstream:    string, name of the upstream service
+        :param path:        string, api endpoint queried
+        :param params:      dictionary of query parameters
+        """
+        interaction = self.interactions.get(self._key(upstream, path, params))
+        if interaction is None:
+            raise CassetteMissError(
+                f"Query to {upstream} with parameters {params} was not recorded"
+            )
+        response, latency = interaction
+        if self.latency is not None:
+            latency = self.latency
+        return response, latency + random.uniform(0, self.jitter)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
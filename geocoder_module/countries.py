@@ -0,0 +1,127 @@
+import re
+from typing import Any, Dict, List, Union
+
+LOWERCASE_WORDS = {"and", "of", "the", "da"}
+# names that Photon does not capitalize by the rules of country_display_name
+COUNTRY_DISPLAY_NAMES = {
+    "heard island and mcdonald islands": "Heard Island and McDonald Islands",
+}
+
+
+def _capitalize_word(word: str) -> str:
+    """
+    This function capitalizes a word of a country name and every part of it
+    following a hyphen or a parenthesis, e.g. "guinea-bissau" becomes
+    "Guinea-Bissau". An elided particle is kept lowercase, e.g. "d'ivoire"
+    becomes "d'Ivoire".
+    """
+    elided = re.match(r"(\w)'(\w)", word)
+    if elided:
+        return word[:2] + _capitalize_word(word[2:])
+    return re.sub(
+        r"(^|[-(])(\w)", lambda match: match.group(1) + match.group(2).upper(), word
+    )
+
+
+def country_display_name(country: str) -> str:
+    """
+    This function capitalizes a lowercase country name as Photon
+    returns it, e.g. "bosnia and herzegovina" becomes
+    "Bosnia and Herzegovina" and "the bahamas" becomes "The Bahamas".
+
+    :param country:     string, lowercase country name
+    """
+    if country in COUNTRY_DISPLAY_NAMES:
+        return COUNTRY_DISPLAY_NAMES[country]
+    return " ".join(
+        word if word in LOWERCASE_WORDS and position else _capitalize_word(word)
+        for position, word in enumerate(country.split())
+    )
+
+
+def bounding_box_center(bounding_box: List[float]) -> List[float]:
+    """
+    This function returns the center of a bounding box (min lon, max lat,
+    max lon, min lat) as [longitude, latitude], also for the boxes crossing
+    the antimeridian, whose min longitude is greater than their max one.
+
+    :param bounding_box:    list of 4 floats
+    """
+    min_lon, max_lat, max_lon, min_lat = bounding_box
+    if min_lon > max_lon:
+        max_lon += 360
+    lon = (min_lon + max_lon) / 2
+    if lon > 180:
+        lon -= 360
+    return [lon, (min_lat + max_lat) / 2]
+
+
+class CountryResolver:
+    def __init__(
+        self,
+        country_bbox: Dict[str, List[float]],
+        country_acronyms: Dict[str, List[str]] = None,
+    ) -> None:
+        """
+        This class resolves country names and acronyms locally, from the
+        shipped countries_bbox.json and countries_acronyms.json files, with
+        the same results produced by the Photon geocoder for a country: its
+        capitalized name, its bounding box and, as coordinates, the center
+        of the bounding box. Acronyms are matched only when written in upper
+        case (e.g. "UK", "U.S."), as many of them are also common words.
+
+        :param country_bbox:        dictionary mapping lowercase country names
+                                    to their bounding boxes
+        :param country_acronyms:    dictionary mapping lowercase country names
+                                    to their acronyms (default None)
+        """
+        self.country_bbox = country_bbox
+        self.acronyms = {}
+        for country, acronyms in (country_acronyms or {}).items():
+            if country not in country_bbox:
+                continue
+            for acronym in acronyms:
+                self.acronyms.setdefault(acronym.lower(), country)
+
+    def __len__(self) -> int:
+        return len(self.country_bbox)
+
+    def resolve(self, name: str) -> Union[str, None]:
+        """
+        This function returns the lowercase name of the country named by the
+        string passed in input, or None if it is not a country.
+
+        :param name:        string, name or acronym of a country
+        """
+        key = " ".join(name.lower().split())
+        if key in self.country_bbox:
+            return key
+        if name.isupper():
+            return self.acronyms.get(key)
+        return None
+
+    def lookup(self, location: str, country: str = None) -> List[Dict[str, Any]]:
+        """
+        This function returns the country named by the location passed in
+        input, formatted as the results of Geocoder._get_geocode_info, or an
+        empty list if the location is not a country, or is not the country
+        passed in input (e.g. "Georgia" searched in the United States).
+
+        :param location:    string, name or acronym of a country
+        :param country:     string that represents the country where to search
+                            the input location (default None)
+        """
+        key = self.resolve(location)
+        if key is None:
+            return []
+        if country and self.resolve(country) != key:
+            return []
+        name = country_display_name(key)
+        return [
+            {
+                "bounding_box": list(self.country_bbox[key]),
+                "name": name,
+                "country": name,
+                "coordinates": bounding_box_center(self.country_bbox[key]),
+            }
+        ]
@@ -0,0 +1,154 @@
+from typing import Dict, List, Union
+
+import numpy as np
+
+# hop distance of the countries that are not within max_hops borders
+UNREACHABLE = -1
+
+
+class CountryGraph:
+    def __init__(
+        self, country_neighbors: Dict[str, List[str]], max_hops: int = 3
+    ) -> None:
+        """
+        This class compiles the map of the country neighbors into an integer
+        indexed adjacency structure (compressed rows), with the number of
+        borders to cross between every pair of countries precomputed up to
+        max_hops, so that "is X within k borders of Y" queries are a single
+        array lookup. Borders are symmetric, even when listed for a single
+        one of the two countries.
+
+        :param country_neighbors:   dictionary mapping lowercase country names
+                                    to their neighbors
+        :param max_hops:            int, maximum number of borders between two
+                                    countries precomputed (default 3)
+        """
+        self.max_hops = max_hops
+        self.names = sorted(
+            {country for country in country_neighbors if country}
+            | {
+                neighbor
+                for neighbors in country_neighbors.values()
+                for neighbor in neighbors
+                if neighbor
+            }
+        )
+        self.ids = {name: country for country, name in enumerate(self.names)}
+
+        adjacency = np.zeros((len(self.names), len(self.names)), dtype=bool)
+        for country, neighbors in country_neighbors.items():
+            for neighbor in neighbors:
+                if country and neighbor and country != neighbor:
+                    adjacency[self.ids[country], self.ids[neighbor]] = True
+        adjacency |= adjacency.T
+        self.indptr = np.concatenate([[0], np.cumsum(adjacency.sum(axis=1))])
+        self.indices = np.nonzero(adjacency)[1]
+
+        # breadth first search from all the countries at once
+        self.hops = np.full(adjacency.shape, UNREACHABLE, dtype=np.int8)
+        np.fill_diagonal(self.hops, 0)
+        reached = np.eye(len(self.names), dtype=bool)
+        frontier = reached
+        steps = adjacency.astype(np.float32)
+        for hop in range(1, max_hops + 1):
+            frontier = (frontier.astype(np.float32) @ steps > 0) & ~reached
+            if not frontier.any():
+                break
+            self.hops[frontier] = hop
+            reached |= frontier
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, country: str) -> bool:
+        return country.lower() in self.ids
+
+    def to_ids(self, countries: List[str]) -> np.ndarray:
+        """
+        This function returns the integer index of every country passed in
+        input, -1 for unknown countries.
+
+        :param countries:   list of country names
+        """
+        return np.array(
+            [self.ids.get(country.lower(), -1) for country in countries],
+            dtype=np.int64,
+        )
+
+    def _check_hops(self, hops: int) -> None:
+        """
+        This function raises a ValueError if the number of borders passed in
+        input is greater than the precomputed ones, whose answers would be
+        silently truncated.
+        """
+        if hops > self.max_hops:
+            raise ValueError(
+                f"Cannot look beyond {self.max_hops} borders, {hops} were requested. "
+                "Increase max_hops (country_graph_max_hops in the config)"
+            )
+
+    def neighbors(self, country: str, hops: int = 1) -> List[str]:
+        """
+        This function returns the sorted list of the countries within the
+        number of borders passed in input from a country, the country itself
+        excluded, or an empty list for unknown countries.
+
+        :param country:     string, name of the country
+        :param hops:        int, maximum number of borders, up to max_hops
+                            (default 1)
+        """
+        self._check_hops(hops)
+        country = self.ids.get(country.lower())
+        if country is None:
+            return []
+        if hops == 1:
+            start, end = self.indptr[country], self.indptr[country + 1]
+            return [self.names[neighbor] for neighbor in self.indices[start:end]]
+        distances = self.hops[country]
+        return [
+            self.names[neighbor]
+            for neighbor in np.nonzero((distances > 0) & (distances <= hops))[0]
+        ]
+
+    def hops_many(self, countries_a: List[str], countries_b: List[str]) -> np.ndarray:
+        """
+        This function returns the number of borders to cross between every
+        pair of countries passed in input, -1 for unknown countries and for
+        countries more than max_hops borders apart.
+
+        :param countries_a:     list of country names
+        :param countries_b:     list of country names, of the same length
+        """
+        ids_a, ids_b = self.to_ids(countries_a), self.to_ids(countries_b)
+        known = (ids_a >= 0) & (ids_b >= 0)
+        hops = np.full(len(ids_a), UNREACHABLE, dtype=np.int64)
+        hops[known] = self.hops[ids_a[known], ids_b[known]]
+        return hops
+
+    def within_hops(
+        self, countries_a: List[str], countries_b: List[str], hops: int = 1
+    ) -> np.ndarray:
+        """
+        This function returns, for every pair of countries passed in input,
+        True if the two countries are within the number of borders passed in
+        input (a country is within 0 borders of itself).
+
+        :param countries_a:     list of country names
+        :param countries_b:     list of country names, of the same length
+        :param hops:            int, maximum number of borders, up to max_hops
+                                (default 1)
+        """
+        self._check_hops(hops)
+        distances = self.hops_many(countries_a, countries_b)
+        return (distances >= 0) & (distances <= hops)
+
+    def hop(self, country_a: str, country_b: str) -> Union[int, None]:
+        """
+        This function returns the number of borders to cross between two
+        countries, None if they are unknown or more than max_hops apart.
+
+        :param country_a:   string, name of the first country
+        :param country_b:   string, name of the second country
+        """
+        distance = int(self.hops_many([country_a], [country_b])[0])
+        return distance if distance >= 0 else None
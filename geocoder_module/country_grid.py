@@ -0,0 +1,179 @@
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+from geocoder_module.spatial_index import split_antimeridian
+
+# owner of the cells that are not covered by the box of a single country
+NO_COUNTRY = -1
+BORDER_CELL = -2
+
+
+class CountryGrid:
+    def __init__(self, bounding_boxes: np.ndarray, cell_size: float = 1.0) -> None:
+        """
+        This class resolves coordinates to countries offline, from a regular
+        grid of cells of cell_size degrees compiled over the country bounding
+        boxes. Since bounding boxes overlap near borders, a point is resolved
+        only when the bounding box of a single country contains it; otherwise
+        the countries whose bounding box contains it are candidates, and none
+        of them is guessed. Cells entirely covered by the box of a single
+        country, and overlapped by no other box, are resolved from the grid
+        alone, only the points of the other (border) cells are tested against
+        the boxes overlapping their cell.
+
+        :param bounding_boxes:  array of shape (N, 4) of the country bounding
+                                boxes (min lon, max lat, max lon, min lat)
+        :param cell_size:       float, size in degrees of the cells (default 1.0)
+        """
+        self.cell_size = cell_size
+        self.n_lon = math.ceil(360 / cell_size)
+        self.n_lat = math.ceil(180 / cell_size)
+
+        self.mins, self.maxs, self.countries = split_antimeridian(bounding_boxes)
+        self._build()
+
+    def _cells(self, mins: np.ndarray, maxs: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        This function returns the column and row ranges of the cells
+        overlapped by the boxes.
+        """
+        first = np.floor((mins + [180, 90]) / self.cell_size).astype(np.int64)
+        last = np.floor((maxs + [180, 90]) / self.cell_size).astype(np.int64)
+        first = np.clip(first, 0, [self.n_lon - 1, self.n_lat - 1])
+        last = np.clip(last, 0, [self.n_lon - 1, self.n_lat - 1])
+        return first, last
+
+    def _build(self) -> None:
+        """
+        This function compiles the grid: the owner of every cell and, for the
+        border cells, the boxes to test stored as a compressed list.
+        """
+        n_cells = self.n_lon * self.n_lat
+        cell_boxes, box_ids = [], []
+        first, last = self._cells(self.mins, self.maxs)
+        for box, ((lon_0, lat_0), (lon_1, lat_1)) in enumerate(zip(first, last)):
+            columns, rows = np.meshgrid(
+                np.arange(lon_0, lon_1 + 1), np.arange(lat_0, lat_1 + 1)
+            )
+            cells = (rows * self.n_lon + columns).ravel()
+            cell_boxes.append(cells)
+            box_ids.append(np.full(len(cells), box))
+        cells = np.concatenate(cell_boxes) if cell_boxes else np.empty(0, np.int64)
+        boxes = np.concatenate(box_ids) if box_ids else np.empty(0, np.int64)
+
+        order = np.argsort(cells, kind="stable")
+        cells, boxes = cells[order], boxes[order]
+        counts = np.bincount(cells, minlength=n_cells)
+
+        # cells overlapped by a single box, covering all the cell
+        self.cell_owner = np.full(n_cells, NO_COUNTRY, dtype=np.int64)
+        single = counts[cells] == 1
+        single_cells, single_boxes = cells[single], boxes[single]
+        cell_mins = np.stack(
+            [single_cells % self.n_lon, single_cells // self.n_lon], axis=1
+        ) * self.cell_size - [180, 90]
+        cell_maxs = cell_mins + self.cell_size
+        covered = (
+            (self.mins[single_boxes] <= cell_mins)
+            & (cell_maxs <= self.maxs[single_boxes])
+        ).all(axis=1)
+        self.cell_owner[counts > 0] = BORDER_CELL
+        self.cell_owner[single_cells[covered]] = self.countries[single_boxes[covered]]
+
+        # only the border cells keep their boxes
+        border = self.cell_owner[cells] == BORDER_CELL
+        self.border_boxes = boxes[border]
+        counts = np.bincount(cells[border], minlength=n_cells)
+        self.border_starts = np.concatenate([[0], np.cumsum(counts)])
+
+    def _containing(
+        self, latitudes: np.ndarray, longitudes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        This function returns the countries of the cells resolved from the
+        grid alone, alongside with the sorted pairs of (point, country) of the
+        points of border cells whose country bounding box contains them.
+        """
+        points = np.stack(
+            [
+                np.asarray(longitudes, dtype=np.float64).ravel(),
+                np.asarray(latitudes, dtype=np.float64).ravel(),
+            ],
+            axis=1,
+        )
+        cells, _ = self._cells(points, points)
+        cells = cells[:, 1] * self.n_lon + cells[:, 0]
+        countries = self.cell_owner[cells]
+
+        # the points of the border cells are tested against the boxes of the cell
+        border_points = np.nonzero(countries == BORDER_CELL)[0]
+        countries[border_points] = NO_COUNTRY
+        border_cells = cells[border_points]
+        counts = self.border_starts[border_cells + 1] - self.border_starts[border_cells]
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        pair_points = np.repeat(border_points, counts)
+        pair_boxes = self.border_boxes[
+            np.repeat(self.border_starts[border_cells], counts) + offsets
+        ]
+        inside = (
+            (self.mins[pair_boxes] <= points[pair_points])
+            & (points[pair_points] <= self.maxs[pair_boxes])
+        ).all(axis=1)
+        # both parts of a box crossing the antimeridian belong to one country
+        keys = np.unique(
+            pair_points[inside] * len(self.countries)
+            + self.countries[pair_boxes[inside]]
+        )
+        return countries, keys // len(self.countries), keys % len(self.countries)
+
+    def lookup_many(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        This function returns, for every pair of coordinates passed in input,
+        the index of its country in the bounding boxes the grid was built
+        from, or -1 if no country bounding box, or more than one, contains it.
+
+        :param latitudes:   array of latitudes in degrees
+        :param longitudes:  array of longitudes in degrees
+        """
+        countries, pair_points, pair_countries = self._containing(latitudes, longitudes)
+        points, first, counts = np.unique(
+            pair_points, return_index=True, return_counts=True
+        )
+        single = counts == 1
+        countries[points[single]] = pair_countries[first[single]]
+        return countries
+
+    def candidates_many(
+        self, latitudes: np.ndarray, longitudes: np.ndarray
+    ) -> List[List[int]]:
+        """
+        This function returns, for every pair of coordinates passed in input,
+        the sorted list of the indexes of the countries whose bounding box
+        contains it.
+
+        :param latitudes:   array of latitudes in degrees
+        :param longitudes:  array of longitudes in degrees
+        """
+        countries, pair_points, pair_countries = self._containing(latitudes, longitudes)
+        bounds = np.searchsorted(pair_points, np.arange(len(countries) + 1))
+        pair_countries = pair_countries.tolist()
+        return [
+            [country] if country >= 0 else pair_countries[start:end]
+            for country, start, end in zip(
+                countries.tolist(), bounds[:-1].tolist(), bounds[1:].tolist()
+            )
+        ]
+
+    def lookup(self, lat: float, lon: float) -> int:
+        """
+        This function returns the index of the country of a single pair
+        of coordinates (see lookup_many).
+
+        :param lat:         float representing the latitude coordinates
+        :param lon:         float representing the longitude coordinates
+        """
+        return int(self.lookup_many([lat], [lon])[0])
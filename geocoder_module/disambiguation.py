@@ -0,0 +1,100 @@
+from collections import Counter
+from typing import Any, Dict, List
+
+DEFAULT_LATTICE_WEIGHTS = {"majority": 1.0, "ner": 1.0, "neighbors": 0.5, "rank": 0.5}
+
+
+class CandidateLattice:
+    def __init__(
+        self,
+        candidates: List[List[Dict[str, Any]]],
+        ner_countries: List[str] = None,
+        country_neighbors: Dict[str, List[str]] = None,
+        weights: Dict[str, float] = None,
+    ) -> None:
+        """
+        This class picks a country for every location of a document among the
+        candidates returned by the geocoder, scoring every location x country
+        assignment in memory. The score of a country for a location grows with
+        the number of other locations assigned to it (majority), with the NER
+        tags naming it, with the locations and NER tags in its neighboring
+        countries, and with the rank of its best candidate in the geocoder
+        results. Locations are first scored against the countries of all the
+        candidates of the other locations, then against their assigned
+        countries, until the assignment does not change.
+
+        :param candidates:          list of the candidates of every location,
+                                    dictionaries with the field "country"
+                                    ranked from the best matching one
+        :param ner_countries:       list of the countries named by NER tags
+                                    (default None)
+        :param country_neighbors:   dictionary mapping lowercase country names
+                                    to their neighbors (default None)
+        :param weights:             dictionary of the weights of the "majority",
+                                    "ner", "neighbors" and "rank" scores
+                                    (default DEFAULT_LATTICE_WEIGHTS)
+        """
+        self.weights = dict(DEFAULT_LATTICE_WEIGHTS, **(weights or {}))
+        self.country_neighbors = country_neighbors or {}
+        self.ner_counts = Counter(country.lower() for country in ner_countries or [])
+
+        # best ranked candidate of every country of every location
+        self.options = []
+        for location_candidates in candidates:
+            options = {}
+            for rank, candidate in enumerate(location_candidates):
+                options.setdefault(candidate["country"].lower(), rank)
+            self.options.append(options)
+
+    def _score(self, options: Dict[str, int], votes: Counter) -> Dict[str, float]:
+        """
+        This function scores the countries of a location given the votes
+        of the other locations.
+        """
+        weights = self.weights
+        scores = {}
+        for country, rank in options.items():
+            neighbors = self.country_neighbors.get(country, [])
+            scores[country] = (
+                weights["majority"] * votes[country]
+                + weights["ner"] * self.ner_counts[country]
+                + weights["neighbors"]
+                * sum(votes[n] + self.ner_counts[n] for n in neighbors)
+                + weights["rank"] / (1 + rank)
+            )
+        return scores
+
+    def assign(self, max_iterations: int = 10) -> List[str]:
+        """
+        This function returns the lowercase country assigned to every location,
+        None for locations without candidates.
+
+        :param max_iterations:  int, maximum number of refinements of the
+                                assignment (default 10)
+        """
+        # every location first votes for all the countries of its candidates
+        votes = Counter(country for options in self.options for country in options)
+        own_votes = [Counter(options) for options in self.options]
+        assignment = None
+        for _ in range(max_iterations):
+            new_assignment = []
+            for options, location_votes in zip(self.options, own_votes):
+                if not options:
+                    new_assignment.append(None)
+                    continue
+                scores = self._score(options, votes - location_votes)
+                # ties are broken by the rank of the candidates
+                new_assignment.append(
+                    max(
+                        options,
+                        key=lambda country: (scores[country], -options[country]),
+                    )
+                )
+            if new_assignment == assignment:
+                break
+            assignment = new_assignment
+            votes = Counter(country for country in assignment if country)
+            own_votes = [
+                Counter([country] if country else []) for country in assignment
+            ]
+        return assignment
@@ -0,0 +1,160 @@
+from typing import Tuple
+
+import numpy as np
+
+from geocoder_module.utils import EARTH_RADIUS
+
+
+def haversine(
+    latitudes_a: np.ndarray,
+    longitudes_a: np.ndarray,
+    latitudes_b: np.ndarray,
+    longitudes_b: np.ndarray,
+) -> np.ndarray:
+    """
+    This is the vectorized version of utils.harvesin: it returns the distances
+    (in meters) between two sets of coordinates, broadcasting the arrays
+    passed in input as NumPy does.
+
+    :param latitudes_a:     array of latitudes of the first coordinates
+    :param longitudes_a:    array of longitudes of the first coordinates
+    :param latitudes_b:     array of latitudes of the second coordinates
+    :param longitudes_b:    array of longitudes of the second coordinates
+    """
+    ph1 = np.radians(latitudes_a)
+    ph2 = np.radians(latitudes_b)
+    delta_phi = ph2 - ph1
+    delta_gamma = np.radians(np.subtract(longitudes_b, longitudes_a))
+
+    a = (
+        np.sin(delta_phi / 2) ** 2
+        + np.cos(ph1) * np.cos(ph2) * np.sin(delta_gamma / 2) ** 2
+    )
+    a = np.clip(a, 0, 1)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS * c
+
+
+def _as_array(coordinates: np.ndarray, columns: int) -> np.ndarray:
+    """
+    This function converts a list of coordinates, or of bounding boxes, to a
+    float array with the number of columns passed in input.
+    """
+    array = np.asarray(coordinates, dtype=np.float64)
+    if array.ndim == 1:
+        array = array.reshape(-1, columns)
+    if array.ndim != 2 or array.shape[1] != columns:
+        raise ValueError(
+            f"Expected an array of shape (N, {columns}), got {array.shape}"
+        )
+    return array
+
+
+def pairwise_distances(
+    coordinates_1: np.ndarray, coordinates_2: np.ndarray
+) -> np.ndarray:
+    """
+    This function returns the distance (in meters) between every pair of
+    coordinates of the two arrays passed in input, as the function
+    utils.calculate_distance does for a single pair.
+
+    :param coordinates_1:   array of shape (N, 2) of longitudes and latitudes
+    :param coordinates_2:   array of shape (N, 2) of longitudes and latitudes
+    """
+    coordinates_1 = _as_array(coordinates_1, 2)
+    coordinates_2 = _as_array(coordinates_2, 2)
+    if len(coordinates_1) != len(coordinates_2):
+        raise ValueError(
+            "The two sets of coordinates have different lenghts {} and {}".format(
+                len(coordinates_1), len(coordinates_2)
+            )
+        )
+    return haversine(
+        coordinates_1[:, 1],
+        coordinates_1[:, 0],
+        coordinates_2[:, 1],
+        coordinates_2[:, 0],
+    )
+
+
+def distance_matrix(coordinates_1: np.ndarray, coordinates_2: np.ndarray) -> np.ndarray:
+    """
+    This function returns the matrix of the distances (in meters) between
+    every coordinate of the first array and every coordinate of the second one.
+
+    :param coordinates_1:   array of shape (N, 2) of longitudes and latitudes
+    :param coordinates_2:   array of shape (M, 2) of longitudes and latitudes
+    """
+    coordinates_1 = _as_array(coordinates_1, 2)
+    coordinates_2 = _as_array(coordinates_2, 2)
+    return haversine(
+        coordinates_1[:, 1, None],
+        coordinates_1[:, 0, None],
+        coordinates_2[None, :, 1],
+        coordinates_2[None, :, 0],
+    )
+
+
+def _corners(bounding_boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This function returns the latitudes and longitudes of the two corners
+    of every bounding box, as two arrays of shape (N, 2).
+    """
+    return bounding_boxes[:, 1::2], bounding_boxes[:, 0::2]
+
+
+def bounding_box_distances(
+    bounding_boxes_1: np.ndarray, bounding_boxes_2: np.ndarray
+) -> np.ndarray:
+    """
+    This function returns the minimum distance (in meters) between every pair
+    of bounding boxes of the two arrays passed in input, measured between
+    their corners as the function utils.calculate_distance does for a
+    single pair.
+
+    :param bounding_boxes_1:    array of shape (N, 4) of bounding boxes
+    :param bounding_boxes_2:    array of shape (N, 4) of bounding boxes
+    """
+    bounding_boxes_1 = _as_array(bounding_boxes_1, 4)
+    bounding_boxes_2 = _as_array(bounding_boxes_2, 4)
+    if len(bounding_boxes_1) != len(bounding_boxes_2):
+        raise ValueError(
+            "The two sets of bounding boxes have different lenghts {} and {}".format(
+                len(bounding_boxes_1), len(bounding_boxes_2)
+            )
+        )
+    latitudes_1, longitudes_1 = _corners(bounding_boxes_1)
+    latitudes_2, longitudes_2 = _corners(bounding_boxes_2)
+    # distances between the 2 x 2 corners of every pair
+    distances = haversine(
+        latitudes_1[:, :, None],
+        longitudes_1[:, :, None],
+        latitudes_2[:, None, :],
+        longitudes_2[:, None, :],
+    )
+    return distances.reshape(len(distances), -1).min(axis=1)
+
+
+def bounding_box_distance_matrix(
+    bounding_boxes_1: np.ndarray, bounding_boxes_2: np.ndarray
+) -> np.ndarray:
+    """
+    This function returns the matrix of the minimum distances (in meters)
+    between every bounding box of the first array and every bounding box
+    of the second one (see bounding_box_distances).
+
+    :param bounding_boxes_1:    array of shape (N, 4) of bounding boxes
+    :param bounding_boxes_2:    array of shape (M, 4) of bounding boxes
+    """
+    bounding_boxes_1 = _as_array(bounding_boxes_1, 4)
+    bounding_boxes_2 = _as_array(bounding_boxes_2, 4)
+    latitudes_1, longitudes_1 = _corners(bounding_boxes_1)
+    latitudes_2, longitudes_2 = _corners(bounding_boxes_2)
+    distances = haversine(
+        latitudes_1[:, None, :, None],
+        longitudes_1[:, None, :, None],
+        latitudes_2[None, :, None, :],
+        longitudes_2[None, :, None, :],
+    )
+    return distances.min(axis=(2, 3))
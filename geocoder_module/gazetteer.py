@@ -0,0 +1,204 @@
+import csv
+import gzip
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List
+
+from logger.logging import logging
+
+from geocoder_module.countries import country_display_name
+from geocoder_module.utils import edit_bounding_box
+
+
+def normalize_name(name: str) -> str:
+    """
+    This function normalizes a place name for the gazetteer index:
+    accents are removed, the name is lowercased and its whitespaces
+    are collapsed, e.g. "  São  Paulo" becomes "sao paulo".
+
+    :param name:        string that represents the place name
+    """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    return " ".join(name.lower().split())
+
+
+def country_names_from_acronyms(
+    country_acronyms: Dict[str, List[str]],
+) -> Dict[str, str]:
+    """
+    This function maps the two letters country codes listed in the country
+    acronyms file to the country names, capitalized as Photon returns them,
+    e.g. "gb" to "United Kingdom".
+
+    :param country_acronyms:    dictionary mapping lowercase country names
+                                to their acronyms
+    """
+    country_names = {}
+    for country, acronyms in country_acronyms.items():
+        name = country_display_name(country)
+        for acronym in acronyms:
+            if len(acronym) == 2 and acronym.isascii() and acronym.isalpha():
+                country_names.setdefault(acronym, name)
+    return country_names
+
+
+class Gazetteer:
+    def __init__(
+        self,
+        records: Iterable[Dict[str, Any]],
+        country_names: Dict[str, str] = None,
+        default_extent: float = 5000,
+    ) -> None:
+        """
+        This class is an offline index of places, answering forward lookups
+        with the same result dictionaries produced by the Photon geocoder.
+        The places are stored in flat arrays, while their names and alternate
+        names are normalized and kept in a single sorted list pointing to the
+        places, so that both exact and prefix lookups are binary searches.
+        Places sharing a name are ranked by population.
+
+        :param records:         iterable of dictionaries with the fields "name",
+                                "country", "latitude", "longitude" and the
+                                optional fields "alternatenames" (comma separated),
+                                "bbox" (comma separated min lon, max lat, max lon,
+                                min lat) and "population"
+        :param country_names:   dictionary mapping lowercase country codes to
+                                the country names returned in the results
+                                (default None)
+        :param default_extent:  float, diagonal in meters of the bounding box
+                                of places without one (default 5000)
+        """
+        country_names = country_names or {}
+        self.names = []
+        self.countries = []
+        self.country_ids = array("H")
+        self.coordinates = array("d")
+        self.bounding_boxes = array("d")
+        self.population = array("Q")
+
+        country_index = {}
+        entries = []
+        for record in records:
+            try:
+                longitude = float(record["longitude"])
+                latitude = float(record["latitude"])
+                if record.get("bbox"):
+                    bounding_box = [float(value) for value in record["bbox"].split(",")]
+                    if len(bounding_box) != 4:
+                        raise ValueError("the bounding box needs 4 coordinates")
+                else:
+                    bounding_box = edit_bounding_box(
+                        [longitude, latitude, longitude, latitude], default_extent
+                    )
+                country = record["country"].strip()
+                population = int(record.get("population") or 0)
+                # checked before any field is stored, the arrays stay aligned
+                if not 0 <= population < 2**64:
+                    raise ValueError(f"population {population} out of range")
+            except (KeyError, ValueError) as error:
+                logging.warning(f"Skipping gazetteer record {record}: {error}")
+                continue
+            country = country_names.get(country.lower(), country)
+
+            place = len(self.names)
+            if country not in country_index:
+                country_index[country] = len(self.countries)
+                self.countries.append(country)
+            self.names.append(record["name"])
+            self.country_ids.append(country_index[country])
+            self.coordinates.extend([longitude, latitude])
+            self.bounding_boxes.extend(bounding_box)
+            self.population.append(population)
+
+            names = [record["name"]] + (record.get("alternatenames") or "").split(",")
+            for key in {normalize_name(name) for name in names}:
+                if key:
+                    entries.append((key, -population, place))
+
+        entries.sort()
+        self.keys = [key for key, _, _ in entries]
+        self.key_places = array("I", [place for _, _, place in entries])
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        country_names: Dict[str, str] = None,
+        default_extent: float = 5000,
+    ) -> "Gazetteer":
+        """
+        This function builds a gazetteer from a tab separated dump,
+        optionally gzip compressed, whose header holds the field names
+        described in the Gazetteer class.
+
+        :param path:            string path of the dump
+        :param country_names:   dictionary mapping lowercase country codes to
+                                country names (default None)
+        :param default_extent:  float, diagonal in meters of the bounding box
+                                of places without one (default 5000)
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+            gazetteer = cls(reader, country_names, default_extent)
+        logging.info(f"Loaded {len(gazetteer)} places from gazetteer {path}")
+        return gazetteer
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _place(self, place: int) -> Dict[str, Any]:
+        return {
+            "bounding_box": list(self.bounding_boxes[4 * place : 4 * place + 4]),
+            "name": self.names[place],
+            "country": self.countries[self.country_ids[place]],
+            "coordinates": list(self.coordinates[2 * place : 2 * place + 2]),
+        }
+
+    def lookup(
+        self,
+        location: str,
+        country: str = None,
+        best_matching: bool = True,
+        prefix: bool = False,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        This function returns the places whose name or alternate names match
+        the location passed in input, formatted as the results of
+        Geocoder._get_geocode_info. Exact matches come first, ranked by
+        population, followed by the prefix matches in alphabetical order.
+
+        :param location:       string that represents the location to look up
+        :param country:        string that represents the country where to search
+                               the input location (default None)
+        :param best_matching:  bool, if True only the first result is returned
+                               (default True)
+        :param prefix:         bool, if True the places whose names start with
+                               the location are returned as well (default False)
+        :param limit:          int, maximum number of results (default 10)
+        """
+        key = normalize_name(location)
+        if not key:
+            return []
+        limit = 1 if best_matching else limit
+
+        places = []
+        index = bisect_left(self.keys, key)
+        while index < len(self.keys) and len(places) < limit:
+            if self.keys[index] != key and not (
+                prefix and self.keys[index].startswith(key)
+            ):
+                break
+            place = self.key_places[index]
+            index += 1
+            if place in places:
+                continue
+            if country and (
+                self.countries[self.country_ids[place]].lower() != country.lower()
+            ):
+                continue
+            places.append(place)
+        return [self._place(place) for place in places]
@@ -1,26 +1,95 @@
-import os
-from typing import Any, Dict, List, Tuple, Union
+import copy
+import time
+import itertools
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Union,
+)
 from collections import Counter
-import requests
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from logger.logging import logging
 
+import numpy as np
+
 from geocoder_module.utils import (
     calculate_distance,
     edit_bounding_box,
     gps_sanity_check,
     bbox2point_coord,
+    geohash,
 )
 from geocoder_module.helpers import (
     check_env_vars,
     check_location_can_be_processed,
+    get_json_decoder,
     load_json_file,
 )
+from geocoder_module.backends import (
+    DEFAULT_BACKEND_CHAINS,
+    OPERATIONS,
+    Backend,
+    BackendStats,
+    CacheBackend,
+    CountryBackend,
+    GazetteerBackend,
+    GeonamesBackend,
+    PhotonBackend,
+)
+from geocoder_module.bounding_boxes import (
+    check_large_bounding_boxes,
+    enlarge_bounding_boxes,
+    merge_bounding_boxes,
+    sanitize_bounding_boxes,
+)
+from geocoder_module.cache import LRUCache, SQLiteCache
+from geocoder_module.cassette import Cassette
+from geocoder_module.countries import CountryResolver
+from geocoder_module.country_graph import CountryGraph
+from geocoder_module.country_grid import CountryGrid
+from geocoder_module.disambiguation import CandidateLattice
+from geocoder_module.distances import (
+    bounding_box_distance_matrix,
+    bounding_box_distances,
+    distance_matrix,
+    pairwise_distances,
+)
+from geocoder_module.gazetteer import Gazetteer, country_names_from_acronyms
+from geocoder_module.reverse import ReverseGeocoder
+from geocoder_module.spatial_index import BoundingBoxIndex
+from geocoder_module.validation import (
+    AuthoritativePolicy,
+    CachedVerdictPolicy,
+    CountryPolicy,
+    OsmValuePolicy,
+    ValidationPolicies,
+)
+from geocoder_module.transport import (
+    UPSTREAM_SERVERS,
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    Endpoint,
+    EndpointPool,
+    backoff_delay,
+    create_session,
+    endpoint_urls,
+    get_rate_limiter,
+    is_retryable,
+    is_upstream_failure,
+)
 
 _wrap_latitude = lambda x: x + 90
 
 
 class Geocoder:
-    def __init__(self) -> None:
+    def __init__(self, config: Dict[str, Any] = None) -> None:
         """
         This class creates the Geocoder module, that is an object
         to get coordinates from the normalised name of a location,
@@ -28,8 +97,11 @@ class Geocoder:
         of its area (top left corner and bottom right corner).
         The object is an interface to the Photon geocoder; its entrypoint
         has to be provided in the config file.
+        Every upstream service (Photon and Geonames) is queried through
+        its own pooled keep-alive session.
 
-        :param config: string path for the config file
+        :param config: dictionary of parameters overriding the default
+                       configuration (default None)
         """
 
         self.config = {
@@ -42,7 +114,63 @@ class Geocoder:
             "country_bounding_box_path": "countries_bbox.json",
             "country_acronyms_path": "countries_acronyms.json",
             "blacklist_path": "blacklist.json",
+            "json_decoder": None,
+            "pool_size": 10,
+            "pool_block": False,
+            "max_workers": 8,
+            "max_concurrency": 100,
+            "endpoints": {"photon": None, "geonames": None},
+            "endpoint_failure_threshold": 3,
+            "endpoint_recovery_timeout": 10,
+            "hedged_requests": False,
+            "hedge_percentile": 95,
+            "hedge_delay": 1.0,
+            "timeouts": {"photon": [3.05, 10], "geonames": [3.05, 10]},
+            "max_retries": 2,
+            "retry_backoff": 0.5,
+            "retry_backoff_max": 8,
+            "photon_best_matching_limit": 5,
+            "photon_limit": None,
+            "photon_country_bbox": True,
+            "breaker_failure_threshold": 5,
+            "breaker_recovery_timeout": 30,
+            "rate_limits": {"photon": None, "geonames": None},
+            "rate_limit_burst": 10,
+            "adaptive_concurrency": False,
+            "adaptive_concurrency_max": 64,
+            "adaptive_latency_target": 1.0,
+            "photon_cache_size": 0,
+            "photon_cache_ttl": 86400,
+            "validation_cache_size": 0,
+            "validation_cache_ttl": 86400,
+            "reverse_cache_size": 0,
+            "reverse_cache_ttl": 86400,
+            "reverse_cache_precision": 6,
+            "persistent_cache_path": None,
+            "persistent_cache_version": "1",
+            "persistent_cache_ttl": None,
+            "gazetteer_path": None,
+            "gazetteer_default_extent": 5000,
+            "offline_reverse": False,
+            "reverse_min_population": 0,
+            "country_grid_cell_size": 1.0,
+            "country_graph_max_hops": 3,
+            "cassette_path": None,
+            "cassette_mode": "replay",
+            "cassette_latency": 0.0,
+            "cassette_jitter": 0.0,
+            "backend_chains": DEFAULT_BACKEND_CHAINS,
+            "authoritative_backends": ["countries", "gazetteer"],
+            "validation_policies": ["authoritative", "country", "cached"],
+            "validation_trusted_osm_values": ["country", "state"],
+            "validation_min_importance": None,
+            "validation_hints_size": 10000,
+            "double_check_mode": "requery",
+            "lattice_candidates": 5,
+            "lattice_weights": None,
         }
+        if config:
+            self.config.update(config)
 
         self.blacklist = load_json_file(self.config["blacklist_path"])
         self.map_country_neighbors = load_json_file(
@@ -51,8 +179,574 @@ class Geocoder:
         self.country_bbox = load_json_file(self.config["country_bounding_box_path"])
         self.country_acronyms = load_json_file(self.config["country_acronyms_path"])
 
+        self.countries = CountryResolver(self.country_bbox, self.country_acronyms)
+        self.country_index = BoundingBoxIndex(list(self.country_bbox.values()))
+        self.country_index_names = list(self.country_bbox)
+        self._country_grid = None
+        self.country_graph = CountryGraph(
+            self.map_country_neighbors, self.config["country_graph_max_hops"]
+        )
+
         check_env_vars()
 
+        self.json_loads = get_json_decoder(self.config["json_decoder"])
+        self.sessions = self._create_sessions()
+        self.endpoint_pools = {
+            upstream: EndpointPool(
+                endpoint_urls(upstream, self.config["endpoints"].get(upstream)),
+                self.config["endpoint_failure_threshold"],
+                self.config["endpoint_recovery_timeout"],
+            )
+            for upstream in UPSTREAM_SERVERS
+        }
+        self.breakers = {
+            upstream: CircuitBreaker(
+                self.config["breaker_failure_threshold"],
+                self.config["breaker_recovery_timeout"],
+            )
+            for upstream in UPSTREAM_SERVERS
+        }
+        self.rate_limiters = {
+            upstream: (
+                get_rate_limiter(
+                    upstream,
+                    self.config["rate_limits"][upstream],
+                    self.config["rate_limit_burst"],
+                )
+                if self.config["rate_limits"].get(upstream)
+                else None
+            )
+            for upstream in UPSTREAM_SERVERS
+        }
+        self.concurrency_limiters = self._create_concurrency_limiters()
+
+        self.photon_cache = None
+        if self.config["photon_cache_size"]:
+            self.photon_cache = LRUCache(
+                self.config["photon_cache_size"], self.config["photon_cache_ttl"]
+            )
+        self.validation_cache = None
+        if self.config["validation_cache_size"]:
+            self.validation_cache = LRUCache(
+                self.config["validation_cache_size"],
+                self.config["validation_cache_ttl"],
+            )
+        self.reverse_cache = None
+        if self.config["reverse_cache_size"]:
+            self.reverse_cache = LRUCache(
+                self.config["reverse_cache_size"], self.config["reverse_cache_ttl"]
+            )
+        (
+            self.validation_executor,
+            self.hedge_executor,
+            self.query_executor,
+        ) = self._create_executors()
+        self.persistent_cache = None
+        if self.config["persistent_cache_path"]:
+            self.persistent_cache = SQLiteCache(
+                self.config["persistent_cache_path"],
+                self.config["persistent_cache_version"],
+                self.config["persistent_cache_ttl"],
+            )
+        self.gazetteer = None
+        if self.config["gazetteer_path"]:
+            self.gazetteer = Gazetteer.load(
+                self.config["gazetteer_path"],
+                country_names_from_acronyms(self.country_acronyms),
+                self.config["gazetteer_default_extent"],
+            )
+        self.reverse_geocoder = None
+        if self.gazetteer is not None and self.config["offline_reverse"]:
+            self.reverse_geocoder = ReverseGeocoder(
+                self.gazetteer, self.config["reverse_min_population"]
+            )
+        self.cassette = None
+        if self.config["cassette_path"]:
+            self.cassette = Cassette(
+                self.config["cassette_path"],
+                self.config["cassette_mode"],
+                self.config["cassette_latency"],
+                self.config["cassette_jitter"],
+            )
+        self.validation_hints = None
+        if (
+            "osm_value" in self.config["validation_policies"]
+            and self.config["validation_hints_size"]
+        ):
+            self.validation_hints = LRUCache(self.config["validation_hints_size"])
+        self.validation_policies = self._create_validation_policies()
+        self.backend_chains = self._create_backend_chains()
+        # the validation cache tier, already read by the cached verdict policy
+        self.policy_cache_tier = None
+        if any(
+            isinstance(policy, CachedVerdictPolicy)
+            for policy in self.validation_policies.policies
+        ):
+            self.policy_cache_tier = next(
+                (
+                    backend
+                    for backend in self.backend_chains["validate"]
+                    if isinstance(backend, CacheBackend)
+                ),
+                None,
+            )
+        self.backend_counters = {
+            operation: {backend.name: BackendStats() for backend in chain}
+            for operation, chain in self.backend_chains.items()
+        }
+
+    def _create_sessions(self) -> Dict[str, Any]:
+        """
+        This function creates a pooled keep-alive session for every
+        upstream service.
+        """
+        return {
+            upstream: create_session(
+                self.config["pool_size"], self.config["pool_block"], self.json_loads
+            )
+            for upstream in UPSTREAM_SERVERS
+        }
+
+    def _create_executors(
+        self,
+    ) -> Tuple[ThreadPoolExecutor, Union[ThreadPoolExecutor, None], ThreadPoolExecutor]:
+        """
+        This function creates the thread pools validating the geocoder hits
+        concurrently, sending the hedged requests (None if hedged requests
+        are disabled) and resolving the lists of locations and coordinates.
+        The pools are distinct, as the queries of a list wait for their
+        validations and hedged requests.
+        """
+        validation_executor = ThreadPoolExecutor(max_workers=self.config["max_workers"])
+        hedge_executor = None
+        if self.config["hedged_requests"]:
+            hedge_executor = ThreadPoolExecutor(max_workers=self.config["max_workers"])
+        query_executor = ThreadPoolExecutor(max_workers=self.config["max_workers"])
+        return validation_executor, hedge_executor, query_executor
+
+    def _create_concurrency_limiters(self) -> Dict[str, Any]:
+        """
+        This function creates the adaptive concurrency limiter of every
+        upstream service, if adaptive concurrency is enabled.
+        """
+        return {
+            upstream: (
+                AdaptiveConcurrencyLimiter(
+                    self.config["adaptive_concurrency_max"],
+                    self.config["adaptive_latency_target"],
+                )
+                if self.config["adaptive_concurrency"]
+                else None
+            )
+            for upstream in UPSTREAM_SERVERS
+        }
+
+    def _create_backend_chains(self) -> Dict[str, List[Backend]]:
+        """
+        This function creates the resolution chain of every operation
+        ("search", "validate" and "reverse") from the backend_chains config
+        field, whose entries are either names of the built-in tiers or
+        Backend instances. Tiers that cannot answer an operation, e.g. a
+        disabled cache, are left out of its chain.
+        """
+        backends = {
+            "countries": CountryBackend(self.countries),
+            "cache": CacheBackend(self),
+            "gazetteer": GazetteerBackend(self.gazetteer, self.reverse_geocoder),
+            "photon": PhotonBackend(self),
+            "geonames": GeonamesBackend(self),
+        }
+        for name, backend in backends.items():
+            backend.authoritative = name in self.config["authoritative_backends"]
+
+        chains = {}
+        for operation in OPERATIONS:
+            chains[operation] = []
+            for backend in self.config["backend_chains"].get(
+                operation, DEFAULT_BACKEND_CHAINS[operation]
+            ):
+                if not isinstance(backend, Backend):
+                    if backend not in backends:
+                        raise ValueError(f"Unknown backend {backend}")
+                    backend = backends[backend]
+                if backend.supports(operation):
+                    chains[operation].append(backend)
+        return chains
+
+    def _create_validation_policies(self) -> ValidationPolicies:
+        """
+        This function creates the policies deciding which geocoder hits are
+        validated with Geonames, in the order of the validation_policies
+        config field. Policies relying on a disabled cache are left out.
+        """
+        policies = {
+            "authoritative": lambda: AuthoritativePolicy(),
+            "country": lambda: CountryPolicy(self.countries),
+            "cached": lambda: (
+                CachedVerdictPolicy(self.validation_cache)
+                if self.validation_cache is not None
+                else None
+            ),
+            "osm_value": lambda: (
+                OsmValuePolicy(
+                    self.validation_hints,
+                    self.config["validation_trusted_osm_values"],
+                    self.config["validation_min_importance"],
+                )
+                if self.validation_hints is not None
+                else None
+            ),
+        }
+        created = []
+        for name in self.config["validation_policies"]:
+            if name not in policies:
+                raise ValueError(f"Unknown validation policy {name}")
+            policy = policies[name]()
+            if policy is not None:
+                created.append(policy)
+        return ValidationPolicies(created)
+
+    def validation_stats(self) -> Dict[str, int]:
+        """
+        This function returns the number of Geonames validation queries saved
+        by every validation policy, alongside with the number of hits that
+        were validated through the validation chain (field "validated").
+        """
+        return self.validation_policies.stats()
+
+    def _resolve(
+        self, operation: str, *args, skip: Backend = None
+    ) -> Tuple[Any, Union[Backend, None]]:
+        """
+        This function sends a query through the tiers of the resolution chain
+        of the operation, until one of them answers it; the tiers queried
+        before are then offered the answer (e.g. caches store it).
+        Failing tiers are skipped. The function returns the answer alongside
+        with the tier that produced it, or None twice if no tier answered.
+
+        :param operation:   string, one of "search", "validate" and "reverse"
+        :param args:        arguments of the operation
+        :param skip:        Backend, tier already queried by the caller, left
+                            out of the chain but still offered the answer
+                            (default None)
+        """
+        missed = []
+        for backend in self.backend_chains[operation]:
+            if backend is skip:
+                missed.append(backend)
+                continue
+            counters = self.backend_counters[operation][backend.name]
+            start = time.perf_counter()
+            try:
+                result = getattr(backend, operation)(*args)
+            except Exception as error:
+                counters.record(time.perf_counter() - start, error=True)
+                logging.error(f"Error in {operation} {args} on {backend.name}: {error}")
+                continue
+            counters.record(time.perf_counter() - start, hit=result is not None)
+            if result is not None:
+                for previous in missed:
+                    previous.store(operation, args, result)
+                return result, backend
+            missed.append(backend)
+        return None, None
+
+    def backend_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        This function returns the hit, miss and error counters and the mean
+        latency of every tier of the resolution chains, indexed by operation
+        and by name of the tier.
+        """
+        return {
+            operation: {name: stats.stats() for name, stats in counters.items()}
+            for operation, counters in self.backend_counters.items()
+        }
+
+    def close(self) -> None:
+        """
+        This function closes the pooled sessions used to query the upstream
+        services, releasing all their open connections, and writes the
+        recorded exchanges to the cassette if recording.
+        """
+        for session in self.sessions.values():
+            session.close()
+        if self.validation_executor is not None:
+            self.validation_executor.shutdown(wait=False)
+        if self.hedge_executor is not None:
+            self.hedge_executor.shutdown(wait=False)
+        if self.query_executor is not None:
+            self.query_executor.shutdown(wait=False)
+        if self.persistent_cache is not None:
+            self.persistent_cache.close()
+        if self.cassette is not None and self.cassette.mode == Cassette.RECORD:
+            self.cassette.save()
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        This function returns the hit and miss counters of every
+        enabled cache, indexed by the name of the cache.
+        """
+        stats = {}
+        if self.photon_cache is not None:
+            stats["photon"] = self.photon_cache.stats()
+        if self.validation_cache is not None:
+            stats["validation"] = self.validation_cache.stats()
+        if self.reverse_cache is not None:
+            stats["reverse"] = self.reverse_cache.stats()
+        if self.persistent_cache is not None:
+            stats["persistent"] = self.persistent_cache.stats()
+        return stats
+
+    def _query_upstream(
+        self, upstream: str, endpoint: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        This function sends a query to one of the upstream services
+        through its pooled session and returns the decoded json response.
+
+        :param upstream:    string, name of the upstream service
+                            ("photon" or "geonames")
+        :param endpoint:    string, key of the config field holding the
+                            api endpoint to query
+        :param params:      dictionary of query parameters
+        """
+        response = self._get_persistent_response(upstream, endpoint, params)
+        if response is not None:
+            return response
+
+        breaker = self.breakers[upstream]
+
+        for attempt in range(self.config["max_retries"] + 1):
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Circuit breaker of {upstream} is open")
+            try:
+                response = self._send_query(upstream, self.config[endpoint], params)
+            except Exception as error:
+                if not is_upstream_failure(error):
+                    # the upstream answered, the query itself is wrong
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if not is_retryable(error) or attempt == self.config["max_retries"]:
+                    raise
+                logging.warning(f"Retrying query to {upstream} after error: {error}")
+                time.sleep(
+                    backoff_delay(
+                        attempt,
+                        self.config["retry_backoff"],
+                        self.config["retry_backoff_max"],
+                    )
+                )
+                continue
+            breaker.record_success()
+            break
+
+        self._set_persistent_response(upstream, endpoint, params, response)
+        return response
+
+    def _send_query(
+        self, upstream: str, path: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        This function sends a single query to an upstream service and returns
+        the decoded json response. If a cassette is configured, the query is
+        either replayed from the cassette, without reaching the upstream,
+        or recorded in it.
+
+        :param upstream:    string, name of the upstream service
+        :param path:        string, api endpoint to query
+        :param params:      dictionary of query parameters
+        """
+        if self.cassette is None:
+            return self._send_to_replicas(upstream, path, params)
+
+        if self.cassette.mode == Cassette.REPLAY:
+            response, latency = self.cassette.play(upstream, path, params)
+            time.sleep(latency)
+            return self.json_loads(response)
+
+        start = time.monotonic()
+        response = self._send_to_replicas(upstream, path, params)
+        self.cassette.record(upstream, path, params, response, time.monotonic() - start)
+        return response
+
+    def _send_to_replicas(
+        self, upstream: str, path: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        This function sends a single query to the least loaded replica of an
+        upstream service and returns the decoded json response.
+        If hedged requests are enabled and the replica does not answer within
+        the configured percentile of the recent latencies, the same query is
+        sent to a second replica and the first answer is returned.
+
+        :param upstream:    string, name of the upstream service
+        :param path:        string, api endpoint to query
+        :param params:      dictionary of query parameters
+        """
+        pool = self.endpoint_pools[upstream]
+        primary = pool.acquire()
+        if self.hedge_executor is None or len(pool) < 2:
+            return self._send_to_endpoint(upstream, primary, path, params)
+
+        futures = [
+            self.hedge_executor.submit(
+                self._send_to_endpoint, upstream, primary, path, params
+            )
+        ]
+        hedge_delay = pool.latency_percentile(self.config["hedge_percentile"])
+        done, _ = wait(futures, timeout=hedge_delay or self.config["hedge_delay"])
+        if not done:
+            secondary = pool.acquire(exclude=primary)
+            futures.append(
+                self.hedge_executor.submit(
+                    self._send_to_endpoint, upstream, secondary, path, params
+                )
+            )
+
+        # the slower query is left to complete in background
+        for future in as_completed(futures):
+            try:
+                return future.result()
+            except Exception as error:
+                last_error = error
+        raise last_error
+
+    def _send_to_endpoint(
+        self, upstream: str, endpoint: Endpoint, path: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        This function sends a single query to a replica of an upstream service,
+        waiting for its rate limiter and its adaptive concurrency limiter
+        if enabled, and returns the decoded json response.
+
+        :param upstream:    string, name of the upstream service
+        :param endpoint:    replica acquired from the endpoint pool of the upstream
+        :param path:        string, api endpoint to query
+        :param params:      dictionary of query parameters
+        """
+        rate_limiter = self.rate_limiters[upstream]
+        if rate_limiter is not None:
+            time.sleep(rate_limiter.reserve())
+
+        concurrency_limiter = self.concurrency_limiters[upstream]
+        if concurrency_limiter is not None:
+            concurrency_limiter.acquire()
+        start = time.monotonic()
+        failed = True
+        try:
+            response = self.sessions[upstream].get(
+                endpoint.url + path,
+                params=params,
+                timeout=tuple(self.config["timeouts"][upstream]),
+            )
+            response.raise_for_status()
+            response = response.json()
+            failed = False
+            return response
+        except Exception as error:
+            failed = is_upstream_failure(error)
+            raise
+        finally:
+            latency = time.monotonic() - start
+            if concurrency_limiter is not None:
+                concurrency_limiter.release(latency, failed)
+            self.endpoint_pools[upstream].release(endpoint, latency, failed)
+
+    def check_endpoints(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        This function checks the health of every replica of the upstream
+        services, marking as down the ones that cannot be reached or answer
+        with a server error, and returns the state of all the replicas
+        (see endpoint_states).
+        """
+        for upstream, pool in self.endpoint_pools.items():
+            for endpoint in pool.endpoints:
+                try:
+                    response = self.sessions[upstream].get(
+                        endpoint.url,
+                        timeout=tuple(self.config["timeouts"][upstream]),
+                    )
+                    healthy = response.status_code < 500
+                except Exception as error:
+                    logging.warning(
+                        f"Replica {endpoint.url} of {upstream} is down: {error}"
+                    )
+                    healthy = False
+                pool.mark(endpoint, healthy)
+        return self.endpoint_states()
+
+    def endpoint_states(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        This function returns the health and the number of outstanding
+        queries of every replica of the upstream services.
+        """
+        return {
+            upstream: pool.states() for upstream, pool in self.endpoint_pools.items()
+        }
+
+    def concurrency_limits(self) -> Dict[str, float]:
+        """
+        This function returns the current adaptive concurrency limit
+        of every upstream service, if adaptive concurrency is enabled.
+        """
+        return {
+            upstream: limiter.limit
+            for upstream, limiter in self.concurrency_limiters.items()
+            if limiter is not None
+        }
+
+    def breaker_states(self) -> Dict[str, str]:
+        """
+        This function returns the state of the circuit breaker of every
+        upstream service ("closed", "open" or "half_open"). While a breaker
+        is open the queries to its upstream fail straight away and return
+        empty results.
+        """
+        return {upstream: breaker.state for upstream, breaker in self.breakers.items()}
+
+    def _get_persistent_response(
+        self, upstream: str, endpoint: str, params: Dict[str, Any]
+    ) -> Union[Dict[str, Any], None]:
+        """
+        This function returns the response of a query stored in the
+        persistent cache, or None if the query is not cached or the
+        persistent cache is disabled.
+
+        :param upstream:    string, name of the upstream service
+        :param endpoint:    string, key of the config field holding the
+                            api endpoint to query
+        :param params:      dictionary of query parameters
+        """
+        if self.persistent_cache is None:
+            return None
+        return self.persistent_cache.get(
+            upstream, [self.config[endpoint], sorted(params.items())]
+        )
+
+    def _set_persistent_response(
+        self,
+        upstream: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        response: Dict[str, Any],
+    ) -> None:
+        """
+        This function stores the response of a query in the persistent
+        cache, if it is enabled.
+
+        :param upstream:    string, name of the upstream service
+        :param endpoint:    string, key of the config field holding the
+                            api endpoint to query
+        :param params:      dictionary of query parameters
+        :param response:    dictionary containing the decoded response
+        """
+        if self.persistent_cache is None:
+            return
+        self.persistent_cache.set(
+            upstream, [self.config[endpoint], sorted(params.items())], response
+        )
+
     def _get_geonames_info(self, location: str, country: str) -> List[Dict[str, any]]:
         """
         This function returns a list of dictionaries representing the
@@ -70,17 +764,27 @@ class Geocoder:
                                the input location
         """
         try:
-            url_api = (
-                os.environ["GEONAMES_SERVER"] + self.config["geonames_api_endpoint"]
-            )
-
-            response = requests.get(
-                url_api,
-                params={"country": country.lower(), "local_location": location.lower()},
+            response = self._query_upstream(
+                "geonames",
+                "geonames_api_endpoint",
+                {"country": country.lower(), "local_location": location.lower()},
             )
-            response = response.json()
         except Exception as error:
             logging.error(f"Error in querying location {location}: {error} ")
+            return []
+        return self._parse_geonames_response(response, country)
+
+    def _parse_geonames_response(
+        self, response: Dict[str, Any], country: str
+    ) -> List[Dict[str, any]]:
+        """
+        This function turns the response of the Geonames service in the list
+        of locations returned by _get_geonames_info.
+
+        :param response:       dictionary containing the decoded Geonames response
+        :param country:        string that represents the country where the
+                               location was searched
+        """
         results = []
         # Create location object with results
         location = {}
@@ -166,14 +870,85 @@ class Geocoder:
         :params lat:        float representing the latitude coordinates
         :params lon:        float representing the longiture coordinates
         """
-        query_params = {
-            "q": location,
-            "lang": self.config["lang"],
-            "osm_tag": self.config["osm_keys"],
-        }
+        results, _ = self._resolve(
+            "search", location, best_matching, country, lat, lon, location_bias_scale
+        )
+        return results if results is not None else []
+
+    def _search_photon(
+        self,
+        location: str,
+        best_matching: bool = True,
+        country: str = None,
+        lat: float = None,
+        lon: float = None,
+        location_bias_scale: float = 0.1,
+    ) -> List[Dict[str, any]]:
+        """
+        This function queries the Photon search endpoint for the location
+        passed in input, returning the same results as _get_geocode_info.
+        It is the search of the "photon" tier of the resolution chains.
+
+        :param location:       string that represents the location to query for
+        :param best_matching:  bool, if True the first results is returend,
+                               otherwise all the results are returned
+                               (default True)
+        :param country:        string that represents the country where to search
+                               the input location (default None)
+        :params lat:        float representing the latitude coordinates
+        :params lon:        float representing the longiture coordinates
+        """
+        query_params = self._build_geocode_params(
+            location, lat, lon, location_bias_scale, best_matching, country
+        )
+        response = self._query_upstream("photon", "url_api_endpoint", query_params)
+        return self._parse_geocode_response(response, location, best_matching, country)
+
+    def _geocode_cache_key(
+        self, query_params: Dict[str, Any], best_matching: bool, country: str
+    ) -> Tuple:
+        """
+        This function returns the key identifying a Photon search in the
+        cache, made of the full effective query alongside with the filters
+        applied to its response.
+
+        :param query_params:   dictionary of query parameters sent to Photon
+        :param best_matching:  bool, if True only the first result is returned
+        :param country:        string that represents the country where to search
+                               the input location
+        """
+        return (
+            tuple(sorted(query_params.items())),
+            country.lower() if country else None,
+            best_matching,
+        )
+
+    def _build_geocode_params(
+        self,
+        location: str,
+        lat: float = None,
+        lon: float = None,
+        location_bias_scale: float = 0.1,
+        best_matching: bool = False,
+        country: str = None,
+    ) -> Dict[str, Any]:
+        """
+        This function builds the query parameters sent to the Photon
+        search endpoint for the location passed in input (see
+        _geocode_query_params), warning about the location bias scales
+        out of range.
+
+        :param location:            string that represents the location to query for
+        :params lat:                float representing the latitude coordinates
+        :params lon:                float representing the longiture coordinates
+        :location_bias_scale:       float representing the amount of location bias
+                                    desired towards coordinates
+        :param best_matching:       bool, if True only the first valid result
+                                    will be used (default False)
+        :param country:             string that represents the country where to
+                                    search the input location (default None)
+        """
         if lat and lon:
-            query_params["lat"] = lat
-            query_params["lon"] = lon
             # Check location bias is correct
             # Location bias is a parameter that can be set up when using coordinates
             # to give preference to matching locations closer to the coordinates provided
@@ -181,66 +956,155 @@ class Geocoder:
                 logging.warning(
                     "location bias scale used below min value. Setting to 0.1"
                 )
-                location_bias_scale = 0.1
             if location_bias_scale > 1:
                 logging.warning(
                     "location bias scale used above max value. Setting to 1.0"
                 )
-                location_bias_scale = 1.0
+        return self._geocode_query_params(
+            location, lat, lon, location_bias_scale, best_matching, country
+        )
+
+    def _geocode_query_params(
+        self,
+        location: str,
+        lat: float = None,
+        lon: float = None,
+        location_bias_scale: float = 0.1,
+        best_matching: bool = False,
+        country: str = None,
+    ) -> Dict[str, Any]:
+        """
+        This function returns the query parameters sent to the Photon
+        search endpoint for the location passed in input, without logging,
+        so that it can also build the cache keys of the searches.
+        The number of results and, when a country is given, the area searched
+        are restricted on the Photon side, so that only the features that can
+        end up in the results are sent back.
+
+        :param location:            string that represents the location to query for
+        :params lat:                float representing the latitude coordinates
+        :params lon:                float representing the longiture coordinates
+        :location_bias_scale:       float representing the amount of location bias
+                                    desired towards coordinates, set between
+                                    0.1 and 1.0
+        :param best_matching:       bool, if True only the first valid result
+                                    will be used (default False)
+        :param country:             string that represents the country where to
+                                    search the input location (default None)
+        """
+        query_params = {
+            "q": location,
+            "lang": self.config["lang"],
+            "osm_tag": self.config["osm_keys"],
+        }
+        if lat and lon:
+            query_params["lat"] = lat
+            query_params["lon"] = lon
+            query_params["location_bias_scale"] = min(
+                max(location_bias_scale, 0.1), 1.0
+            )
 
-            query_params["location_bias_scale"] = location_bias_scale
+        # a few more results than needed are requested as some of them
+        # can be discarded for missing fields
+        limit = (
+            self.config["photon_best_matching_limit"]
+            if best_matching
+            else self.config["photon_limit"]
+        )
+        if limit:
+            query_params["limit"] = limit
 
-        try:
-            url_api = os.environ["PHOTON_SERVER"] + self.config["url_api_endpoint"]
+        if country and self.config["photon_country_bbox"]:
+            bbox = self._country_search_bbox(country)
+            if bbox:
+                query_params["bbox"] = bbox
 
-            response = requests.get(url_api, params=query_params)
-            response = response.json()
-        except Exception as error:
-            logging.error(f"Error in querying location {location} : {error}")
+        return query_params
+
+    def _country_search_bbox(self, country: str) -> Union[str, None]:
+        """
+        This function returns the bounding box of the country passed in input
+        formatted as the bbox parameter of Photon (min_lon,min_lat,max_lon,max_lat).
+        None is returned for unknown countries and for countries whose
+        bounding box crosses the antimeridian, that Photon cannot filter on.
+
+        :param country:     string that represents the country
+        """
+        bbox = self.country_bbox.get(country.lower())
+        if not bbox or bbox[0] >= bbox[2] or bbox[1] <= bbox[3]:
+            return None
+        return ",".join(str(value) for value in [bbox[0], bbox[3], bbox[2], bbox[1]])
 
+    def _parse_geocode_response(
+        self,
+        response: Dict[str, Any],
+        location: str,
+        best_matching: bool = True,
+        country: str = None,
+    ) -> List[Dict[str, any]]:
+        """
+        This function turns the response of the Photon search endpoint in the
+        list of locations returned by _get_geocode_info.
+
+        :param response:       dictionary containing the decoded Photon response
+        :param location:       string that represents the queried location
+        :param best_matching:  bool, if True the first results is returend,
+                               otherwise all the results are returned
+                               (default True)
+        :param country:        string that represents the country where to search
+                               the input location (default None)
+        """
         results = []
 
-        for i in range(len(response["features"])):
-            location = {}
-            features = response["features"][i]
+        for features in response["features"]:
+            properties = features["properties"]
 
             # Essential check - name and country
             # avoid data with missing fields
             # This order is important to avoid issues with countries with no extent field like Switzerland
-            if "name" not in features["properties"].keys():
-                continue
-            if "country" not in features["properties"].keys():
+            if "name" not in properties or "country" not in properties:
                 continue
+            name = properties["name"]
+            result_country = properties["country"]
             # If the location queried is a country,
             # then retrieve the bounding box from countries_bbox.json
             if (
-                features["properties"]["name"].lower()
-                == features["properties"]["country"].lower()
-            ) and features["properties"]["country"].lower() in self.country_bbox:
-                features["properties"]["extent"] = self.country_bbox[
-                    features["properties"]["country"].lower()
-                ]
+                name.lower() == result_country.lower()
+                and result_country.lower() in self.country_bbox
+            ):
+                properties["extent"] = self.country_bbox[result_country.lower()]
 
             # Secondary check
-            if "extent" not in features["properties"].keys():
+            if "extent" not in properties:
                 continue
-            if "coordinates" not in features["geometry"].keys():
+            if "coordinates" not in features["geometry"]:
                 continue
 
             # check if a country is provided and filter other locations
-            if country and features["properties"]["country"].lower() != country.lower():
+            if country and result_country.lower() != country.lower():
                 logging.debug(
-                    f'For location {location} with result: {features["properties"]["name"]} . Country provided {country} is different from obtained country {features["properties"]["country"]}'
+                    f"For location {location} with result: {name} . Country provided {country} is different from obtained country {result_country}"
                 )
                 continue
 
-            location["bounding_box"] = features["properties"]["extent"]
-            location["name"] = features["properties"]["name"]
-            location["country"] = features["properties"]["country"]
-            location["coordinates"] = features["geometry"]["coordinates"]
-
             # Add results
-            results.append(location)
+            results.append(
+                {
+                    "bounding_box": properties["extent"],
+                    "name": name,
+                    "country": result_country,
+                    "coordinates": features["geometry"]["coordinates"],
+                }
+            )
+            # keep the feature type for the validation policies
+            if self.validation_hints is not None:
+                self.validation_hints.set(
+                    self._validation_key(results[-1]),
+                    {
+                        "osm_value": properties.get("osm_value"),
+                        "importance": properties.get("importance"),
+                    },
+                )
 
             # the first results is the always the best matching one
             if best_matching:
@@ -248,14 +1112,23 @@ class Geocoder:
         return results
 
     def _validate_locations(
-        self, initial_results: List[Dict[str, any]], location: str
+        self,
+        initial_results: List[Dict[str, any]],
+        location: str,
+        backend: Backend = None,
     ) -> List[Dict[str, Any]]:
         """
         This function validates any geocoder hits with the geonames service.
-        This mainly used for validating locations from entities resulting from the NLP pipeline
+        This mainly used for validating locations from entities resulting from the NLP pipeline.
+        Hits sharing the same name and country are validated only once, and
+        the distinct (name, country) pairs are validated concurrently.
+        Pairs whose verdict is decided by the validation policies (e.g. countries,
+        cached verdicts) are not validated.
 
         :params initial_results:        List of locations obtained from the Photon geocoder
         :params locations:              String of containing location to be validated
+        :params backend:                tier of the search chain that found the hits
+                                        (default None)
 
         """
         # Check for initial results
@@ -264,28 +1137,139 @@ class Geocoder:
                 f"Can't validate location {location}. Empty Geocoder hits: {initial_results}"
             )
             return []
-        # Init list
-        validated_results = []
         for geocode_hit in initial_results:
             logging.info(f"Validating location {location}. Geocoder hit: {geocode_hit}")
-            # Validate with geonames
-            validated_hits = self._get_geonames_info(
-                geocode_hit["name"], geocode_hit["country"]
-            )
-            for validated_hit in validated_hits:
-                # where the geonames validation magic happens
-                if validated_hit["name"].lower() == geocode_hit["name"].lower():
-                    if (
-                        validated_hit["country"].lower()
-                        == geocode_hit["country"].lower()
-                    ):
-                        validated_results.append(geocode_hit)
-                else:
-                    continue
-            if not validated_results:
-                logging.warning(
-                    f"Location validation failed for {location}. Returning empty result"
+        # Validate with geonames the hits not decided by the policies
+        verdicts, validation_keys = self._decide_validation(initial_results, backend)
+        if len(validation_keys) == 1:
+            verdicts[validation_keys[0]] = self._validate_name_country(
+                *validation_keys[0], skip=self.policy_cache_tier
+            )
+        elif validation_keys:
+            verdicts.update(
+                zip(
+                    validation_keys,
+                    self.validation_executor.map(
+                        lambda key: self._validate_name_country(
+                            *key, skip=self.policy_cache_tier
+                        ),
+                        validation_keys,
+                    ),
                 )
+            )
+        return self._collect_validated_hits(initial_results, verdicts, location)
+
+    def _decide_validation(
+        self, initial_results: List[Dict[str, any]], backend: Backend = None
+    ) -> Tuple[Dict[Tuple[str, str], bool], List[Tuple[str, str]]]:
+        """
+        This function applies the validation policies to the distinct
+        (name, country) pairs of the geocoder hits, returning the verdicts
+        they decided and the list of the pairs left to validate.
+
+        :params initial_results:        List of locations obtained from the Photon geocoder
+        :params backend:                tier of the search chain that found the hits
+        """
+        keys_hits = {}
+        for hit in initial_results:
+            keys_hits.setdefault(self._validation_key(hit), hit)
+        return self.validation_policies.decide(keys_hits, backend)
+
+    def _validation_key(self, geocode_hit: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        This function returns the normalized (name, country) pair
+        used to validate a geocoder hit.
+
+        :params geocode_hit:        Location obtained from the Photon geocoder
+        """
+        return (
+            geocode_hit["name"].strip().lower(),
+            geocode_hit["country"].strip().lower(),
+        )
+
+    def _validate_name_country(
+        self, name: str, country: str, skip: Backend = None
+    ) -> bool:
+        """
+        This function checks that a location with the given name exists in
+        the given country, through the validation chain (by default the
+        validation cache, the gazetteer and the geonames service).
+        Both positive and negative outcomes are stored in the validation
+        cache, if enabled, while failed queries are not.
+
+        :params name:       normalized name of the location to validate
+        :params country:    normalized name of its country
+        :params skip:       Backend, tier of the validation chain already
+                            queried, e.g. the cache read by the validation
+                            policies (default None)
+        """
+        verdict, _ = self._resolve("validate", name, country, skip=skip)
+        return bool(verdict)
+
+    def _validate_with_geonames(self, name: str, country: str) -> bool:
+        """
+        This function checks with the geonames service that a location
+        with the given name exists in the given country. It is the
+        validation of the "geonames" tier of the resolution chains.
+
+        :params name:       normalized name of the location to validate
+        :params country:    normalized name of its country
+        """
+        response = self._query_upstream(
+            "geonames",
+            "geonames_api_endpoint",
+            {"country": country, "local_location": name},
+        )
+        return self._is_validated(
+            name, country, self._parse_geonames_response(response, country)
+        )
+
+    def _is_validated(
+        self, name: str, country: str, validated_hits: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        This function checks if any of the locations returned by the
+        geonames service has the same name and country of the location
+        to validate.
+
+        :params name:               normalized name of the location to validate
+        :params country:            normalized name of its country
+        :params validated_hits:     List of locations obtained from the geonames service
+        """
+        for validated_hit in validated_hits:
+            # where the geonames validation magic happens
+            if (
+                validated_hit["name"].lower() == name
+                and validated_hit["country"].lower() == country
+            ):
+                return True
+        return False
+
+    def _collect_validated_hits(
+        self,
+        initial_results: List[Dict[str, any]],
+        verdicts: Dict[Tuple[str, str], bool],
+        location: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        This function returns, without duplicates, the geocoder hits whose
+        (name, country) pair has been validated.
+
+        :params initial_results:        List of locations obtained from the Photon geocoder
+        :params verdicts:               Dict mapping every (name, country) pair
+                                        to the outcome of its validation
+        :params locations:              String of containing location to be validated
+        """
+        validated_results = []
+        for geocode_hit in initial_results:
+            if not verdicts[self._validation_key(geocode_hit)]:
+                continue
+            if geocode_hit not in validated_results:
+                validated_results.append(geocode_hit)
+        if not validated_results:
+            logging.warning(
+                f"Location validation failed for {location}. Returning empty result"
+            )
         return validated_results
 
     def get_location_info(
@@ -322,47 +1306,276 @@ class Geocoder:
                                desired towards coordinates. lower values represent more narrow search
         :validate:             boolean that trigger validation process using geonames server
         """
-        # Check validity of location
-        location = self.check_valid_location(location)
-        if location is False:
-            return []
-        # Query geocoder to find the best location in photon for that particular query
-        initial_results = self._get_geocode_info(
-            location, best_matching, country, lat, lon, location_bias_scale
+        # Check validity of location
+        location = self.check_valid_location(location)
+        if location is False:
+            return []
+        # Query geocoder to find the best location in photon for that particular query
+        initial_results, backend = self._resolve(
+            "search", location, best_matching, country, lat, lon, location_bias_scale
+        )
+        # Validate result with geonames service
+        if validate:
+            return self._validate_locations(initial_results or [], location, backend)
+
+        return initial_results or []
+
+    def _get_location_info_safe(
+        self, query: Tuple[str, str, float, float], **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        This function wraps get_location_info for the batch entry points,
+        so that a failing query returns an empty result instead of
+        interrupting the whole batch.
+
+        :params query:      tuple of location, country, latitude and longitude
+        :params kwargs:     parameters forwarded to get_location_info
+        """
+        location, country, lat, lon = query
+        try:
+            return self.get_location_info(
+                location, country=country, lat=lat, lon=lon, **kwargs
+            )
+        except Exception as error:
+            logging.error(f"Error in querying location {location}: {error}")
+            return []
+
+    def _location_queries_positions(
+        self, locations: List[Union[str, Dict[str, Any]]]
+    ) -> Dict[Tuple[str, str, float, float], List[int]]:
+        """
+        This function maps every distinct query of a list of locations
+        to the positions where it appears in the list. Queries are tuples
+        of location, country, latitude and longitude.
+
+        :params locations:      list of strings or dictionaries
+                                representing the locations to query for
+        """
+        positions = {}
+        for index, item in enumerate(locations):
+            if isinstance(item, str):
+                query = (item, None, None, None)
+            else:
+                query = (
+                    item["location"],
+                    item.get("country"),
+                    item.get("lat"),
+                    item.get("lon"),
+                )
+            positions.setdefault(query, []).append(index)
+        return positions
+
+    def iter_location_info_many(
+        self,
+        locations: List[Union[str, Dict[str, Any]]],
+        best_matching: bool = True,
+        location_bias_scale: float = 0.1,
+        validate: bool = True,
+        max_workers: int = None,
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        This function resolves a list of locations on a bounded pool of
+        workers, yielding the results as soon as they are available.
+        Every location can be either a string or a dictionary with the field
+        "location" and the optional fields "country", "lat" and "lon".
+        Identical queries are sent only once and a copy of their result is
+        yielded for every other position where they appear.
+        The function yields tuples made of the position of the location in the
+        input list and the result of get_location_info for that location.
+
+        :params locations:              list of strings or dictionaries
+                                        representing the locations to query for
+        :params best_matching:          bool, if True the first results is returned,
+                                        otherwise all the results are returned
+        :params location_bias_scale:    float representing the amount of location bias
+                                        desired towards coordinates
+        :params validate:               boolean that trigger validation process
+                                        using geonames server
+        :params max_workers:            int, maximum number of concurrent queries
+                                        (default is the max_workers config field)
+        """
+        positions = self._location_queries_positions(locations)
+        for query, result in self._map_queries(
+            lambda query: self._get_location_info_safe(
+                query,
+                best_matching=best_matching,
+                location_bias_scale=location_bias_scale,
+                validate=validate,
+            ),
+            positions,
+            max_workers,
+        ):
+            first, *others = positions[query]
+            yield first, result
+            for index in others:
+                yield index, copy.deepcopy(result)
+
+    def _map_queries(
+        self, function: Callable, queries: Iterable, max_workers: int = None
+    ) -> Iterator[Tuple[Any, Any]]:
+        """
+        This function runs the function passed in input on every query, on
+        the thread pool of the geocoder shared by all the lists of queries,
+        yielding the queries alongside with their results as soon as they
+        are available. At most max_workers queries of the list are submitted
+        to the pool at the same time.
+
+        :params function:       function called with every query
+        :params queries:        iterable of the distinct queries
+        :params max_workers:    int, maximum number of concurrent queries
+                                (default is the max_workers config field)
+        """
+        queries = iter(queries)
+        futures = {}
+
+        def submit(count: int) -> None:
+            for query in itertools.islice(queries, count):
+                futures[self.query_executor.submit(function, query)] = query
+
+        submit(max_workers or self.config["max_workers"])
+        try:
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                submit(len(done))
+                for future in done:
+                    yield futures.pop(future), future.result()
+        finally:
+            # stop pending queries if the caller stops consuming the results
+            for future in futures:
+                future.cancel()
+
+    def get_location_info_many(
+        self,
+        locations: List[Union[str, Dict[str, Any]]],
+        best_matching: bool = True,
+        location_bias_scale: float = 0.1,
+        validate: bool = True,
+        max_workers: int = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        This function resolves a list of locations on a bounded pool of
+        workers and returns their results in the same order of the input list.
+        Every location can be either a string or a dictionary with the field
+        "location" and the optional fields "country", "lat" and "lon".
+        Identical queries are sent only once.
+
+        :params locations:              list of strings or dictionaries
+                                        representing the locations to query for
+        :params best_matching:          bool, if True the first results is returned,
+                                        otherwise all the results are returned
+        :params location_bias_scale:    float representing the amount of location bias
+                                        desired towards coordinates
+        :params validate:               boolean that trigger validation process
+                                        using geonames server
+        :params max_workers:            int, maximum number of concurrent queries
+                                        (default is the max_workers config field)
+        """
+        results = [[] for _ in locations]
+        for index, result in self.iter_location_info_many(
+            locations, best_matching, location_bias_scale, validate, max_workers
+        ):
+            results[index] = result
+        return results
+
+    def _get_reverse_info(
+        self, lat: float, lon: float, radius: float = 50, skip: Backend = None
+    ):
+        """
+        This function takes a set of coordinates and tries to infer the location using those.
+        If the location is within a city it will return the city name instead of the actual location name
+        :params lat:        float representing the latitude coordinates
+        :params lon:        float representing the longiture coordinates
+        :params radius:     float representing the radius around the coordinates
+        :params skip:       Backend, tier of the reverse chain already queried
+                            (default None)
+        """
+        location, _ = self._resolve("reverse", lat, lon, radius, skip=skip)
+        return location if location is not None else {}
+
+    def _reverse_photon(
+        self, lat: float, lon: float, radius: float = 50
+    ) -> Dict[str, Any]:
+        """
+        This function queries the Photon reverse endpoint for the coordinates
+        passed in input, returning the same location as _get_reverse_info.
+        It is the reverse query of the "photon" tier of the resolution chains.
+
+        :params lat:        float representing the latitude coordinates
+        :params lon:        float representing the longiture coordinates
+        :params radius:     float representing the radius around the coordinates
+        """
+        response = self._query_upstream(
+            "photon",
+            "url_reverse_endpoint",
+            {
+                "lat": lat,
+                "lon": lon,
+                "radius": radius,
+                "lang": self.config["lang"],
+            },
         )
-        # Validate result with geonames service
-        if validate:
-            return self._validate_locations(initial_results, location)
+        return self._parse_reverse_response(response, lat, lon)
 
-        return initial_results
+    def _get_offline_reverse_info_many(
+        self, coordinates: List[Tuple[float, float]], radius: float
+    ) -> Tuple[List[Union[Dict[str, Any], None]], Union[Backend, None]]:
+        """
+        This function reverse geocodes a list of coordinates in a single batch
+        with the offline reverse geocoder, when the gazetteer tier is in the
+        reverse chain, returning the nearest place of the gazetteer for every
+        pair, or None if none is within the radius, so that the misses can be
+        sent to the other tiers of the chain. The gazetteer tier is returned
+        as well, None (and no result) if it is not in the chain.
+
+        :params coordinates:    list of (latitude, longitude) pairs
+        :params radius:         float representing the radius around the coordinates
+        """
+        for backend in self.backend_chains["reverse"]:
+            if isinstance(backend, GazetteerBackend):
+                break
+        else:
+            return [None for _ in coordinates], None
+        if not coordinates:
+            return [], backend
+        start = time.perf_counter()
+        latitudes, longitudes = zip(*coordinates)
+        results = [
+            location or None
+            for location in backend.reverse_geocoder.lookup_many(
+                latitudes, longitudes, radius
+            )
+        ]
+        self.backend_counters["reverse"][backend.name].record(
+            time.perf_counter() - start, hit=any(results)
+        )
+        return results, backend
 
-    def _get_reverse_info(self, lat: float, lon: float, radius: float = 50):
+    def _reverse_cache_key(self, lat: float, lon: float, radius: float) -> Tuple:
         """
-        This function takes a set of coordinates and tries to infer the location using those.
-        If the location is within a city it will return the city name instead of the actual location name
+        This function returns the key identifying a reverse query in the
+        cache: coordinates are quantized to the geohash cell containing them,
+        whose size is set by the reverse_cache_precision config field.
+
         :params lat:        float representing the latitude coordinates
         :params lon:        float representing the longiture coordinates
         :params radius:     float representing the radius around the coordinates
         """
-        try:
-            url_api = os.environ["PHOTON_SERVER"] + self.config["url_reverse_endpoint"]
+        return (
+            geohash(float(lat), float(lon), self.config["reverse_cache_precision"]),
+            radius,
+        )
 
-            response = requests.get(
-                url_api,
-                params={
-                    "lat": lat,
-                    "lon": lon,
-                    "radius": radius,
-                    "lang": self.config["lang"],
-                },
-            )
-            response = response.json()
-        except Exception as error:
-            logging.error(
-                f"Error in querying latitude: {lat} - longitude: {lon} : {error}"
-            )
-            return {}
+    def _parse_reverse_response(
+        self, response: Dict[str, Any], lat: float, lon: float
+    ) -> Dict[str, Any]:
+        """
+        This function turns the response of the Photon reverse endpoint in the
+        location returned by _get_reverse_info.
 
+        :params response:   dictionary containing the decoded Photon response
+        :params lat:        float representing the queried latitude
+        :params lon:        float representing the queried longitude
+        """
         location = {}
         try:
             features = response["features"][0]
@@ -387,38 +1600,260 @@ class Geocoder:
         self,
         lat: float,
         lon: float,
+        radius: float = 50,
     ) -> Dict[str, Any]:
         """
         This function takes a set of coordinates to find the right location associate to those coordinates.
 
         :params lat:                    float representing the latitude coordinates
         :params lon:                    float representing the longiture coordinates
+        :params radius:                 float representing the radius around the coordinates
 
         """
         # Init queries
-        result = self._get_reverse_info(lat, lon)
+        result = self._get_reverse_info(lat, lon, radius)
         return result
 
-    def get_country_neighbors(self, country: str) -> List[str]:
+    def _coordinates_cells_positions(
+        self, coordinates: List[Tuple[float, float]], radius: float
+    ) -> Dict[Tuple, List[int]]:
+        """
+        This function maps the cache key of every distinct cell of a list of
+        coordinates to the positions of the coordinates falling in that cell.
+
+        :params coordinates:    list of (latitude, longitude) pairs
+        :params radius:         float representing the radius around the coordinates
+        """
+        positions = {}
+        for index, (lat, lon) in enumerate(coordinates):
+            positions.setdefault(self._reverse_cache_key(lat, lon, radius), []).append(
+                index
+            )
+        return positions
+
+    def get_locations_from_coordinates(
+        self,
+        coordinates: List[Tuple[float, float]],
+        radius: float = 50,
+        max_workers: int = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        This function finds the locations associated to a list of coordinates.
+        Coordinates falling in the same cell (see reverse_cache_precision) are
+        resolved with a single query, using the first coordinates of the cell,
+        and the distinct cells are queried on a bounded pool of workers; every
+        coordinates of a cell get their own copy of the location.
+        With the offline reverse geocoder (see offline_reverse) all the
+        coordinates are instead resolved exactly, in a single batch, and only
+        the ones without a place within the radius are sent to the other tiers.
+        Results are returned in the same order of the input list.
+
+        :params coordinates:    list of (latitude, longitude) pairs
+        :params radius:         float representing the radius around the coordinates
+        :params max_workers:    int, maximum number of concurrent queries
+                                (default is the max_workers config field)
+        """
+        results, offline_backend = self._get_offline_reverse_info_many(
+            coordinates, radius
+        )
+        missing = [index for index, location in enumerate(results) if location is None]
+        positions = self._coordinates_cells_positions(
+            [coordinates[index] for index in missing], radius
+        )
+        if not positions:
+            return results
+
+        for cell, location in self._map_queries(
+            lambda cell: self._get_reverse_info(
+                *coordinates[missing[positions[cell][0]]], radius, skip=offline_backend
+            ),
+            positions,
+            max_workers,
+        ):
+            first, *others = positions[cell]
+            results[missing[first]] = location
+            for index in others:
+                results[missing[index]] = copy.deepcopy(location)
+        return results
+
+    def get_country_neighbors(self, country: str, hops: int = 1) -> List[str]:
         """
-        This function returns the countries that have a common
-        border with the country specified in input.
+        This function returns the sorted list of the countries that have
+        a common border with the country specified in input, or an empty
+        list for unknown countries. A ValueError is raised if hops is
+        greater than country_graph_max_hops.
 
         :param country: string of the country name to look for its
                         neighbors.
+        :param hops:    int, if greater than 1 the countries within this
+                        number of borders are returned, up to
+                        country_graph_max_hops (default 1)
+        """
+
+        return self.country_graph.neighbors(country, hops)
+
+    def countries_within_hops(
+        self, countries_a: List[str], countries_b: List[str], hops: int = 1
+    ) -> np.ndarray:
         """
+        This function checks, for every pair of countries of the two lists
+        passed in input, if the two countries are within the number of borders
+        passed in input, e.g. to score many candidate countries at once.
+        A country is within 0 borders of itself, unknown countries are never
+        within any number of borders. A ValueError is raised if hops is
+        greater than country_graph_max_hops.
+
+        :param countries_a: list of country names
+        :param countries_b: list of country names, of the same length
+        :param hops:        int, maximum number of borders, up to
+                            country_graph_max_hops (default 1)
+        """
+
+        return self.country_graph.within_hops(countries_a, countries_b, hops)
+
+    def get_nearest_countries(
+        self, coordinates: List[float], k: int = 1
+    ) -> List[Tuple[str, float]]:
+        """
+        This function returns the k countries whose bounding box is nearest to
+        a point (longitude, latitude) or to a bounding box, alongside with
+        their distance in meters (0 for the bounding boxes containing or
+        intersecting it), from the nearest one.
+
+        :param coordinates: list of two floats (longitude, latitude) or of four
+                            floats (min lon, max lat, max lon, min lat)
+        :param k:           int, number of countries returned (default 1)
+        """
+
+        return self.get_nearest_countries_many([coordinates], k)[0]
+
+    def get_nearest_countries_many(
+        self, coordinates: np.ndarray, k: int = 1
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        This function is the batch version of get_nearest_countries, looking
+        up all the points, shape (N, 2), or bounding boxes, shape (N, 4), in
+        the spatial index of the country bounding boxes at once.
 
-        return self.map_country_neighbors[country]
+        :param coordinates: array of points or bounding boxes
+        :param k:           int, number of countries returned (default 1)
+        """
+
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        if coordinates.ndim == 2 and coordinates.shape[1] == 2:
+            coordinates = np.hstack([coordinates, coordinates])
+        countries, distances = self.country_index.nearest_many(coordinates, k)
+        return [
+            [
+                (self.country_index_names[country], distance)
+                for country, distance in zip(row_countries, row_distances)
+            ]
+            for row_countries, row_distances in zip(
+                countries.tolist(), distances.tolist()
+            )
+        ]
 
     def reverse_geocode_bounding_box(self, bounding_box: List[float]) -> List[str]:
+        """
+        This function returns the countries whose bounding box intersects the
+        bounding box passed in input, looked up in the spatial index of the
+        country bounding boxes. A bounding box whose min longitude is greater
+        than its max one crosses the antimeridian.
+
+        :param bounding_box:    list of four floats (min lon, max lat,
+                                max lon, min lat)
+        """
+
+        return self.reverse_geocode_bounding_boxes([bounding_box])[0]
 
-        countries_in_bbox = []
+    @property
+    def country_grid(self) -> CountryGrid:
+        """
+        This property returns the grid resolving coordinates to countries,
+        compiled over the country bounding boxes when first used.
+        """
+        if self._country_grid is None:
+            self._country_grid = CountryGrid(
+                list(self.country_bbox.values()),
+                self.config["country_grid_cell_size"],
+            )
+        return self._country_grid
+
+    def get_country_from_coordinates(self, lat: float, lon: float) -> Union[str, None]:
+        """
+        This function returns the country of a pair of coordinates offline,
+        from the grid compiled over the country bounding boxes: the country
+        whose bounding box contains the coordinates, or None if no country
+        bounding box contains them or if the bounding boxes of several
+        countries do (e.g. near borders, see
+        get_country_candidates_from_coordinates).
+
+        :param lat:         float representing the latitude coordinates
+        :param lon:         float representing the longitude coordinates
+        """
+
+        return self.get_countries_from_coordinates([lat], [lon])[0]
+
+    def get_countries_from_coordinates(
+        self, latitudes: np.ndarray, longitudes: np.ndarray
+    ) -> List[Union[str, None]]:
+        """
+        This function is the batch version of get_country_from_coordinates,
+        all the coordinates are looked up in the grid at once.
+
+        :param latitudes:   array of latitudes in degrees
+        :param longitudes:  array of longitudes in degrees
+        """
+
+        return [
+            self.country_index_names[country] if country >= 0 else None
+            for country in self.country_grid.lookup_many(latitudes, longitudes).tolist()
+        ]
+
+    def get_country_candidates_from_coordinates(
+        self, lat: float, lon: float
+    ) -> List[str]:
+        """
+        This function returns the countries whose bounding box contains a
+        pair of coordinates, e.g. ["austria", "hungary"] for Vienna, as the
+        candidates that get_country_from_coordinates does not choose among.
+
+        :param lat:         float representing the latitude coordinates
+        :param lon:         float representing the longitude coordinates
+        """
+
+        return self.get_country_candidates_from_coordinates_many([lat], [lon])[0]
+
+    def get_country_candidates_from_coordinates_many(
+        self, latitudes: np.ndarray, longitudes: np.ndarray
+    ) -> List[List[str]]:
+        """
+        This function is the batch version of
+        get_country_candidates_from_coordinates.
+
+        :param latitudes:   array of latitudes in degrees
+        :param longitudes:  array of longitudes in degrees
+        """
+
+        return [
+            [self.country_index_names[country] for country in countries]
+            for countries in self.country_grid.candidates_many(latitudes, longitudes)
+        ]
 
-        for country in self.country_bbox.keys():
-            if self.check_intersection(bounding_box, self.country_bbox[country]):
-                countries_in_bbox.append(country)
+    def reverse_geocode_bounding_boxes(
+        self, bounding_boxes: np.ndarray
+    ) -> List[List[str]]:
+        """
+        This function is the batch version of reverse_geocode_bounding_box,
+        all the bounding boxes are looked up in the spatial index at once.
+
+        :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+        """
 
-        return countries_in_bbox
+        return [
+            [self.country_index_names[country] for country in countries]
+            for countries in self.country_index.query_many(bounding_boxes)
+        ]
 
     def filter_ner_countries(
         self, ner_tags: List[Dict[str, any]]
@@ -445,6 +1880,81 @@ class Geocoder:
                     ner_local_tags.append(tag)
         return ner_country_tags, ner_local_tags
 
+    def _run_location_queries(self, steps: Generator) -> Any:
+        """
+        This function drives a generator of location queries, such as
+        _double_check_countries_steps. Every time the generator yields
+        a list of (name, country) queries, they are resolved with
+        get_location_info and the list of results is sent back to it.
+        Every distinct query is resolved only once for the whole run: the
+        queries of a list that were not resolved yet are deduplicated and
+        resolved concurrently, in a single round, while the others reuse
+        the results of the previous rounds.
+        The value returned by the generator is returned.
+
+        :params steps:      generator yielding lists of (name, country) queries
+        """
+        resolved = {}
+        try:
+            queries = next(steps)
+            while True:
+                pending = self._pending_location_queries(queries, resolved)
+                if pending:
+                    results = self.get_location_info_many(
+                        [
+                            {"location": name, "country": country}
+                            for name, country in pending
+                        ]
+                    )
+                    resolved.update(zip(pending, results))
+                queries = steps.send(
+                    [copy.deepcopy(resolved[query]) for query in queries]
+                )
+        except StopIteration as stop:
+            return stop.value
+
+    def _pending_location_queries(
+        self, queries: List[Tuple[str, str]], resolved: Dict[Tuple[str, str], Any]
+    ) -> List[Tuple[str, str]]:
+        """
+        This function returns the distinct (name, country) queries
+        of a list that have not been resolved yet.
+
+        :params queries:    list of (name, country) queries
+        :params resolved:   dictionary mapping the resolved queries to their results
+        """
+        return [query for query in dict.fromkeys(queries) if query not in resolved]
+
+    def _update_mapping_countries_steps(
+        self,
+        mapping_countries: Dict[str, any],
+        updates: List[Tuple[str, str, str]],
+    ) -> Generator:
+        """
+        This generator holds the logic of update_mapping_countries for a list
+        of updates, yielding the (name, country) queries it needs to be resolved.
+        Updates are applied in order, so when a location has more than one
+        candidate country the last one that can be used is kept.
+
+        :params mapping_countries:          Dictionary of locations to be updated
+        :params updates:                    List of tuples of local location, country
+                                            to be updated and country to be used
+
+        :returns mapping_countries:         Updated Dictionary of mappings of countries
+        """
+        queries = [
+            (name, new_country)
+            for name, old_country, new_country in updates
+            if old_country != new_country
+        ]
+        new_locations = yield queries
+        for (name, _), new_location in zip(queries, new_locations):
+            # check if the reference country can be used for this location
+            if new_location:
+                mapping_countries[name] = new_location[0]["country"]
+
+        return mapping_countries
+
     def update_mapping_countries(
         self,
         mapping_countries: Dict[str, any],
@@ -465,15 +1975,11 @@ class Geocoder:
         :returns mapping_countries:         Updated Dictionary of mappings of countries
                                             used to update locations
         """
-        if old_country != new_country:
-            new_location = self.get_location_info(
-                name, country=new_country, best_matching=True
+        return self._run_location_queries(
+            self._update_mapping_countries_steps(
+                mapping_countries, [(name, old_country, new_country)]
             )
-            # check if the reference country can be used for this location
-            if new_location:
-                mapping_countries[name] = new_location[0]["country"]
-
-        return mapping_countries
+        )
 
     def double_check_countries(
         self,
@@ -494,6 +2000,8 @@ class Geocoder:
         state if appears more than once in the list.
         The function returns a new list of locations with new inferred countries
         if possible.
+        If the double_check_mode config field is "lattice", the countries are
+        picked by disambiguate_countries instead, and top_countries is ignored.
 
         :param locations:           list of dictionaries that represents a location
                                     as produced by the get_location_info method
@@ -502,6 +2010,138 @@ class Geocoder:
         :param ner_location_tags:   list of ner tags associated to locations to
                                     be filtered to countries
         """
+        if self.config["double_check_mode"] == "lattice":
+            return self.disambiguate_countries(locations, ner_tags)
+        return self._run_location_queries(
+            self._double_check_countries_steps(locations, ner_tags, top_countries)
+        )
+
+    def disambiguate_countries(
+        self,
+        locations: List[Dict[str, any]],
+        ner_tags: List[Dict[str, any]],
+        validate: bool = True,
+    ) -> List[Dict[str, any]]:
+        """
+        This function reassigns the locations of a document to coherent
+        countries with a single multi-result query per distinct location:
+        the candidates of all the locations are fetched at once and every
+        location x country assignment is scored in memory (see
+        disambiguation.CandidateLattice), using the majority of the locations,
+        the countries named by the NER tags and the neighbors of the countries.
+        No further query is sent whatever the number of candidate countries.
+        The function returns a new list of locations, aligned with the input.
+
+        :param locations:           list of dictionaries that represents a location
+                                    as produced by the get_location_info method
+        :param ner_tags:            list of ner tags associated to locations to
+                                    be filtered to countries
+        :param validate:            bool, if True the candidates are validated
+                                    with the geonames service, as the queries
+                                    of double_check_countries (default True)
+        """
+        names = self._lattice_queries(locations)
+        candidates = self.get_location_info_many(
+            names, best_matching=False, validate=validate
+        )
+        return self._assign_lattice_candidates(
+            locations, ner_tags, dict(zip(names, candidates))
+        )
+
+    def _lattice_queries(self, locations: List[Dict[str, any]]) -> List[str]:
+        """
+        This function returns the distinct names of the locations whose
+        candidates have to be fetched, countries being left out.
+
+        :param locations:           list of dictionaries that represents a location
+                                    as produced by the get_location_info method
+        """
+        return list(
+            dict.fromkeys(
+                location["name"]
+                for location in locations
+                if isinstance(location, dict)
+                and location.get("name")
+                and location.get("country")
+                and location["name"] != location["country"]
+            )
+        )
+
+    def _assign_lattice_candidates(
+        self,
+        locations: List[Dict[str, any]],
+        ner_tags: List[Dict[str, any]],
+        candidates: Dict[str, List[Dict[str, any]]],
+    ) -> List[Dict[str, any]]:
+        """
+        This function picks the candidate of every location with the best
+        scoring country, the current location being its first candidate.
+        Locations without name or country are replaced by empty dictionaries.
+
+        :param locations:           list of dictionaries that represents a location
+                                    as produced by the get_location_info method
+        :param ner_tags:            list of ner tags associated to locations to
+                                    be filtered to countries
+        :param candidates:          dictionary mapping location names to the
+                                    results of their multi-result query
+        """
+        ner_countries, _ = self.filter_ner_countries(ner_tags)
+        location_candidates = []
+        for location in locations:
+            if not isinstance(location, dict) or not (
+                location.get("name") and location.get("country")
+            ):
+                location_candidates.append([])
+                continue
+            ranked = [location] + [
+                candidate
+                for candidate in candidates.get(location["name"], [])
+                if candidate != location
+            ]
+            location_candidates.append(ranked[: self.config["lattice_candidates"]])
+
+        lattice = CandidateLattice(
+            location_candidates,
+            [tag["name"] for tag in ner_countries],
+            self.map_country_neighbors,
+            self.config["lattice_weights"],
+        )
+        new_locations = []
+        for ranked, country in zip(location_candidates, lattice.assign()):
+            if country is None:
+                new_locations.append({})
+                continue
+            new_locations.append(
+                next(
+                    candidate
+                    for candidate in ranked
+                    if candidate["country"].lower() == country
+                )
+            )
+        return new_locations
+
+    def _double_check_countries_steps(
+        self,
+        locations: List[Dict[str, any]],
+        ner_tags: List[Dict[str, any]],
+        top_countries: int = None,
+    ) -> Generator:
+        """
+        This generator holds the logic of double_check_countries without
+        querying the geocoder itself: whenever some locations have to be
+        resolved it yields the list of (name, country) queries and expects
+        the list of their results to be sent back, in the same order.
+        This way the same logic is shared by the blocking and the asyncio
+        geocoders. The new list of locations is the value returned by the
+        generator.
+
+        :param locations:           list of dictionaries that represents a location
+                                    as produced by the get_location_info method
+        :param ner_tags:            list of ner tags associated to locations to
+                                    be filtered to countries
+        :param top_countries:       integer that put a maximum bound on the
+                                    number of countries to check as a reference
+        """
         # Get ner countries and init ner_countries_count list
         ner_countries, ner_local = self.filter_ner_countries(ner_tags)
         ner_countries_count = []
@@ -513,26 +2153,11 @@ class Geocoder:
             if tag["name"].lower()
             in ["england", "wales", "northern ireland", "scotland"]
         ]
-        # Normalise country name
-        if ner_countries:
-            ner_countries_norm = []
-            for tag in ner_countries:
-                tag_norm = self.get_location_info(
-                    tag["name"], country=tag["name"], best_matching=True
-                )
-                if tag_norm:
-                    ner_countries_norm.append(tag_norm[0])
-
-            # Create ner countries list
-            if ner_countries_norm:
-                for ner_country in ner_countries_norm:
-                    ner_countries_count.append(ner_country["country"])
 
         # create a default mapping and extract all the countries
         countries, only_countries, mapping_countries = self.extract_countries(locations)
         # extract the candidate reference countries
         majority = self.count_countries(countries, top_countries)
-        ner_majority = self.count_countries(ner_countries_count, top_countries)
 
         # If there's only one country in the majority
         if len(majority) <= 1 or majority[0][1] == 1:
@@ -545,6 +2170,9 @@ class Geocoder:
                 )
                 return []
 
+        # List of (name, country, candidate country) updates to the mapping
+        updates = []
+
         ## Edge case 1: If there are few locations and 1 is a country
         ## We assume that the few locations belong to that country,
         ## so that country is the new country location
@@ -554,9 +2182,7 @@ class Geocoder:
             )
             new_country = list(only_countries.keys())[0]
             for name, country in mapping_countries.items():
-                mapping_countries = self.update_mapping_countries(
-                    mapping_countries, name, country, new_country
-                )
+                updates.append((name, country, new_country))
 
         ## Edge case 2: If there are references to multiple countries including or not local locations
         ## We assume no majority can be reached and local locations will be included
@@ -565,7 +2191,7 @@ class Geocoder:
             logging.warning(
                 f"Location edge case 2 Detected: Found {len(only_countries)} references to countries, locations not matching one of those countries will be discarded"
             )
-        ## Edge case 5: UK/US/CA location issue when nothing else works
+        ## Edge case 5: UK/US/CA location issue when nothing else works
         elif ner_uk_nations != []:
             logging.warning(
                 "Location edge case 5 case detected: UK nations found in text, assigning local locations to UK if they exist in the UK"
@@ -575,14 +2201,23 @@ class Geocoder:
                 # the location is a country no need to check it
                 if name == country:
                     continue
-                mapping_countries = self.update_mapping_countries(
-                    mapping_countries, name, country, new_country
-                )
+                updates.append((name, country, new_country))
         ## Edge case 4: There's a tie between countries
         elif len(majority) > 1 and majority[0][1] == majority[1][1]:
             logging.info(
                 "Location edge case 4 case Detected: There's a tie between majority countries"
             )
+            # Normalise country name, only needed to break the tie
+            if ner_countries:
+                ner_countries_norm = yield [
+                    (tag["name"], tag["name"]) for tag in ner_countries
+                ]
+
+                # Create ner countries list
+                for tag_norm in ner_countries_norm:
+                    if tag_norm:
+                        ner_countries_count.append(tag_norm[0]["country"])
+            ner_majority = self.count_countries(ner_countries_count, top_countries)
             # If majority cannot be reached, then look at ner tags for majority countries
             if ner_majority:
                 if ner_majority[0][1] >= 1:
@@ -594,9 +2229,7 @@ class Geocoder:
                         for reference_country in ner_majority:
                             if reference_country[1] == 1 and len(ner_majority) > 1:
                                 break
-                            mapping_countries = self.update_mapping_countries(
-                                mapping_countries, name, country, reference_country[0]
-                            )
+                            updates.append((name, country, reference_country[0]))
             else:
                 logging.warning(
                     f"No country ner tags found. Majority couldn't be stablished. ner_majority: {ner_majority}"
@@ -614,25 +2247,27 @@ class Geocoder:
                 for reference_country in majority:
                     if reference_country[1] == 1:
                         break
-                    mapping_countries = self.update_mapping_countries(
-                        mapping_countries, name, country, reference_country[0]
-                    )
+                    updates.append((name, country, reference_country[0]))
+
+        mapping_countries = yield from self._update_mapping_countries_steps(
+            mapping_countries, updates
+        )
         # Update new locations
-        new_locations = self.update_country_for_locations(
+        new_locations = yield from self._update_country_for_locations_steps(
             locations, mapping_countries, only_countries
         )
 
         return new_locations
 
-    def update_country_for_locations(
+    def _update_country_for_locations_steps(
         self,
         locations: List[Dict[str, Any]],
         mapping_countries: Dict[str, int],
         only_countries: Dict,
-    ) -> List[Dict[str, Any]]:
+    ) -> Generator:
         """
-        This functions takes a list of locations and updates the country of each location
-        based on the mapping countries dictionary and the only_countries dictionary
+        This generator holds the logic of update_country_for_locations,
+        yielding the (name, country) queries it needs to be resolved.
 
         :params locations:          List of locations to be updated
         :params mapping_countries:  Dict containing mappings between local locations and countries
@@ -645,31 +2280,62 @@ class Geocoder:
                 f"Locations list empty. Returning empty location with mapping countries {mapping_countries}"
             )
             return []
-        new_locations = []
 
-        for location in locations:
+        # position in the list of queries of the locations to be updated
+        query_positions = {}
+        queries = []
+        for i, location in enumerate(locations):
             if not location or "name" not in location:
-                new_locations.append({})
                 continue
             if location["name"] not in mapping_countries:
-                new_locations.append({})
                 continue
             new_country = mapping_countries[location["name"]]
-            new_location = None
             # check that countries are different in order to update location
             if new_country != location["country"]:
                 logging.info(f'Changing {location["country"]} to {new_country}')
-                new_location = self.get_location_info(
-                    location["name"],
-                    country=new_country,
-                    best_matching=True,
-                )
+                query_positions[i] = len(queries)
+                queries.append((location["name"], new_country))
+        results = yield queries
+
+        new_locations = []
+        for i, location in enumerate(locations):
+            if not location or "name" not in location:
+                new_locations.append({})
+                continue
+            if location["name"] not in mapping_countries:
+                new_locations.append({})
+                continue
+            new_location = None
+            if i in query_positions:
+                new_location = results[query_positions[i]]
             # Check that new location exists and requirements are fullfilled
             new_locations.append(
                 self.check_new_location(new_location, location, only_countries)
             )
         return new_locations
 
+    def update_country_for_locations(
+        self,
+        locations: List[Dict[str, Any]],
+        mapping_countries: Dict[str, int],
+        only_countries: Dict,
+    ) -> List[Dict[str, Any]]:
+        """
+        This functions takes a list of locations and updates the country of each location
+        based on the mapping countries dictionary and the only_countries dictionary
+
+        :params locations:          List of locations to be updated
+        :params mapping_countries:  Dict containing mappings between local locations and countries
+        :params only_countries:     Dict containing only country locations
+
+        :return new_locations:      List of new locations after update has been completed
+        """
+        return self._run_location_queries(
+            self._update_country_for_locations_steps(
+                locations, mapping_countries, only_countries
+            )
+        )
+
     def check_new_location(
         self, new_location: Dict, location: Dict, only_countries: Dict
     ) -> Dict:
@@ -763,6 +2429,37 @@ class Geocoder:
 
         return calculate_distance(*params)
 
+    def get_distances(
+        self, coordinates_1: np.ndarray, coordinates_2: np.ndarray
+    ) -> np.ndarray:
+        """
+        This function is the batch version of get_distance: it returns the
+        distances (in meters) between the rows of two arrays of point
+        coordinates, shape (N, 2), or of bounding boxes, shape (N, 4).
+
+        :params coordinates_1:  array of coordinates or bounding boxes
+        :params coordinates_2:  array of coordinates or bounding boxes
+        """
+        if np.shape(coordinates_1)[-1] == 4:
+            return bounding_box_distances(coordinates_1, coordinates_2)
+        return pairwise_distances(coordinates_1, coordinates_2)
+
+    def get_distance_matrix(
+        self, coordinates_1: np.ndarray, coordinates_2: np.ndarray
+    ) -> np.ndarray:
+        """
+        This function returns the matrix of the distances (in meters) between
+        every row of the first array and every row of the second one, both
+        arrays of point coordinates, shape (N, 2), or of bounding boxes,
+        shape (N, 4).
+
+        :params coordinates_1:  array of coordinates or bounding boxes
+        :params coordinates_2:  array of coordinates or bounding boxes
+        """
+        if np.shape(coordinates_1)[-1] == 4:
+            return bounding_box_distance_matrix(coordinates_1, coordinates_2)
+        return distance_matrix(coordinates_1, coordinates_2)
+
     def bounding_box_to_point(self, *params):
         """
         This function is a wrapper of the calculate_distance
@@ -796,6 +2493,33 @@ class Geocoder:
 
         return edit_bounding_box(coordinates, distance - diagonal, add=True)
 
+    def enlarge_bounding_boxes(
+        self, bounding_boxes: np.ndarray, distance: float
+    ) -> np.ndarray:
+        """
+        This function is the batch version of enlarge_bounding_box, enlarging
+        the bounding boxes of an array of shape (N, 4) in a single pass.
+
+        :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+        :param distance:        a float giving the required distance between
+                                the corners of the bounding boxes
+        """
+
+        return enlarge_bounding_boxes(bounding_boxes, distance)
+
+    def sanitize_bounding_boxes(
+        self, bounding_boxes: np.ndarray
+    ) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        This function is the batch version of utils.gps_sanity_check, it
+        returns the sanitized bounding boxes alongside with the number of
+        boxes whose longitudes and latitudes were swapped.
+
+        :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+        """
+
+        return sanitize_bounding_boxes(bounding_boxes)
+
     def check_intersection(
         self, bounding_box_1: List[float], bounding_box_2: List[float]
     ) -> bool:
@@ -863,6 +2587,21 @@ class Geocoder:
 
         return gps_sanity_check([min_lon, min_lat, max_lon, max_lat])
 
+    def merge_bounding_boxes_by_group(
+        self, bounding_boxes: np.ndarray, groups: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function is the batch version of merge_bounding_boxes: the
+        bounding boxes sharing the same group label (e.g. the same country)
+        are merged, and the merged boxes are returned alongside with their
+        sorted group labels.
+
+        :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+        :param groups:          array of N group labels
+        """
+
+        return merge_bounding_boxes(bounding_boxes, groups)
+
     def check_large_bounding_box(
         self, bounding_box: List[float], threshold: float = 175
     ) -> List[float]:
@@ -893,3 +2632,17 @@ class Geocoder:
         ):
             return True
         return False
+
+    def check_large_bounding_boxes(
+        self, bounding_boxes: np.ndarray, threshold: float = 175
+    ) -> np.ndarray:
+        """
+        This function is the batch version of check_large_bounding_box,
+        returning a boolean array that flags the large bounding boxes.
+
+        :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+        :param threshold:       Float refering to the limit
+                                in which a bounding box is considered too large
+        """
+
+        return check_large_bounding_boxes(bounding_boxes, threshold)
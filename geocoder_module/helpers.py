@@ -2,9 +2,15 @@ import re
 import json
 import os
 import sys
+from typing import Any, Callable
 from logger.logging import logging
 import geocoder_module
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def check_location_can_be_processed(location: str) -> bool:
     """Checks if a location can be processed by the geocoder system by
@@ -18,6 +24,23 @@ def check_location_can_be_processed(location: str) -> bool:
     return True
 
 
+def get_json_decoder(name: str = None) -> Callable[[Any], Any]:
+    """
+    Returns the function used to decode json documents, orjson when
+    installed as it is several times faster than the standard library
+    :params name:           String with the decoder to use, "orjson" or "json",
+                            None picks the fastest one available"""
+    if name is None:
+        name = "orjson" if orjson is not None else "json"
+    if name == "orjson":
+        if orjson is None:
+            raise ImportError("The orjson json decoder is not installed")
+        return orjson.loads
+    if name == "json":
+        return json.loads
+    raise ValueError(f"Unknown json decoder {name}")
+
+
 def load_json_file(file_name: str):
     """
     Loads json file in geocoder module folder
@@ -29,8 +52,8 @@ def load_json_file(file_name: str):
             "geocoder_module",
             file_name,
         )
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(file_path, "rb") as f:
+            data = get_json_decoder()(f.read())
             return data
     except Exception as error:
         logging.error(
@@ -0,0 +1,274 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from geocoder_module.gazetteer import Gazetteer
+from geocoder_module.utils import EARTH_RADIUS
+
+
+def to_unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    This function converts gps coordinates to points on the unit sphere:
+    the euclidean (chord) distance between two of these points grows with
+    the great circle distance, so nearest neighbours found in this space
+    are the haversine nearest neighbours.
+
+    :param latitudes:   array of latitudes in degrees
+    :param longitudes:  array of longitudes in degrees
+    """
+    latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_latitudes = np.cos(latitudes)
+    return np.stack(
+        [
+            cos_latitudes * np.cos(longitudes),
+            cos_latitudes * np.sin(longitudes),
+            np.sin(latitudes),
+        ],
+        axis=-1,
+    )
+
+
+def chord_to_meters(chords: np.ndarray) -> np.ndarray:
+    """
+    This function converts chord distances on the unit sphere
+    to great circle distances in meters.
+
+    :param chords:      array of chord distances
+    """
+    return 2 * EARTH_RADIUS * np.arcsin(np.clip(chords / 2, 0, 1))
+
+
+class ReverseGeocoder:
+    def __init__(
+        self,
+        gazetteer: Gazetteer,
+        min_population: int = 0,
+        leaf_size: int = 32,
+        chunk_size: int = 65536,
+    ) -> None:
+        """
+        This class reverse geocodes coordinates offline, returning the nearest
+        place of a gazetteer from a KD-tree built over the positions of the
+        places on the unit sphere, so that the nearest place is the haversine
+        nearest one. Queries are answered in vectorized batches: all the
+        queries of a batch descend the tree together to the leaf containing
+        them, bounding their distance to the nearest place, then only the
+        nodes whose bounding box is within that bound are visited.
+
+        :param gazetteer:       Gazetteer whose places are searched
+        :param min_population:  int, places with a smaller population are not
+                                returned, e.g. to return only cities (default 0)
+        :param leaf_size:       int, maximum number of places of a leaf (default 32)
+        :param chunk_size:      int, number of queries processed at once, it
+                                bounds the memory used by batches (default 65536)
+        """
+        self.gazetteer = gazetteer
+        self.chunk_size = chunk_size
+
+        coordinates = np.array(gazetteer.coordinates, dtype=np.float64)
+        population = np.array(gazetteer.population, dtype=np.uint64)
+        self.places = np.nonzero(population >= min_population)[0]
+        if not len(self.places):
+            return
+        self._build(
+            to_unit_vectors(
+                coordinates[1::2][self.places], coordinates[0::2][self.places]
+            ),
+            leaf_size,
+        )
+
+    def _build(self, points: np.ndarray, leaf_size: int) -> None:
+        """
+        This function builds the KD-tree, cutting every node at the median of
+        its widest axis. Nodes are stored in flat arrays: the bounding box of
+        their points, their children and, for leaves, the index of the leaf.
+        Leaves are padded to the same size with points far from the sphere.
+        """
+        node_min, node_max, children, node_leaf, leaves = [], [], [], [], []
+        split_axis, split_value = [], []
+        stack = [(np.arange(len(points)), -1, 0)]
+        while stack:
+            indexes, parent, side = stack.pop()
+            node = len(node_leaf)
+            if parent >= 0:
+                children[parent][side] = node
+            node_points = points[indexes]
+            node_min.append(node_points.min(axis=0))
+            node_max.append(node_points.max(axis=0))
+            children.append([-1, -1])
+            if len(indexes) <= leaf_size:
+                node_leaf.append(len(leaves))
+                leaves.append(indexes)
+                split_axis.append(0)
+                split_value.append(0.0)
+                continue
+            node_leaf.append(-1)
+            axis = np.argmax(node_max[-1] - node_min[-1])
+            half = len(indexes) // 2
+            order = np.argpartition(node_points[:, axis], half)
+            split_axis.append(axis)
+            split_value.append(node_points[order[half], axis])
+            stack.append((indexes[order[:half]], node, 0))
+            stack.append((indexes[order[half:]], node, 1))
+
+        self.node_min = np.array(node_min).reshape(-1, 3)
+        self.node_max = np.array(node_max).reshape(-1, 3)
+        self.children = np.array(children, dtype=np.int64).reshape(-1, 2)
+        self.node_leaf = np.array(node_leaf, dtype=np.int64)
+        self.split_axis = np.array(split_axis, dtype=np.int64)
+        self.split_value = np.array(split_value)
+        self.leaf_points = np.full((len(leaves), leaf_size, 3), 1e3)
+        self.leaf_places = np.full((len(leaves), leaf_size), -1, dtype=np.int64)
+        for leaf, indexes in enumerate(leaves):
+            self.leaf_points[leaf, : len(indexes)] = points[indexes]
+            self.leaf_places[leaf, : len(indexes)] = self.places[indexes]
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def _box_distances(self, queries: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """
+        This function returns the squared distance from every query
+        to the bounding box of the corresponding node.
+        """
+        gaps = np.maximum(
+            np.maximum(self.node_min[nodes] - queries, queries - self.node_max[nodes]),
+            0,
+        )
+        return np.einsum("ij,ij->i", gaps, gaps)
+
+    def _search_leaves(
+        self,
+        queries: np.ndarray,
+        query_ids: np.ndarray,
+        leaves: np.ndarray,
+        best_places: np.ndarray,
+        best_distances: np.ndarray,
+    ) -> None:
+        """
+        This function searches the places of the leaves passed in input,
+        updating the nearest place found so far for the corresponding queries
+        and its squared distance.
+        """
+        differences = self.leaf_points[leaves] - queries[query_ids, None, :]
+        distances = np.einsum("ijk,ijk->ij", differences, differences)
+        best = distances.argmin(axis=1)
+        distances = distances[np.arange(len(best)), best]
+        places = self.leaf_places[leaves, best]
+        # a query can reach several leaves: keep its closest place
+        np.minimum.at(best_distances, query_ids, distances)
+        closest = distances == best_distances[query_ids]
+        best_places[query_ids[closest]] = places[closest]
+
+    def _nearest_chunk(self, queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function returns the nearest place of every query of a chunk,
+        alongside with its squared chord distance.
+        """
+        query_ids = np.arange(len(queries))
+        best_places = np.full(len(queries), -1, dtype=np.int64)
+        best_distances = np.full(len(queries), np.inf)
+
+        # every query descends to the leaf containing it, bounding its distance
+        nodes = np.zeros(len(queries), dtype=np.int64)
+        descending = np.nonzero(self.node_leaf[nodes] < 0)[0]
+        while len(descending):
+            inner_nodes = nodes[descending]
+            go_right = (
+                queries[descending, self.split_axis[inner_nodes]]
+                >= self.split_value[inner_nodes]
+            )
+            nodes[descending] = self.children[inner_nodes, go_right.astype(np.int64)]
+            descending = descending[self.node_leaf[nodes[descending]] < 0]
+        first_leaves = self.node_leaf[nodes]
+        self._search_leaves(
+            queries, query_ids, first_leaves, best_places, best_distances
+        )
+
+        # then the nodes closer than the bound are visited, level by level
+        nodes = np.zeros(len(queries), dtype=np.int64)
+        while len(query_ids):
+            leaves = self.node_leaf[nodes]
+            is_leaf = (leaves >= 0) & (leaves != first_leaves[query_ids])
+            if is_leaf.any():
+                self._search_leaves(
+                    queries,
+                    query_ids[is_leaf],
+                    leaves[is_leaf],
+                    best_places,
+                    best_distances,
+                )
+            internal = leaves < 0
+            query_ids = np.tile(query_ids[internal], 2)
+            nodes = self.children[nodes[internal]].T.ravel()
+            visit = self._box_distances(queries[query_ids], nodes) < (
+                best_distances[query_ids]
+            )
+            query_ids, nodes = query_ids[visit], nodes[visit]
+
+        return best_places, best_distances
+
+    def nearest(
+        self, latitudes: np.ndarray, longitudes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function returns, for every pair of coordinates passed in input,
+        the index of the nearest place in the gazetteer and its distance
+        in meters, as two arrays. Indexes are -1 if the gazetteer is empty.
+
+        :param latitudes:   array of latitudes in degrees
+        :param longitudes:  array of longitudes in degrees
+        """
+        queries = to_unit_vectors(latitudes, longitudes).reshape(-1, 3)
+        places = np.full(len(queries), -1, dtype=np.int64)
+        distances = np.full(len(queries), np.inf)
+        if not len(self.places):
+            return places, distances
+
+        for start in range(0, len(queries), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            places[chunk], chords = self._nearest_chunk(queries[chunk])
+            distances[chunk] = chord_to_meters(np.sqrt(chords))
+        return places, distances
+
+    def _location(self, place: int, distance: float) -> Dict[str, Any]:
+        gazetteer = self.gazetteer
+        return {
+            "city": gazetteer.names[place],
+            "country": gazetteer.countries[gazetteer.country_ids[place]],
+            "coordinates": list(gazetteer.coordinates[2 * place : 2 * place + 2]),
+            "bounding_box": list(gazetteer.bounding_boxes[4 * place : 4 * place + 4]),
+            "distance": float(distance),
+        }
+
+    def lookup_many(
+        self, latitudes: np.ndarray, longitudes: np.ndarray, radius: float = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        This function reverse geocodes a batch of coordinates, returning for
+        every pair the nearest place formatted as the results of
+        Geocoder.get_location_from_coordinates, with its distance in meters
+        (field "distance"), or an empty dictionary if no place is within
+        the radius.
+
+        :param latitudes:   array of latitudes in degrees
+        :param longitudes:  array of longitudes in degrees
+        :param radius:      float, maximum distance in kilometers (default 50)
+        """
+        places, distances = self.nearest(latitudes, longitudes)
+        return [
+            self._location(place, distance) if distance <= radius * 1000 else {}
+            for place, distance in zip(places.tolist(), distances.tolist())
+        ]
+
+    def lookup(self, lat: float, lon: float, radius: float = 50) -> Dict[str, Any]:
+        """
+        This function reverse geocodes a single pair of coordinates
+        (see lookup_many).
+
+        :param lat:         float representing the latitude coordinates
+        :param lon:         float representing the longitude coordinates
+        :param radius:      float, maximum distance in kilometers (default 50)
+        """
+        return self.lookup_many([float(lat)], [float(lon)], radius)[0]
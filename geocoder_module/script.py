@@ -67,12 +67,22 @@ if __name__ == "__main__":
         dest="strict",
     )
 
+    parser.add_argument(
+        "-p",
+        "--cache",
+        type=str,
+        help="""SQLite file where to persist the responses of the geocoder between runs""",
+        required=False,
+        default=None,
+        dest="cache_path",
+    )
+
     args = parser.parse_args()
     logging.info(args)
 
     # create geocoder
 #    geocoder = Geocoder(args.config_path)
-    geocoder = Geocoder()
+    geocoder = Geocoder(config={"persistent_cache_path": args.cache_path})
 
     # read data
     if os.path.isdir(args.data_path):
@@ -87,8 +97,18 @@ if __name__ == "__main__":
 
     data_with_coordinates = []
 
-    # this map will store found location avoiding a new call for already seen locations
-    location_map = {}
+    # every distinct location is queried only once, and all of them concurrently
+    event_locations = list(
+        {
+            event["location"]: None
+            for d in data
+            if "events" in d.keys()
+            for event in d["events"]
+        }
+    )
+    location_map = dict(
+        zip(event_locations, geocoder.get_location_info_many(event_locations))
+    )
 
     for d in data:
         if not "events" in d.keys():
@@ -96,14 +116,8 @@ if __name__ == "__main__":
         if d["events"] == []:
             continue
         for event in d["events"]:
-            if event["location"] in location_map.keys():
-                coordinates = location_map[event["location"]]
-            else:
-                # location not seen before call the geocoder
-                coordinates = geocoder.get_location_info(event["location"])
-                location_map[event["location"]] = coordinates
             # store the coordinates in the new field of the event item
-            event["coordinates"] = coordinates
+            event["coordinates"] = location_map[event["location"]]
 
         if args.strict:
             # here we remove events where no coordinates were found for its location
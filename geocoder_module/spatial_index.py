@@ -0,0 +1,275 @@
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+from geocoder_module.distances import _as_array, haversine
+
+
+def split_antimeridian(
+    bounding_boxes: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    This function converts bounding boxes (min lon, max lat, max lon, min lat)
+    to boxes (min lon, min lat, max lon, max lat) that do not cross the
+    antimeridian: a box whose min longitude is greater than its max one, such
+    as the box of Fiji, is split in its eastern and western parts. The boxes
+    are returned as two arrays of min and max corners, alongside with the
+    index of the input box of every part.
+
+    :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+    """
+    bounding_boxes = _as_array(bounding_boxes, 4)
+    min_lat = np.minimum(bounding_boxes[:, 1], bounding_boxes[:, 3])
+    max_lat = np.maximum(bounding_boxes[:, 1], bounding_boxes[:, 3])
+    mins = np.stack([bounding_boxes[:, 0], min_lat], axis=1)
+    maxs = np.stack([bounding_boxes[:, 2], max_lat], axis=1)
+    boxes = np.arange(len(bounding_boxes))
+
+    crossing = np.nonzero(mins[:, 0] > maxs[:, 0])[0]
+    if len(crossing):
+        east_mins, east_maxs = mins[crossing], maxs[crossing].copy()
+        east_maxs[:, 0] = 180.0
+        mins[crossing, 0] = -180.0
+        mins = np.concatenate([mins, east_mins])
+        maxs = np.concatenate([maxs, east_maxs])
+        boxes = np.concatenate([boxes, crossing])
+    return mins, maxs, boxes
+
+
+class BoundingBoxIndex:
+    def __init__(
+        self,
+        bounding_boxes: np.ndarray,
+        node_capacity: int = 8,
+        chunk_size: int = 65536,
+    ) -> None:
+        """
+        This class is a static R-tree over a list of bounding boxes (min lon,
+        max lat, max lon, min lat), packed with the Sort-Tile-Recursive
+        algorithm when built, that returns the boxes intersecting the query
+        boxes. Boxes crossing the antimeridian (min longitude greater than the
+        max one), both indexed and queried, are split in two parts. Queries
+        are answered in vectorized batches: all the queries of a batch descend
+        the tree together, level by level, visiting only the nodes that
+        intersect them.
+
+        :param bounding_boxes:  array of shape (N, 4) of bounding boxes
+        :param node_capacity:   int, maximum number of children of a node
+                                (default 8)
+        :param chunk_size:      int, number of queries processed at once, it
+                                bounds the memory used by batches (default 65536)
+        """
+        self.node_capacity = node_capacity
+        self.chunk_size = chunk_size
+        self.size = len(_as_array(bounding_boxes, 4))
+
+        mins, maxs, boxes = split_antimeridian(bounding_boxes)
+        order = self._pack(mins, maxs)
+        self.item_mins, self.item_maxs = mins[order], maxs[order]
+        self.item_boxes = boxes[order]
+
+        # levels from the root to the leaves, every node covers a contiguous
+        # range of entries of the level below
+        self.levels = []
+        level_mins, level_maxs = self.item_mins, self.item_maxs
+        while len(level_mins) > 1 or (len(level_mins) and not self.levels):
+            starts = np.arange(0, len(level_mins), node_capacity)
+            ends = np.minimum(starts + node_capacity, len(level_mins))
+            level_mins = np.minimum.reduceat(level_mins, starts, axis=0)
+            level_maxs = np.maximum.reduceat(level_maxs, starts, axis=0)
+            # nodes are packed as well, keeping the ranges of their children
+            order = self._pack(level_mins, level_maxs)
+            level_mins, level_maxs = level_mins[order], level_maxs[order]
+            self.levels.insert(0, (level_mins, level_maxs, starts[order], ends[order]))
+
+    def _pack(self, mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+        """
+        This function returns the Sort-Tile-Recursive order of the boxes:
+        sorted by the longitude of their center in vertical slices, then
+        sorted by the latitude of their center within every slice.
+        """
+        centers = (mins + maxs) / 2
+        leaves = math.ceil(len(centers) / self.node_capacity)
+        slice_size = self.node_capacity * max(math.ceil(math.sqrt(leaves)), 1)
+        order = np.argsort(centers[:, 0], kind="stable")
+        slices = np.arange(len(order)) // slice_size
+        return order[np.lexsort((centers[order, 1], slices))]
+
+    def __len__(self) -> int:
+        return self.size
+
+    @staticmethod
+    def _intersect(
+        mins: np.ndarray,
+        maxs: np.ndarray,
+        query_mins: np.ndarray,
+        query_maxs: np.ndarray,
+    ) -> np.ndarray:
+        return ((mins <= query_maxs) & (query_mins <= maxs)).all(axis=1)
+
+    def _query_chunk(
+        self, query_mins: np.ndarray, query_maxs: np.ndarray, query_ids: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function returns the pairs of (query, indexed part) intersecting,
+        for a chunk of queries not crossing the antimeridian.
+        """
+        nodes = np.zeros(len(query_ids), dtype=np.int64)
+        queries = np.arange(len(query_ids))
+        for node_mins, node_maxs, starts, ends in self.levels:
+            hit = self._intersect(
+                node_mins[nodes],
+                node_maxs[nodes],
+                query_mins[queries],
+                query_maxs[queries],
+            )
+            queries, nodes = queries[hit], nodes[hit]
+            # every query moves to the children of the nodes it intersects
+            counts = ends[nodes] - starts[nodes]
+            offsets = np.arange(counts.sum()) - np.repeat(
+                np.cumsum(counts) - counts, counts
+            )
+            queries = np.repeat(queries, counts)
+            nodes = np.repeat(starts[nodes], counts) + offsets
+        hit = self._intersect(
+            self.item_mins[nodes],
+            self.item_maxs[nodes],
+            query_mins[queries],
+            query_maxs[queries],
+        )
+        return query_ids[queries[hit]], self.item_boxes[nodes[hit]]
+
+    def intersect_many(
+        self, bounding_boxes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function returns the pairs of query boxes and indexed boxes that
+        intersect, as two arrays of indexes sorted by query box, then by
+        indexed box.
+
+        :param bounding_boxes:  array of shape (N, 4) of query bounding boxes
+        """
+        query_mins, query_maxs, query_ids = split_antimeridian(bounding_boxes)
+        if not len(self.item_boxes) or not len(query_ids):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        pairs = []
+        for start in range(0, len(query_ids), self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            pairs.append(
+                self._query_chunk(
+                    query_mins[chunk], query_maxs[chunk], query_ids[chunk]
+                )
+            )
+        queries = np.concatenate([chunk_queries for chunk_queries, _ in pairs])
+        boxes = np.concatenate([chunk_boxes for _, chunk_boxes in pairs])
+        # both parts of a box crossing the antimeridian can be found
+        keys = np.unique(queries * self.size + boxes)
+        return keys // self.size, keys % self.size
+
+    def query_many(self, bounding_boxes: np.ndarray) -> List[List[int]]:
+        """
+        This function returns, for every query box, the sorted list of the
+        indexes of the indexed boxes it intersects.
+
+        :param bounding_boxes:  array of shape (N, 4) of query bounding boxes
+        """
+        n_queries = len(_as_array(bounding_boxes, 4))
+        queries, boxes = self.intersect_many(bounding_boxes)
+        bounds = np.searchsorted(queries, np.arange(n_queries + 1))
+        boxes = boxes.tolist()
+        return [boxes[bounds[query] : bounds[query + 1]] for query in range(n_queries)]
+
+    def _gap_distances(
+        self, query_mins: np.ndarray, query_maxs: np.ndarray
+    ) -> np.ndarray:
+        """
+        This function returns the matrix of the distances (in meters) between
+        the query boxes and the indexed parts, measured between their closest
+        sides, 0 for boxes that intersect.
+        """
+        q_min, q_max = query_mins[:, None, :], query_maxs[:, None, :]
+        i_min, i_max = self.item_mins[None, :, :], self.item_maxs[None, :, :]
+        overlap = (i_min <= q_max) & (q_min <= i_max)
+
+        # closest latitudes: a common one when the boxes overlap, the one
+        # farthest from the equator as parallels are shorter there
+        low, high = np.maximum(q_min[..., 1], i_min[..., 1]), np.minimum(
+            q_max[..., 1], i_max[..., 1]
+        )
+        common = np.where(np.abs(low) > np.abs(high), low, high)
+        below = q_max[..., 1] < i_min[..., 1]
+        lat_a = np.where(
+            overlap[..., 1], common, np.where(below, q_max[..., 1], q_min[..., 1])
+        )
+        lat_b = np.where(
+            overlap[..., 1], common, np.where(below, i_min[..., 1], i_max[..., 1])
+        )
+
+        # closest longitudes: the gap is 0 when the boxes overlap, otherwise
+        # the shortest gap on the east or on the west, as the shortest way
+        # can cross the antimeridian
+        gaps = np.minimum(
+            (i_min[..., 0] - q_max[..., 0]) % 360, (q_min[..., 0] - i_max[..., 0]) % 360
+        )
+        gaps = np.where(overlap[..., 0], 0.0, gaps)
+        return haversine(lat_a, 0.0, lat_b, gaps)
+
+    def nearest_many(
+        self, bounding_boxes: np.ndarray, k: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function returns, for every query box (points are boxes with
+        equal corners), the indexes of the k nearest indexed boxes and their
+        distances in meters, as two arrays of shape (N, k) sorted by distance.
+        Distances are measured between the closest sides of the boxes, 0 for
+        boxes that intersect.
+
+        :param bounding_boxes:  array of shape (N, 4) of query bounding boxes
+        :param k:               int, number of nearest boxes (default 1)
+        """
+        query_mins, query_maxs, query_ids = split_antimeridian(bounding_boxes)
+        n_queries = len(_as_array(bounding_boxes, 4))
+        k = min(k, self.size)
+        indexes = np.empty((n_queries, k), dtype=np.int64)
+        distances = np.empty((n_queries, k))
+        if not n_queries or not k:
+            return indexes, distances
+
+        # parts sorted by indexed box and by query, reduced to whole boxes
+        item_order = np.argsort(self.item_boxes, kind="stable")
+        item_starts = np.searchsorted(self.item_boxes[item_order], np.arange(self.size))
+        query_order = np.argsort(query_ids, kind="stable")
+        query_mins, query_maxs = query_mins[query_order], query_maxs[query_order]
+        query_ids = query_ids[query_order]
+
+        chunk_size = max(1, self.chunk_size // 256)
+        for start in range(0, n_queries, chunk_size):
+            end = min(start + chunk_size, n_queries)
+            parts = slice(*np.searchsorted(query_ids, [start, end]))
+            matrix = self._gap_distances(query_mins[parts], query_maxs[parts])
+            matrix = np.minimum.reduceat(matrix[:, item_order], item_starts, axis=1)
+            query_starts = np.searchsorted(query_ids[parts], np.arange(start, end))
+            matrix = np.minimum.reduceat(matrix, query_starts, axis=0)
+
+            if k < self.size:
+                nearest = np.argpartition(matrix, k - 1, axis=1)[:, :k]
+            else:
+                nearest = np.broadcast_to(np.arange(k), matrix.shape)
+            nearest_distances = np.take_along_axis(matrix, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1, kind="stable")
+            indexes[start:end] = np.take_along_axis(nearest, order, axis=1)
+            distances[start:end] = np.take_along_axis(nearest_distances, order, axis=1)
+        return indexes, distances
+
+    def query(self, bounding_box: List[float]) -> List[int]:
+        """
+        This function returns the sorted list of the indexes of the indexed
+        boxes intersecting a single bounding box (see query_many).
+
+        :param bounding_box:    list of four floats (min lon, max lat,
+                                max lon, min lat)
+        """
+        return self.query_many([bounding_box])[0]
@@ -0,0 +1,492 @@
+import os
+import json
+import time
+import random
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Environment variables holding the base url of every upstream service
+UPSTREAM_SERVERS = {
+    "photon": "PHOTON_SERVER",
+    "geonames": "GEONAMES_SERVER",
+}
+# Status codes returned by an overloaded or temporarily unavailable upstream
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+
+def endpoint_urls(upstream: str, urls: List[str] = None) -> List[str]:
+    """
+    This function returns the base urls of the replicas of an upstream
+    service: the ones passed in input if any, otherwise the comma separated
+    list held by the environment variable of the upstream.
+
+    :param upstream:    string, name of the upstream service
+    :param urls:        list of base urls overriding the environment
+                        variable (default None)
+    """
+    if not urls:
+        urls = os.environ[UPSTREAM_SERVERS[upstream]].split(",")
+    return [url.strip() for url in urls if url.strip()]
+
+
+class JSONResponse(requests.Response):
+    """
+    Response whose json method decodes the body with the json
+    decoder of the adapter that received it.
+    """
+
+    loads = staticmethod(json.loads)
+
+    def json(self, **kwargs) -> Any:
+        return self.loads(self.content)
+
+
+class JSONAdapter(HTTPAdapter):
+    def __init__(self, loads: Callable[[Any], Any] = json.loads, **kwargs) -> None:
+        """
+        This class is a transport adapter whose responses decode their json
+        body with the decoder passed in input instead of the standard library.
+
+        :param loads:       function decoding a json document (default json.loads)
+        """
+        self.loads = loads
+        super().__init__(**kwargs)
+
+    def build_response(self, req, resp) -> JSONResponse:
+        response = super().build_response(req, resp)
+        response.__class__ = JSONResponse
+        response.loads = self.loads
+        return response
+
+
+def create_session(
+    pool_size: int = 10,
+    pool_block: bool = False,
+    loads: Callable[[Any], Any] = json.loads,
+) -> requests.Session:
+    """
+    This function creates a requests session backed by a pool of keep-alive
+    connections, so that consecutive queries to the same upstream reuse
+    the same TCP connection instead of opening a new one every time.
+    Responses are requested gzip compressed (the requests default) and
+    their json body is decoded with the decoder passed in input.
+
+    :param pool_size:   int, maximum number of connections kept open
+                        towards a single host (default 10)
+    :param pool_block:  bool, if True the calling thread waits for a free
+                        connection when the pool is exhausted, otherwise
+                        a new throwaway connection is opened (default False)
+    :param loads:       function decoding a json document (default json.loads)
+    """
+    session = requests.Session()
+    adapter = JSONAdapter(loads=loads, pool_maxsize=pool_size, pool_block=pool_block)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a query is refused because the circuit breaker
+    of its upstream service is open.
+    """
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, failure_threshold: int = 5, recovery_timeout: float = 30
+    ) -> None:
+        """
+        This class keeps track of the health of an upstream service.
+        After failure_threshold consecutive failures the breaker opens and
+        queries are refused straight away; once recovery_timeout seconds have
+        passed it becomes half open and lets a single trial query through,
+        closing again if it succeeds or opening again if it fails.
+
+        :param failure_threshold:   int, number of consecutive failures that
+                                    opens the breaker (default 5)
+        :param recovery_timeout:    float, number of seconds the breaker stays
+                                    open before a trial query (default 30)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _current_state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = self.HALF_OPEN
+        return self._state
+
+    @property
+    def state(self) -> str:
+        """
+        The state of the breaker, one of "closed", "open" and "half_open".
+        """
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self) -> bool:
+        """
+        This function returns True if a query can be sent to the upstream,
+        every allowed query has to be followed by record_success or
+        record_failure.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """
+        This function records that the upstream answered a query.
+        """
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """
+        This function records that a query to the upstream failed,
+        opening the breaker if needed.
+        """
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+def backoff_delay(attempt: int, base: float = 0.5, maximum: float = 8) -> float:
+    """
+    This function returns how many seconds to wait before retrying a query,
+    following an exponential backoff with full jitter.
+
+    :param attempt:     int, number of the failed attempt, starting from 0
+    :param base:        float, delay of the first retry in seconds (default 0.5)
+    :param maximum:     float, maximum delay in seconds (default 8)
+    """
+    return random.uniform(0, min(maximum, base * 2**attempt))
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    This function checks if a failed query can be retried, that is if it
+    failed because of a connection error, a timeout, or a status code
+    signalling that the upstream is temporarily unavailable.
+
+    :param error:       exception raised by the query
+    """
+    if isinstance(error, requests.HTTPError):
+        return (
+            error.response is not None
+            and error.response.status_code in RETRYABLE_STATUS_CODES
+        )
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def is_upstream_failure(error: Exception) -> bool:
+    """
+    This function checks if a failed query has to be counted against the
+    health of the upstream (circuit breaker and replica), that is if it can
+    be retried or if the upstream answered with a server error, even one
+    that is not worth retrying such as 500.
+
+    :param error:       exception raised by the query
+    """
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500 or is_retryable(error)
+    return is_retryable(error)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 10) -> None:
+        """
+        This class is a token bucket rate limiter: tokens are added at a
+        constant rate up to burst tokens, and every query consumes one.
+        Queries that find the bucket empty reserve a future token and have
+        to wait for it, so the long term rate never exceeds the given one.
+
+        :param rate:        float, number of queries allowed per second
+        :param burst:       int, maximum number of queries that can be sent
+                            at once after an idle period (default 10)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        This function consumes a token and returns how many seconds
+        the caller has to wait before sending its query.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+# Rate limiters shared by every geocoder of the process
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(upstream: str, rate: float, burst: int = 10) -> TokenBucket:
+    """
+    This function returns the token bucket limiting the queries to an
+    upstream service, shared by all the geocoders of the process created
+    with the same rate and burst.
+
+    :param upstream:    string, name of the upstream service
+    :param rate:        float, number of queries allowed per second
+    :param burst:       int, maximum number of queries sent at once (default 10)
+    """
+    with _rate_limiters_lock:
+        key = (upstream, rate, burst)
+        if key not in _rate_limiters:
+            _rate_limiters[key] = TokenBucket(rate, burst)
+        return _rate_limiters[key]
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(
+        self,
+        maximum: int = 64,
+        latency_target: float = 1.0,
+        minimum: int = 1,
+        backoff: float = 0.5,
+    ) -> None:
+        """
+        This class bounds the number of queries in flight towards an upstream
+        with a limit adapted to how the upstream is coping (AIMD): every fast
+        successful query raises the limit by about one query per round trip,
+        while failures and queries slower than latency_target cut it by the
+        backoff factor, at most once per latency_target seconds.
+
+        :param maximum:         int, maximum number of queries in flight (default 64)
+        :param latency_target:  float, latency in seconds above which the
+                                upstream is considered overloaded (default 1.0)
+        :param minimum:         int, minimum number of queries in flight (default 1)
+        :param backoff:         float, factor applied to the limit when the
+                                upstream is overloaded (default 0.5)
+        """
+        self.maximum = maximum
+        self.minimum = minimum
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.limit = float(min(8, maximum))
+        self.in_flight = 0
+        self._decreased_at = 0.0
+        self._condition = threading.Condition()
+
+    def _update(self, latency: float, failed: bool) -> None:
+        """
+        This function updates the limit after a query completed,
+        the caller has to hold the lock of the limiter.
+        """
+        if failed or latency > self.latency_target:
+            now = time.monotonic()
+            if now - self._decreased_at >= self.latency_target:
+                self.limit = max(self.minimum, self.limit * self.backoff)
+                self._decreased_at = now
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def acquire(self) -> None:
+        """
+        This function waits until a new query can be sent.
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency: float, failed: bool) -> None:
+        """
+        This function records the outcome of a query, adapting the limit.
+
+        :param latency:     float, seconds the query took
+        :param failed:      bool, True if the upstream failed to answer
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self._update(latency, failed)
+            self._condition.notify_all()
+
+
+class Endpoint:
+    def __init__(self, url: str) -> None:
+        """
+        This class holds the state of a single replica of an upstream service.
+
+        :param url:         string, base url of the replica
+        """
+        self.url = url
+        self.outstanding = 0
+        self.failures = 0
+        self.healthy = True
+        self.down_at = 0.0
+
+
+class EndpointPool:
+    def __init__(
+        self,
+        urls: List[str],
+        failure_threshold: int = 3,
+        recovery_timeout: float = 10,
+        window: int = 1000,
+    ) -> None:
+        """
+        This class spreads the queries to an upstream service among its
+        replicas, sending every query to the healthy replica with the least
+        outstanding queries. A replica is marked as down after
+        failure_threshold consecutive failures and gets queries again once
+        recovery_timeout seconds have passed, or as soon as it passes
+        a health check. The latencies of the last window queries are kept
+        to compute the delay of hedged queries.
+
+        :param urls:                list of base urls of the replicas
+        :param failure_threshold:   int, number of consecutive failures after
+                                    which a replica is marked as down (default 3)
+        :param recovery_timeout:    float, number of seconds a replica stays
+                                    down before being queried again (default 10)
+        :param window:              int, number of latencies kept (default 1000)
+        """
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.latencies = deque(maxlen=window)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def _available(self, endpoint: Endpoint) -> bool:
+        return (
+            endpoint.healthy
+            or time.monotonic() - endpoint.down_at >= self.recovery_timeout
+        )
+
+    def acquire(self, exclude: Endpoint = None) -> Union[Endpoint, None]:
+        """
+        This function returns the replica the next query has to be sent to,
+        that has to be handed back with release once the query completed.
+        Replicas that are down are used only when all of them are down.
+
+        :param exclude:     replica that must not be returned, e.g. the one
+                            already serving the query to hedge (default None)
+        """
+        with self._lock:
+            candidates = [
+                endpoint for endpoint in self.endpoints if endpoint is not exclude
+            ]
+            if not candidates:
+                return None
+            available = [
+                endpoint for endpoint in candidates if self._available(endpoint)
+            ]
+            # ties are broken in a round robin fashion
+            n_endpoints = len(self.endpoints)
+            endpoint = min(
+                available or candidates,
+                key=lambda endpoint: (
+                    endpoint.outstanding,
+                    (self.endpoints.index(endpoint) - self._next) % n_endpoints,
+                ),
+            )
+            self._next = (self.endpoints.index(endpoint) + 1) % n_endpoints
+            endpoint.outstanding += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, latency: float, failed: bool) -> None:
+        """
+        This function records the outcome of a query sent to a replica.
+
+        :param endpoint:    replica returned by acquire
+        :param latency:     float, seconds the query took
+        :param failed:      bool, True if the replica failed to answer
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if failed:
+                endpoint.failures += 1
+                if endpoint.failures >= self.failure_threshold:
+                    endpoint.healthy = False
+                    endpoint.down_at = time.monotonic()
+            else:
+                endpoint.failures = 0
+                endpoint.healthy = True
+                self.latencies.append(latency)
+
+    def mark(self, endpoint: Endpoint, healthy: bool) -> None:
+        """
+        This function records the outcome of a health check of a replica.
+
+        :param endpoint:    replica that was checked
+        :param healthy:     bool, True if the replica is up
+        """
+        with self._lock:
+            endpoint.healthy = healthy
+            endpoint.failures = 0 if healthy else self.failure_threshold
+            if not healthy:
+                endpoint.down_at = time.monotonic()
+
+    def latency_percentile(
+        self, percentile: float, min_samples: int = 20
+    ) -> Union[float, None]:
+        """
+        This function returns the given percentile of the latencies of the
+        last successful queries, or None if not enough queries completed.
+
+        :param percentile:      float between 0 and 100
+        :param min_samples:     int, minimum number of latencies needed (default 20)
+        """
+        with self._lock:
+            latencies = sorted(self.latencies)
+        if len(latencies) < min_samples:
+            return None
+        index = min(len(latencies) - 1, int(len(latencies) * percentile / 100))
+        return latencies[index]
+
+    def states(self) -> Dict[str, Dict[str, Union[bool, int]]]:
+        """
+        This function returns the health and the number of outstanding
+        queries of every replica, indexed by its base url.
+        """
+        with self._lock:
+            return {
+                endpoint.url: {
+                    "healthy": endpoint.healthy,
+                    "outstanding": endpoint.outstanding,
+                }
+                for endpoint in self.endpoints
+            }
@@ -6,6 +6,7 @@ from typing import List, Union
 EARTH_RADIUS = 6371e3
 ALLOWED_DISTANCES = ["harvesin"]
 ALLOWED_TRANSFORMS = ["average"]
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
 
 
 def str2bool(v: Union[str, bool]) -> bool:
@@ -49,6 +50,49 @@ def harvesin(
     return EARTH_RADIUS * c
 
 
+def geohash(latitude: float, longitude: float, precision: int = 6) -> str:
+    """
+    This function returns the geohash of a set of coordinates, that is the
+    name of the cell of a regular grid containing them. Points close to each
+    other share the same geohash, the higher the precision (number of
+    characters) the smaller the cell: 5 characters are cells of about 5km,
+    6 characters about 1km and 7 characters about 150m.
+
+    :param latitude:  float that represents the latitude of the coordinate
+    :param longitude: float that represents the longitude of the coordinate
+    :param precision: int, number of characters of the geohash (default 6)
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    cell = []
+    bits = 0
+    n_bits = 0
+    even_bit = True
+
+    while len(cell) < precision:
+        # bits are interleaved, starting from the longitude
+        if even_bit:
+            value, value_range = longitude, lon_range
+        else:
+            value, value_range = latitude, lat_range
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            value_range[0] = middle
+        else:
+            bits = bits * 2
+            value_range[1] = middle
+        even_bit = not even_bit
+        n_bits += 1
+
+        if n_bits == 5:
+            cell.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            n_bits = 0
+
+    return "".join(cell)
+
+
 def average(bounding_box: List[float]):
     """
     This function returns the simple mean average
@@ -0,0 +1,165 @@
+import threading
+from typing import Any, Dict, List, Tuple, Union
+
+from geocoder_module.cache import LRUCache
+from geocoder_module.countries import CountryResolver
+
+
+class ValidationPolicy:
+    name = None
+
+    def decide(
+        self, key: Tuple[str, str], hit: Dict[str, Any], backend: Any
+    ) -> Union[bool, None]:
+        """
+        This function returns the verdict of a geocoder hit if the policy can
+        decide it without querying Geonames, None otherwise.
+
+        :param key:         normalized (name, country) pair of the hit
+        :param hit:         location obtained from the geocoder
+        :param backend:     tier of the search chain that found the hit, or None
+        """
+        return None
+
+
+class AuthoritativePolicy(ValidationPolicy):
+    name = "authoritative"
+
+    def decide(self, key, hit, backend) -> Union[bool, None]:
+        # the hits of the authoritative tiers (see authoritative_backends)
+        if backend is not None and backend.authoritative:
+            return True
+        return None
+
+
+class CountryPolicy(ValidationPolicy):
+    name = "country"
+
+    def __init__(self, resolver: CountryResolver) -> None:
+        """
+        This policy validates the hits that are countries
+        known by the local country resolver.
+
+        :param resolver:    CountryResolver of the geocoder
+        """
+        self.resolver = resolver
+
+    def decide(self, key, hit, backend) -> Union[bool, None]:
+        country = self.resolver.resolve(key[1])
+        if country is not None and self.resolver.resolve(key[0]) == country:
+            return True
+        return None
+
+
+class CachedVerdictPolicy(ValidationPolicy):
+    name = "cached"
+
+    def __init__(self, cache: LRUCache) -> None:
+        """
+        This policy reuses the verdicts, positive or negative,
+        stored in the validation cache.
+
+        :param cache:       validation cache of the geocoder
+        """
+        self.cache = cache
+
+    def decide(self, key, hit, backend) -> Union[bool, None]:
+        return self.cache.get(key)
+
+
+class OsmValuePolicy(ValidationPolicy):
+    name = "osm_value"
+
+    def __init__(
+        self,
+        hints: LRUCache,
+        trusted_values: List[str] = None,
+        min_importance: float = None,
+    ) -> None:
+        """
+        This policy validates the hits whose Photon feature has a trusted
+        osm_value (e.g. "state") or, if a minimum is given, an importance
+        above it. The features are looked up in the hints recorded while
+        parsing the Photon responses.
+
+        :param hints:           LRUCache mapping normalized (name, country)
+                                pairs to the osm_value and importance of
+                                their Photon feature
+        :param trusted_values:  list of trusted osm values (default None)
+        :param min_importance:  float, minimum trusted importance, None
+                                disables the check (default None)
+        """
+        self.hints = hints
+        self.trusted_values = set(trusted_values or [])
+        self.min_importance = min_importance
+
+    def decide(self, key, hit, backend) -> Union[bool, None]:
+        hint = self.hints.get(key)
+        if hint is None:
+            return None
+        if hint.get("osm_value") in self.trusted_values:
+            return True
+        importance = hint.get("importance")
+        if (
+            self.min_importance is not None
+            and importance is not None
+            and importance >= self.min_importance
+        ):
+            return True
+        return None
+
+
+class ValidationPolicies:
+    def __init__(self, policies: List[ValidationPolicy]) -> None:
+        """
+        This class decides which geocoder hits need to be validated with
+        Geonames: the policies are applied in order, and the first one that
+        decides the verdict of a hit saves its validation query. The number
+        of queries saved by every policy and of the hits left to validate
+        are counted. It can be shared by several threads.
+
+        :param policies:    list of ValidationPolicy, in order
+        """
+        self.policies = policies
+        self.counters = {policy.name: 0 for policy in policies}
+        self.counters["validated"] = 0
+        self._lock = threading.Lock()
+
+    def decide(
+        self, keys_hits: Dict[Tuple[str, str], Dict[str, Any]], backend: Any = None
+    ) -> Tuple[Dict[Tuple[str, str], bool], List[Tuple[str, str]]]:
+        """
+        This function returns the verdicts decided by the policies, indexed by
+        (name, country) pair, alongside with the list of the pairs that have
+        to be validated.
+
+        :param keys_hits:   dictionary mapping every distinct normalized
+                            (name, country) pair to its first hit
+        :param backend:     tier of the search chain that found the hits
+                            (default None)
+        """
+        verdicts = {}
+        pending = []
+        for key, hit in keys_hits.items():
+            for policy in self.policies:
+                verdict = policy.decide(key, hit, backend)
+                if verdict is not None:
+                    verdicts[key] = verdict
+                    self._count(policy.name)
+                    break
+            else:
+                pending.append(key)
+                self._count("validated")
+        return verdicts, pending
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        This function returns the number of validation queries saved by
+        every policy (field "validated" for the hits left to validate).
+        """
+        with self._lock:
+            return dict(self.counters)
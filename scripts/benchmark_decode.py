@@ -0,0 +1,67 @@
+import os
+import sys
+import gzip
+import json
+import time
+
+# A Photon-like feature, with the fields returned by a real Photon search
+PHOTON_FEATURE = {
+    "geometry": {"coordinates": [-0.1277653, 51.5074456], "type": "Point"},
+    "type": "Feature",
+    "properties": {
+        "osm_id": 65606,
+        "osm_type": "R",
+        "extent": [-0.5103751, 51.6918741, 0.3340155, 51.2867601],
+        "country": "United Kingdom",
+        "osm_key": "place",
+        "countrycode": "GB",
+        "osm_value": "city",
+        "name": "London",
+        "state": "England",
+        "type": "city",
+    },
+}
+
+
+def run_benchmark(name, function, n_runs, n_features):
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        function()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<40} {elapsed / n_runs / n_features * 1e6:>8.2f} us/feature")
+
+
+if __name__ == "__main__":
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    os.environ.setdefault("PHOTON_SERVER", "http://127.0.0.1")
+    os.environ.setdefault("GEONAMES_SERVER", "http://127.0.0.1")
+
+    # imported here as the Geocoder checks the environment variables
+    from geocoder_module.geocoder import Geocoder
+    from geocoder_module.helpers import orjson
+
+    geocoder = Geocoder()
+
+    for n_features in [1, 15, 100]:
+        document = json.dumps({"features": [PHOTON_FEATURE] * n_features}).encode()
+        print(
+            f"\n{n_features} features, {len(document)} bytes, "
+            f"{len(gzip.compress(document))} bytes gzip compressed"
+        )
+
+        run_benchmark("json.loads", lambda: json.loads(document), n_runs, n_features)
+        if orjson is not None:
+            run_benchmark(
+                "orjson.loads", lambda: orjson.loads(document), n_runs, n_features
+            )
+        run_benchmark(
+            "decode + _parse_geocode_response",
+            lambda: geocoder._parse_geocode_response(
+                geocoder.json_loads(document), "london", best_matching=False
+            ),
+            n_runs,
+            n_features,
+        )
+
+    geocoder.close()
@@ -0,0 +1,78 @@
+import time
+import argparse
+
+import numpy as np
+
+from geocoder_module.distances import (
+    bounding_box_distances,
+    distance_matrix,
+    pairwise_distances,
+)
+from geocoder_module.utils import calculate_distance
+
+
+def random_coordinates(rng, size):
+    """
+    Coordinates (longitude, latitude) uniformly distributed over the sphere.
+    """
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, size)))
+    longitudes = rng.uniform(-180, 180, size)
+    return np.stack([longitudes, latitudes], axis=1)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the vectorized distance functions against "
+        "utils.calculate_distance"
+    )
+    parser.add_argument("-n", "--size", type=int, default=100000)
+    parser.add_argument("-m", "--matrix-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    coordinates_1 = random_coordinates(rng, args.size)
+    coordinates_2 = random_coordinates(rng, args.size)
+    bounding_boxes_1 = np.hstack([coordinates_1, coordinates_1 + 1])
+    bounding_boxes_2 = np.hstack([coordinates_2, coordinates_2 + 1])
+    points_1 = coordinates_1.tolist()
+    points_2 = coordinates_2.tolist()
+    boxes_1 = bounding_boxes_1.tolist()
+    boxes_2 = bounding_boxes_2.tolist()
+    size = args.matrix_size
+
+    benchmarks = [
+        (
+            f"pairwise ({args.size})",
+            lambda: [calculate_distance(a, b) for a, b in zip(points_1, points_2)],
+            lambda: pairwise_distances(coordinates_1, coordinates_2),
+        ),
+        (
+            f"matrix ({size}x{size})",
+            lambda: [
+                [calculate_distance(a, b) for b in points_2[:size]]
+                for a in points_1[:size]
+            ],
+            lambda: distance_matrix(coordinates_1[:size], coordinates_2[:size]),
+        ),
+        (
+            f"bounding boxes ({args.size})",
+            lambda: [calculate_distance(a, b) for a, b in zip(boxes_1, boxes_2)],
+            lambda: bounding_box_distances(bounding_boxes_1, bounding_boxes_2),
+        ),
+    ]
+
+    print(f"{'':<26} {'loop (s)':>10} {'numpy (s)':>10} {'speedup':>10}")
+    for name, loop, vectorized in benchmarks:
+        expected, loop_time = timed(loop)
+        result, numpy_time = timed(vectorized)
+        assert np.allclose(result, expected)
+        print(
+            f"{name:<26} {loop_time:>10.3f} {numpy_time:>10.3f} "
+            f"{loop_time / numpy_time:>10.1f}"
+        )
@@ -0,0 +1,99 @@
+import sys
+import time
+import argparse
+import statistics
+
+# Locations of a sample document, used when no locations file is given
+SAMPLE_LOCATIONS = [
+    "London",
+    "Paris",
+    "Houston",
+    "San Antonio",
+    "Sacramento",
+    "Texas",
+    "Madrid",
+    "Sydney",
+    "Brussels",
+    "Belgium",
+]
+
+
+def run_pipeline(geocoder, locations):
+    """
+    Full path of a document: geocoding and validation of its locations,
+    then the double check of their countries.
+    """
+    results = geocoder.get_location_info_many(locations)
+    resolved = [result[0] for result in results if result]
+    ner_tags = [{"name": location, "label": "location"} for location in locations]
+    return geocoder.double_check_countries(resolved, ner_tags)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the geocoding pipeline offline, replaying "
+        "the upstream exchanges recorded in a cassette"
+    )
+    parser.add_argument("cassette", help="path of the cassette file")
+    parser.add_argument(
+        "-l", "--locations", help="text file with one location per line"
+    )
+    parser.add_argument(
+        "-r",
+        "--record",
+        action="store_true",
+        help="record the cassette querying the live upstream services",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=None,
+        help="seconds every replayed query takes, the recorded latencies "
+        "are replayed if not given",
+    )
+    parser.add_argument("-n", "--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    locations = SAMPLE_LOCATIONS
+    if args.locations:
+        with open(args.locations, "r", encoding="utf-8") as f:
+            locations = [line.strip() for line in f if line.strip()]
+
+    if not args.record:
+        import os
+
+        # the upstream services are never reached when replaying
+        os.environ.setdefault("PHOTON_SERVER", "http://127.0.0.1")
+        os.environ.setdefault("GEONAMES_SERVER", "http://127.0.0.1")
+
+    # imported here as the Geocoder checks the environment variables
+    from geocoder_module.geocoder import Geocoder
+
+    geocoder = Geocoder(
+        config={
+            "cassette_path": args.cassette,
+            "cassette_mode": "record" if args.record else "replay",
+            "cassette_latency": args.latency,
+        }
+    )
+    if args.record:
+        run_pipeline(geocoder, locations)
+        geocoder.close()
+        print(f"Recorded {len(geocoder.cassette)} queries in {args.cassette}")
+        sys.exit(0)
+
+    latencies = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        run_pipeline(geocoder, locations)
+        latencies.append(time.perf_counter() - start)
+    geocoder.close()
+
+    latencies.sort()
+    print(f"{len(locations)} locations per document, {args.runs} runs")
+    print(f"{'documents/s':<20} {args.runs / sum(latencies):>10.2f}")
+    print(f"{'p50 latency (ms)':<20} {statistics.median(latencies) * 1000:>10.1f}")
+    print(
+        f"{'p95 latency (ms)':<20} "
+        f"{latencies[int(0.95 * (len(latencies) - 1))] * 1000:>10.1f}"
+    )
@@ -0,0 +1,47 @@
+import time
+import argparse
+
+import numpy as np
+
+from geocoder_module.gazetteer import Gazetteer
+from geocoder_module.reverse import ReverseGeocoder
+
+
+def random_coordinates(rng, size):
+    """
+    Coordinates uniformly distributed over the sphere.
+    """
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, size)))
+    longitudes = rng.uniform(-180, 180, size)
+    return latitudes, longitudes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the offline reverse geocoder on random places "
+        "and coordinates"
+    )
+    parser.add_argument("-p", "--places", type=int, default=50000)
+    parser.add_argument("-q", "--queries", type=int, default=1000000)
+    parser.add_argument("--leaf-size", type=int, default=32)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    latitudes, longitudes = random_coordinates(rng, args.places)
+    gazetteer = Gazetteer(
+        {"name": str(place), "country": "XX", "latitude": lat, "longitude": lon}
+        for place, (lat, lon) in enumerate(zip(latitudes, longitudes))
+    )
+
+    start = time.perf_counter()
+    reverse_geocoder = ReverseGeocoder(gazetteer, leaf_size=args.leaf_size)
+    build_time = time.perf_counter() - start
+
+    latitudes, longitudes = random_coordinates(rng, args.queries)
+    start = time.perf_counter()
+    reverse_geocoder.nearest(latitudes, longitudes)
+    query_time = time.perf_counter() - start
+
+    print(f"{args.places} places, {args.queries} queries")
+    print(f"{'build time (s)':<20} {build_time:>12.2f}")
+    print(f"{'queries/s':<20} {args.queries / query_time:>12.0f}")
@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# A minimal Photon-like answer, the content is not relevant for the benchmark
+PHOTON_RESPONSE = json.dumps(
+    {
+        "features": [
+            {
+                "geometry": {"coordinates": [-0.1277653, 51.5074456]},
+                "properties": {
+                    "name": "London",
+                    "country": "United Kingdom",
+                    "extent": [-0.5103751, 51.6918741, 0.3340155, 51.2867601],
+                },
+            }
+        ]
+    }
+).encode("utf-8")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 is required for the server to honour keep-alive connections
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, avoid the Nagle delay between them
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PHOTON_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(PHOTON_RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_benchmark(name, function, n_requests):
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        function()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<30} {n_requests / elapsed:>10.1f} requests/s")
+
+
+if __name__ == "__main__":
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    os.environ["PHOTON_SERVER"] = url
+    os.environ["GEONAMES_SERVER"] = url
+
+    # imported here as the Geocoder checks the environment variables
+    from geocoder_module.geocoder import Geocoder
+
+    geocoder = Geocoder()
+    params = {"q": "london", "lang": "en", "osm_tag": "place"}
+
+    run_benchmark(
+        "requests.get (no pooling)",
+        lambda: requests.get(url + "/api?", params=params).json(),
+        n_requests,
+    )
+    run_benchmark(
+        "pooled session",
+        lambda: geocoder.sessions["photon"].get(url + "/api?", params=params).json(),
+        n_requests,
+    )
+    run_benchmark(
+        "Geocoder._get_geocode_info",
+        lambda: geocoder._get_geocode_info("london"),
+        n_requests,
+    )
+
+    geocoder.close()
+    server.shutdown()
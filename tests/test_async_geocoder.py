@@ -0,0 +1,269 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+import aiohttp
+import pytest
+from tests.fixtures import *
+
+from geocoder_module.async_geocoder import (
+    AsyncAdaptiveConcurrencyLimiter,
+    AsyncGeocoder,
+    is_upstream_failure,
+)
+
+geocoder = AsyncGeocoder()
+
+expected_get_geocoder_api_output = {
+    "features": [
+        {
+            "geometry": {
+                "coordinates": [151.2164539, -33.8548157],
+                "type": "Point",
+            },
+            "type": "Feature",
+            "properties": {
+                "extent": [150.260825, -33.3641481, 151.343898, -34.1732416],
+                "country": "Australia",
+                "osm_value": "city",
+                "name": "Sydney",
+            },
+        },
+        {
+            "geometry": {
+                "coordinates": [-81.1000854, 42.9847093],
+                "type": "Point",
+            },
+            "type": "Feature",
+            "properties": {
+                "extent": [-81.3907413, 43.0730446, -81.0245848, 42.8235891],
+                "country": "Canada",
+                "osm_value": "city",
+                "name": "Sydney",
+            },
+        },
+    ]
+}
+expected_get_geonames_api_output = {
+    "name": "Sydney",
+    "latitude": "-33.86778",
+    "longitude": "151.20844",
+    "country": "Australia",
+}
+location_output_sydney = {
+    "bounding_box": [150.260825, -33.3641481, 151.343898, -34.1732416],
+    "name": "Sydney",
+    "country": "Australia",
+    "coordinates": [151.2164539, -33.8548157],
+}
+
+
+class TestAsyncGetLocationInfo:
+    @patch(
+        "geocoder_module.async_geocoder.AsyncGeocoder._query_upstream",
+        new_callable=AsyncMock,
+    )
+    def test_returns_validated_location(self, mock_query_upstream):
+        mock_query_upstream.side_effect = [
+            expected_get_geocoder_api_output,
+            expected_get_geonames_api_output,
+        ]
+        response = asyncio.run(geocoder.get_location_info("sydney"))
+
+        assert mock_query_upstream.call_count == 2
+        assert response == [location_output_sydney]
+
+    @patch(
+        "geocoder_module.async_geocoder.AsyncGeocoder._query_upstream",
+        new_callable=AsyncMock,
+    )
+    def test_returns_empty_location_when_upstream_fails(self, mock_query_upstream):
+        mock_query_upstream.side_effect = [ConnectionError("refused")]
+        response = asyncio.run(geocoder.get_location_info("sydney"))
+
+        assert response == []
+
+    @patch(
+        "geocoder_module.async_geocoder.AsyncGeocoder._query_upstream",
+        new_callable=AsyncMock,
+    )
+    def test_all_hits_are_validated(self, mock_query_upstream):
+        mock_query_upstream.side_effect = [
+            expected_get_geocoder_api_output,
+            expected_get_geonames_api_output,
+            {},
+        ]
+        response = asyncio.run(
+            geocoder.get_location_info("sydney", best_matching=False)
+        )
+
+        assert mock_query_upstream.call_count == 3
+        assert response == [location_output_sydney]
+
+
+class TestAsyncGetLocationInfoMany:
+    @patch(
+        "geocoder_module.async_geocoder.AsyncGeocoder.get_location_info",
+        new_callable=AsyncMock,
+    )
+    def test_results_are_returned_in_input_order(self, mock_get_location_info):
+        mock_get_location_info.side_effect = lambda location, **kwargs: [
+            {"name": location}
+        ]
+        response = asyncio.run(
+            geocoder.get_location_info_many(["Paris", "Rome", "Paris"])
+        )
+
+        assert mock_get_location_info.call_count == 2
+        assert response == [
+            [{"name": "Paris"}],
+            [{"name": "Rome"}],
+            [{"name": "Paris"}],
+        ]
+        assert response[0] is not response[2]
+
+
+class TestAsyncDoubleCheckCountries:
+    @patch(
+        "geocoder_module.async_geocoder.AsyncGeocoder.get_location_info",
+        new_callable=AsyncMock,
+    )
+    def test_updated_location_is_returned_when_location_is_validated_with_others_in_article(
+        self,
+        mock_get_location_info,
+    ):
+        locations = [
+            location_output_old_paris,
+            location_output_san_antonio,
+            location_output_texas,
+        ]
+        ner_tags = [ner_tag_paris, ner_tag_san_antonio, ner_tag_texas]
+        mock_get_location_info.return_value = [location_output_new_paris]
+
+        response = asyncio.run(geocoder.double_check_countries(locations, ner_tags))
+
+        expected_output = [
+            location_output_new_paris,
+            location_output_san_antonio,
+            location_output_texas,
+        ]
+
+        assert response == expected_output
+
+
+class TestAsyncReverseEndpoint:
+    @patch(
+        "geocoder_module.async_geocoder.AsyncGeocoder._query_upstream",
+        new_callable=AsyncMock,
+    )
+    def test_get_no_result_from_coordinates(self, mock_query_upstream):
+        mock_query_upstream.return_value = {"features": [{}]}
+        response = asyncio.run(
+            geocoder.get_location_from_coordinates(80.8548157, 151.2164539)
+        )
+
+        assert response == {}
+
+
+class TestAsyncAdaptiveConcurrency:
+    def test_limiter_bounds_queries_in_flight(self):
+        async def run():
+            limiter = AsyncAdaptiveConcurrencyLimiter(maximum=2, latency_target=1.0)
+            peak = 0
+
+            async def query():
+                nonlocal peak
+                await limiter.acquire()
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0)
+                await limiter.release(0.1, failed=False)
+
+            await asyncio.gather(*[query() for _ in range(10)])
+            return limiter, peak
+
+        limiter, peak = asyncio.run(run())
+        assert peak == 2
+        assert limiter.limit == 2
+        assert limiter.in_flight == 0
+
+
+class TestAsyncHedgedRequests:
+    def test_slow_query_is_hedged_and_cancelled(self):
+        hedged_geocoder = AsyncGeocoder(
+            config={
+                "endpoints": {"photon": ["http://slow", "http://fast"]},
+                "hedged_requests": True,
+                "hedge_delay": 0.01,
+            }
+        )
+
+        async def send_to_endpoint(upstream, endpoint, path, params, timeout):
+            if endpoint.url == "http://slow":
+                await asyncio.sleep(1)
+            return {"url": endpoint.url + path}
+
+        async def run():
+            with patch.object(
+                hedged_geocoder, "_send_to_endpoint", side_effect=send_to_endpoint
+            ):
+                return await hedged_geocoder._send_query(
+                    "photon", "/api?", {"q": "sydney"}, None
+                )
+
+        assert asyncio.run(run()) == {"url": "http://fast/api?"}
+
+
+class TestAsyncUpstreamFailures:
+    def test_server_error_is_not_retried_but_counted(self):
+        failing_geocoder = AsyncGeocoder(config={"breaker_failure_threshold": 1})
+        server_error = aiohttp.ClientResponseError(None, (), status=500)
+
+        async def run():
+            with patch.object(
+                failing_geocoder, "_send_query", side_effect=server_error
+            ) as mock_send:
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await failing_geocoder._query_upstream(
+                        "photon", "url_api_endpoint", {"q": "sydney"}
+                    )
+                return mock_send.call_count
+
+        assert asyncio.run(run()) == 1
+        assert failing_geocoder.breaker_states()["photon"] == "open"
+
+    def test_only_server_errors_are_upstream_failures(self):
+        assert is_upstream_failure(aiohttp.ClientResponseError(None, (), status=500))
+        assert not is_upstream_failure(
+            aiohttp.ClientResponseError(None, (), status=404)
+        )
+        assert is_upstream_failure(asyncio.TimeoutError())
+
+
+class TestAsyncClose:
+    def test_no_sync_resources_are_created(self):
+        async_geocoder = AsyncGeocoder(config={"hedged_requests": True})
+        assert async_geocoder.sessions == {}
+        assert async_geocoder.validation_executor is None
+        assert async_geocoder.hedge_executor is None
+        assert async_geocoder.query_executor is None
+        asyncio.run(async_geocoder.close())
+
+    def test_connections_are_bounded_by_max_concurrency(self):
+        async def run():
+            async_geocoder = AsyncGeocoder(
+                config={"max_concurrency": 500, "pool_size": 10}
+            )
+            connector = async_geocoder._get_session().connector
+            await async_geocoder.close()
+            return connector
+
+        connector = asyncio.run(run())
+        assert connector.limit == 500
+        assert connector.limit_per_host == 500
+
+    def test_close_releases_the_session(self):
+        async def run():
+            async_geocoder = AsyncGeocoder()
+            session = async_geocoder._get_session()
+            await async_geocoder.close()
+            return session
+
+        assert asyncio.run(run()).closed
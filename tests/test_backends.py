@@ -0,0 +1,160 @@
+import asyncio
+from unittest.mock import patch
+import pytest
+import requests
+
+from geocoder_module.async_geocoder import AsyncGeocoder
+from geocoder_module.backends import Backend, BackendStats
+from geocoder_module.geocoder import Geocoder
+
+GAZETTEER_DUMP = """name\tcountry\tlatitude\tlongitude\tbbox\tpopulation
+Paris\tFR\t48.8566969\t2.3514616\t2.224122,48.902156,2.4697602,48.8155755\t2138551
+"""
+
+expected_get_geocoder_api_output = {
+    "features": [
+        {
+            "geometry": {"coordinates": [-3.7035825, 40.4167047]},
+            "properties": {
+                "name": "Madrid",
+                "country": "Spain",
+                "extent": [-3.8889539, 40.6437293, -3.5179163, 40.3119774],
+            },
+        }
+    ]
+}
+
+
+@pytest.fixture
+def gazetteer_path(tmp_path):
+    path = tmp_path / "gazetteer.tsv"
+    path.write_text(GAZETTEER_DUMP, encoding="utf-8")
+    return str(path)
+
+
+class StaticBackend(Backend):
+    name = "static"
+
+    def search(self, location, *args):
+        if location == "Atlantis":
+            return [{"name": "Atlantis", "country": "Greece"}]
+        return None
+
+
+class TestBackendChains:
+    def test_disabled_tiers_are_left_out(self):
+        geocoder = Geocoder()
+        assert {
+            operation: [backend.name for backend in chain]
+            for operation, chain in geocoder.backend_chains.items()
+        } == {
+            "search": ["countries", "photon"],
+            "validate": ["countries", "geonames"],
+            "reverse": ["photon"],
+        }
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            Geocoder(config={"backend_chains": {"search": ["bing"]}})
+
+    @patch("requests.Session.get")
+    def test_tiers_are_queried_in_order(self, mock_get, gazetteer_path):
+        geocoder = Geocoder(
+            config={"gazetteer_path": gazetteer_path, "photon_cache_size": 10}
+        )
+        mock_get.return_value.json.return_value = expected_get_geocoder_api_output
+
+        assert geocoder._get_geocode_info("Paris")[0]["country"] == "France"
+        assert geocoder._get_geocode_info("Madrid")[0]["country"] == "Spain"
+        # the answers of the following tiers are stored in the cache
+        assert geocoder._get_geocode_info("Madrid")[0]["country"] == "Spain"
+        assert geocoder._get_geocode_info("Paris")[0]["country"] == "France"
+        assert mock_get.call_count == 1
+
+        stats = geocoder.backend_stats()["search"]
+        assert [stats[tier]["calls"] for tier in stats] == [4, 4, 2, 1]
+        assert stats["cache"]["hits"] == 2
+        assert stats["gazetteer"]["hits"] == 1
+        assert stats["photon"]["hits"] == 1
+
+    @patch("requests.Session.get")
+    def test_custom_backend(self, mock_get):
+        geocoder = Geocoder(
+            config={"backend_chains": {"search": [StaticBackend(), "photon"]}}
+        )
+        mock_get.return_value.json.return_value = {"features": []}
+
+        assert geocoder._get_geocode_info("Atlantis")[0]["country"] == "Greece"
+        assert geocoder._get_geocode_info("Madrid") == []
+        assert mock_get.call_count == 1
+
+    @patch("requests.Session.get")
+    def test_failing_tier_is_skipped(self, mock_get):
+        geocoder = Geocoder(config={"max_retries": 0})
+        mock_get.side_effect = requests.exceptions.ConnectionError("refused")
+
+        assert geocoder._get_geocode_info("Madrid") == []
+        assert geocoder.get_location_from_coordinates(40.4, -3.7) == {}
+        assert geocoder.backend_stats()["search"]["photon"]["errors"] == 1
+        assert geocoder.backend_stats()["reverse"]["photon"]["errors"] == 1
+
+
+class TestAuthoritativeBackends:
+    @patch("requests.Session.get")
+    def test_authoritative_hits_are_not_validated(self, mock_get, gazetteer_path):
+        geocoder = Geocoder(config={"gazetteer_path": gazetteer_path})
+
+        assert geocoder.get_location_info("Paris")[0]["country"] == "France"
+        assert not mock_get.called
+        assert geocoder.backend_stats()["validate"]["geonames"]["calls"] == 0
+
+    @patch("requests.Session.get")
+    def test_other_hits_are_validated_with_geonames(self, mock_get, gazetteer_path):
+        geocoder = Geocoder(
+            config={
+                "gazetteer_path": gazetteer_path,
+                "authoritative_backends": [],
+                "backend_chains": {"validate": ["geonames"]},
+            }
+        )
+        mock_get.return_value.json.return_value = {}
+
+        assert geocoder.get_location_info("Paris") == []
+        assert mock_get.call_count == 1
+        assert geocoder.backend_stats()["validate"]["geonames"]["hits"] == 1
+
+    @patch("requests.Session.get")
+    def test_gazetteer_validates_known_places(self, mock_get, gazetteer_path):
+        geocoder = Geocoder(config={"gazetteer_path": gazetteer_path})
+
+        assert geocoder._validate_name_country("paris", "france")
+        assert not mock_get.called
+
+    def test_async_authoritative_hits_are_not_validated(self, gazetteer_path):
+        async def run():
+            async with AsyncGeocoder(
+                config={"gazetteer_path": gazetteer_path}
+            ) as geocoder:
+                with patch.object(geocoder, "_query_upstream") as mock_query_upstream:
+                    results = await geocoder.get_location_info("Paris")
+                    assert not mock_query_upstream.called
+                return results, geocoder.backend_stats()
+
+        results, stats = asyncio.run(run())
+        assert results[0]["country"] == "France"
+        assert stats["search"]["gazetteer"]["hits"] == 1
+
+
+class TestBackendStats:
+    def test_counters(self):
+        stats = BackendStats()
+        stats.record(0.2, hit=True)
+        stats.record(0.1)
+        stats.record(0.3, error=True)
+        assert stats.stats() == {
+            "calls": 3,
+            "hits": 1,
+            "misses": 1,
+            "errors": 1,
+            "mean_latency": pytest.approx(0.2),
+        }
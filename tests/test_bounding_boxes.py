@@ -0,0 +1,109 @@
+import logging
+
+import numpy as np
+import pytest
+
+from geocoder_module.bounding_boxes import (
+    check_large_bounding_boxes,
+    edit_bounding_boxes,
+    enlarge_bounding_boxes,
+    merge_bounding_boxes,
+    sanitize_bounding_boxes,
+)
+from geocoder_module.geocoder import Geocoder
+from geocoder_module.utils import edit_bounding_box, gps_sanity_check
+
+geocoder = Geocoder()
+
+BOUNDING_BOXES = [
+    [-0.5, 51.7, 0.3, 51.3],
+    [0.3, 51.7, -0.5, 51.3],
+    [2.2, 48.8, 2.5, 48.9],
+    [151.3, -34.1, 150.5, -33.4],
+    [10.0, 45.0, 10.0, 45.0],
+]
+
+
+class TestBoundingBoxArrays:
+    def test_sanitize_matches_scalar(self, caplog):
+        with caplog.at_level(logging.WARNING):
+            sanitized, counts = sanitize_bounding_boxes(BOUNDING_BOXES)
+
+        # a single aggregated warning
+        assert len(caplog.records) == 1
+        assert "4 of 5 bounding boxes" in caplog.records[0].getMessage()
+        assert counts == {"longitudes": 3, "latitudes": 3}
+        expected = [gps_sanity_check(list(box)) for box in BOUNDING_BOXES]
+        assert sanitized.tolist() == expected
+
+    def test_sanitize_does_not_change_input(self):
+        bounding_boxes = np.array(BOUNDING_BOXES)
+        sanitize_bounding_boxes(bounding_boxes)
+        assert bounding_boxes.tolist() == BOUNDING_BOXES
+
+    def test_edit_matches_scalar(self):
+        edited = edit_bounding_boxes(BOUNDING_BOXES, [1000, 2000, 3000, 4000, 5000])
+        for box, distance, result in zip(
+            BOUNDING_BOXES, [1000, 2000, 3000, 4000, 5000], edited
+        ):
+            assert result == pytest.approx(edit_bounding_box(list(box), distance))
+
+        shrunk = edit_bounding_boxes(BOUNDING_BOXES[:1], 1000, add=False)
+        assert shrunk[0] == pytest.approx(
+            edit_bounding_box(list(BOUNDING_BOXES[0]), 1000, add=False)
+        )
+
+    def test_enlarge_matches_scalar(self):
+        bounding_boxes = [
+            [-0.5, 51.7, 0.3, 51.3],
+            [10.0, 45.0, 10.0, 45.0],
+            [2.2, 48.9, 2.5, 48.8],
+        ]
+        enlarged = enlarge_bounding_boxes(bounding_boxes, 50000)
+        for box, result in zip(bounding_boxes, enlarged):
+            assert result == pytest.approx(
+                geocoder.enlarge_bounding_box(list(box), 50000)
+            )
+        # large enough
+        assert enlarged[0].tolist() == bounding_boxes[0]
+        assert geocoder.enlarge_bounding_boxes(bounding_boxes, 50000) == (
+            pytest.approx(enlarged)
+        )
+
+    def test_merge_per_group(self):
+        bounding_boxes = [
+            [-0.5, 51.7, 0.3, 51.3],
+            [2.2, 48.9, 2.5, 48.8],
+            [-3.0, 53.5, -2.0, 53.3],
+            [150.5, -33.4, 151.3, -34.1],
+        ]
+        groups = ["uk", "france", "uk", "australia"]
+        merged, labels = geocoder.merge_bounding_boxes_by_group(bounding_boxes, groups)
+
+        assert labels.tolist() == ["australia", "france", "uk"]
+        assert merged.tolist() == [
+            geocoder.merge_bounding_boxes([bounding_boxes[3]]),
+            geocoder.merge_bounding_boxes([bounding_boxes[1]]),
+            geocoder.merge_bounding_boxes([bounding_boxes[0], bounding_boxes[2]]),
+        ]
+        merged, labels = merge_bounding_boxes(bounding_boxes)
+        assert merged.tolist() == [geocoder.merge_bounding_boxes(bounding_boxes)]
+
+    def test_large_matches_scalar(self):
+        bounding_boxes = [
+            [-178, 0, 178, 0],
+            [178, 0, -178, 0],
+            [-170, 0, 170, 0],
+            [0, -178, 0, 178],
+            [0, 170, 0, -170],
+            [-180, -180, 180, 180],
+        ]
+        flags = check_large_bounding_boxes(bounding_boxes)
+        assert flags.tolist() == [
+            geocoder.check_large_bounding_box(box) for box in bounding_boxes
+        ]
+        assert geocoder.check_large_bounding_boxes(bounding_boxes, 165).all()
+
+    def test_wrong_shape(self):
+        with pytest.raises(ValueError):
+            sanitize_bounding_boxes([[1.0, 2.0, 3.0]])
@@ -0,0 +1,207 @@
+import sqlite3
+import threading
+from unittest.mock import patch
+import pytest
+
+from geocoder_module.cache import LRUCache, SQLiteCache
+from geocoder_module.geocoder import Geocoder
+
+expected_get_geocoder_api_output = {
+    "features": [
+        {
+            "geometry": {"coordinates": [-0.1277653, 51.5074456]},
+            "properties": {
+                "name": "London",
+                "country": "United Kingdom",
+                "extent": [-0.5103751, 51.6918741, 0.3340155, 51.2867601],
+            },
+        }
+    ]
+}
+
+
+class TestLRUCache:
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("london", 1)
+        cache.set("paris", 2)
+        cache.get("london")
+        cache.set("rome", 3)
+
+        assert cache.get("paris") is None
+        assert cache.get("london") == 1
+        assert cache.get("rome") == 3
+        assert len(cache) == 2
+
+    @patch("geocoder_module.cache.time.monotonic")
+    def test_expired_entry_is_evicted(self, mock_monotonic):
+        cache = LRUCache(maxsize=2, ttl=10)
+        mock_monotonic.return_value = 100
+        cache.set("london", 1)
+        mock_monotonic.return_value = 109
+        assert cache.get("london") == 1
+        mock_monotonic.return_value = 110
+        assert cache.get("london") is None
+        assert len(cache) == 0
+
+    def test_counters_and_copies(self):
+        cache = LRUCache(maxsize=2)
+        value = [{"name": "London"}]
+        cache.set("london", value)
+        value[0]["name"] = "Paris"
+        cached_value = cache.get("london")
+        cached_value[0]["name"] = "Rome"
+        cache.get("paris")
+
+        assert cache.get("london") == [{"name": "London"}]
+        assert cache.stats() == {"hits": 2, "misses": 1, "size": 1, "maxsize": 2}
+
+
+class TestSQLiteCache:
+    def test_value_is_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        SQLiteCache(path).set("photon", ["/api?", [["q", "London"]]], {"a": [1]})
+
+        cache = SQLiteCache(path)
+        assert cache.get("photon", ["/api?", [["q", "London"]]]) == {"a": [1]}
+        assert cache.get("geonames", ["/api?", [["q", "London"]]]) is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_stale_version_is_ignored_and_invalidated(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        old_cache = SQLiteCache(path, version="1")
+        old_cache.set("photon", "london", 1)
+        old_cache.set("geonames", "london", 2)
+
+        cache = SQLiteCache(path, version="2")
+        assert cache.get("photon", "london") is None
+        assert cache.invalidate("photon") == 1
+        assert old_cache.get("photon", "london") is None
+        assert old_cache.get("geonames", "london") == 2
+        assert cache.invalidate() == 1
+
+    @patch("geocoder_module.cache.time.time")
+    def test_expired_entry_is_ignored(self, mock_time, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite"), ttl=10)
+        mock_time.return_value = 100
+        cache.set("photon", "london", 1)
+        mock_time.return_value = 110
+        assert cache.get("photon", "london") is None
+
+    def test_close_closes_the_connections_of_all_threads(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+        cache.set("photon", "london", 1)
+        thread = threading.Thread(target=cache.get, args=("photon", "london"))
+        thread.start()
+        thread.join()
+        connections = [connection for _, connection in cache._connections]
+        assert len(connections) == 2
+
+        cache.close()
+        for connection in connections:
+            with pytest.raises(sqlite3.ProgrammingError):
+                connection.execute("SELECT 1")
+        # the connections are opened again when needed
+        assert cache.get("photon", "london") == 1
+
+
+class TestPersistentCache:
+    @patch("requests.Session.get")
+    def test_responses_are_reused_across_runs(self, mock_get, tmp_path):
+        config = {"persistent_cache_path": str(tmp_path / "cache.sqlite")}
+        mock_get.return_value.json.return_value = expected_get_geocoder_api_output
+        first_response = Geocoder(config=config)._get_geocode_info("London")
+
+        geocoder = Geocoder(config=config)
+        second_response = geocoder._get_geocode_info("London")
+
+        assert mock_get.call_count == 1
+        assert first_response == second_response
+        assert geocoder.cache_stats()["persistent"]["hits"] == 1
+
+
+class TestPhotonCache:
+    @patch("requests.Session.get")
+    def test_same_query_is_sent_only_once(self, mock_get):
+        geocoder = Geocoder(config={"photon_cache_size": 10})
+        mock_get.return_value.json.return_value = expected_get_geocoder_api_output
+
+        first_response = geocoder._get_geocode_info("London")
+        second_response = geocoder._get_geocode_info("London")
+        geocoder._get_geocode_info("London", country="France")
+
+        assert first_response == second_response
+        assert mock_get.call_count == 2
+        assert geocoder.cache_stats()["photon"]["hits"] == 1
+        assert geocoder.cache_stats()["photon"]["misses"] == 2
+
+    @patch("requests.Session.get")
+    def test_cache_key_does_not_log(self, mock_get, caplog):
+        geocoder = Geocoder(config={"photon_cache_size": 10})
+        mock_get.return_value.json.return_value = expected_get_geocoder_api_output
+
+        geocoder._get_geocode_info("London", lat=51.5, lon=-0.1, location_bias_scale=5)
+        geocoder._get_geocode_info("London", lat=51.5, lon=-0.1, location_bias_scale=1)
+
+        warnings = [
+            record for record in caplog.records if "bias scale" in record.getMessage()
+        ]
+        assert len(warnings) == 1
+        assert mock_get.call_count == 1
+
+    def test_cache_is_disabled_by_default(self):
+        geocoder = Geocoder()
+        assert geocoder.photon_cache is None
+        assert geocoder.cache_stats() == {}
+
+
+class TestValidationCache:
+    @patch("requests.Session.get")
+    def test_negative_outcome_is_cached(self, mock_get):
+        geocoder = Geocoder(config={"validation_cache_size": 10})
+        mock_get.return_value.json.return_value = {}
+        location_input = [{"name": "Paris", "country": "Poland"}]
+
+        assert geocoder._validate_locations(location_input, "Paris") == []
+        assert geocoder._validate_locations(location_input, "Paris") == []
+        assert mock_get.call_count == 1
+        assert geocoder.cache_stats()["validation"]["hits"] == 1
+
+
+expected_get_reverse_api_output = {
+    "features": [
+        {
+            "geometry": {"coordinates": [-0.1277653, 51.5074456]},
+            "properties": {"city": "London", "country": "United Kingdom"},
+        }
+    ]
+}
+
+
+class TestReverseCache:
+    @patch("requests.Session.get")
+    def test_coordinates_in_the_same_cell_are_queried_once(self, mock_get):
+        geocoder = Geocoder(config={"reverse_cache_size": 10})
+        mock_get.return_value.json.return_value = expected_get_reverse_api_output
+
+        first_response = geocoder.get_location_from_coordinates(51.5074, -0.1278)
+        second_response = geocoder.get_location_from_coordinates(51.5072, -0.1275)
+        geocoder.get_location_from_coordinates(51.5072, -0.1275, radius=10)
+
+        assert first_response == second_response
+        assert first_response["city"] == "London"
+        assert mock_get.call_count == 2
+        assert geocoder.cache_stats()["reverse"]["hits"] == 1
+
+    @patch("requests.Session.get")
+    def test_batch_deduplicates_cells_before_querying(self, mock_get):
+        geocoder = Geocoder(config={"reverse_cache_precision": 5})
+        mock_get.return_value.json.return_value = expected_get_reverse_api_output
+
+        response = geocoder.get_locations_from_coordinates(
+            [(51.5074, -0.1278), (40.4168, -3.7038), (51.5072, -0.1275)]
+        )
+
+        assert mock_get.call_count == 2
+        assert len(response) == 3
+        assert response[0] == response[2]
@@ -0,0 +1,92 @@
+import asyncio
+from unittest.mock import patch
+import pytest
+
+from geocoder_module.async_geocoder import AsyncGeocoder
+from geocoder_module.cassette import Cassette, CassetteMissError
+from geocoder_module.geocoder import Geocoder
+
+expected_get_geocoder_api_output = {
+    "features": [
+        {
+            "geometry": {"coordinates": [-0.1277653, 51.5074456]},
+            "properties": {
+                "name": "London",
+                "country": "United Kingdom",
+                "extent": [-0.5103751, 51.6918741, 0.3340155, 51.2867601],
+            },
+        }
+    ]
+}
+expected_output = [
+    {
+        "bounding_box": [-0.5103751, 51.6918741, 0.3340155, 51.2867601],
+        "name": "London",
+        "country": "United Kingdom",
+        "coordinates": [-0.1277653, 51.5074456],
+    }
+]
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    """
+    Cassette holding a single Photon search for London, recorded
+    through a geocoder whose upstream is mocked.
+    """
+    path = str(tmp_path / "cassette.jsonl.gz")
+    recording_geocoder = Geocoder(
+        config={"cassette_path": path, "cassette_mode": "record"}
+    )
+    with patch("requests.Session.get") as mock_get:
+        mock_get.return_value.json.return_value = expected_get_geocoder_api_output
+        assert recording_geocoder._get_geocode_info("London") == expected_output
+    recording_geocoder.close()
+    return path
+
+
+class TestCassette:
+    def test_recorded_queries_are_saved(self, cassette_path):
+        cassette = Cassette(cassette_path)
+        assert len(cassette) == 1
+
+    def test_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            Cassette(str(tmp_path / "cassette.jsonl.gz"), mode="rewind")
+
+    @patch("requests.Session.get")
+    def test_queries_are_replayed_offline(self, mock_get, cassette_path):
+        replaying_geocoder = Geocoder(config={"cassette_path": cassette_path})
+
+        assert replaying_geocoder._get_geocode_info("London") == expected_output
+        # every replay returns its own copy of the response
+        assert replaying_geocoder._get_geocode_info("London") == expected_output
+        assert replaying_geocoder._get_geocode_info("Paris") == []
+        assert not mock_get.called
+
+    def test_missing_query_raises(self, cassette_path):
+        cassette = Cassette(cassette_path)
+        with pytest.raises(CassetteMissError):
+            cassette.play("photon", "/api?", {"q": "Paris"})
+
+    @patch("geocoder_module.geocoder.time.sleep")
+    def test_latency_is_injected(self, mock_sleep, cassette_path):
+        replaying_geocoder = Geocoder(
+            config={"cassette_path": cassette_path, "cassette_latency": 0.05}
+        )
+        replaying_geocoder._get_geocode_info("London")
+        mock_sleep.assert_called_once_with(0.05)
+
+        replaying_geocoder.cassette.latency = None
+        replaying_geocoder._get_geocode_info("London")
+        # the recorded latency of a mocked query is close to zero
+        assert mock_sleep.call_args[0][0] < 0.05
+
+    def test_queries_are_replayed_by_async_geocoder(self, cassette_path):
+        async def run():
+            async with AsyncGeocoder(
+                config={"cassette_path": cassette_path}
+            ) as replaying_geocoder:
+                return await replaying_geocoder._get_geocode_info("London")
+
+        assert asyncio.run(run()) == expected_output
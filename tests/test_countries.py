@@ -0,0 +1,85 @@
+from unittest.mock import patch
+import pytest
+
+from geocoder_module.countries import (
+    CountryResolver,
+    bounding_box_center,
+    country_display_name,
+)
+from geocoder_module.geocoder import Geocoder
+
+geocoder = Geocoder()
+
+
+class TestCountryResolver:
+    def test_country_display_name(self):
+        assert country_display_name("bosnia and herzegovina") == (
+            "Bosnia and Herzegovina"
+        )
+        assert country_display_name("the bahamas") == "The Bahamas"
+        assert country_display_name("guinea-bissau") == "Guinea-Bissau"
+        assert country_display_name("cote d'ivoire") == "Cote d'Ivoire"
+        assert country_display_name("cocos (keeling) islands") == (
+            "Cocos (Keeling) Islands"
+        )
+        assert country_display_name("heard island and mcdonald islands") == (
+            "Heard Island and McDonald Islands"
+        )
+        assert country_display_name("lao people's democratic republic") == (
+            "Lao People's Democratic Republic"
+        )
+
+    def test_display_names_match_the_country_keys(self):
+        # the names are compared with the keys of the shipped files lowercased
+        for country in geocoder.country_bbox:
+            assert country_display_name(country).lower() == country
+
+    def test_bounding_box_center(self):
+        assert bounding_box_center([0, 10, 20, 0]) == [10, 5]
+        # Fiji crosses the antimeridian
+        assert bounding_box_center([172.0, -12.0, -178.0, -22.0]) == [177.0, -17.0]
+        assert bounding_box_center([178.0, 0, -170.0, 0]) == [-176.0, 0]
+
+    def test_countries_and_acronyms_are_resolved(self):
+        resolver = geocoder.countries
+        assert resolver.resolve(" United  Kingdom") == "united kingdom"
+        assert resolver.resolve("UK") == "united kingdom"
+        assert resolver.resolve("U.S.") == "united states"
+        # lowercase acronyms are common words
+        assert resolver.resolve("us") is None
+        assert resolver.resolve("Sydney") is None
+
+    def test_lookup(self):
+        resolver = CountryResolver(
+            {"australia": [72.2460938, -9.0882278, 168.2249543, -55.3228175]},
+            {"australia": ["au", "aus"]},
+        )
+        results = resolver.lookup("AUS")
+        assert len(results) == 1
+        assert results[0]["name"] == results[0]["country"] == "Australia"
+        assert results[0]["bounding_box"] == [
+            72.2460938,
+            -9.0882278,
+            168.2249543,
+            -55.3228175,
+        ]
+        assert results[0]["coordinates"] == pytest.approx([120.235524, -32.205523])
+        assert resolver.lookup("Australia", country="australia")
+        assert resolver.lookup("Australia", country="France") == []
+        assert resolver.lookup("Sydney") == []
+
+
+class TestCountryBackend:
+    @patch("requests.Session.get")
+    def test_country_mentions_never_reach_upstream(self, mock_get):
+        assert geocoder.get_location_info("France")[0]["country"] == "France"
+        assert geocoder.get_location_info("Georgia", country="Georgia")
+        assert geocoder._validate_name_country("france", "france")
+        assert not mock_get.called
+
+    @patch("requests.Session.get")
+    def test_other_locations_reach_photon(self, mock_get):
+        mock_get.return_value.json.return_value = {"features": []}
+
+        assert geocoder._get_geocode_info("Georgia", country="United States") == []
+        assert mock_get.called
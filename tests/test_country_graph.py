@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from geocoder_module.country_graph import CountryGraph
+from geocoder_module.geocoder import Geocoder
+from geocoder_module.spatial_index import BoundingBoxIndex
+
+geocoder = Geocoder()
+
+NEIGHBORS = {
+    "portugal": ["spain"],
+    "spain": ["portugal", "france", "andorra"],
+    "andorra": ["spain", "france"],
+    "france": ["spain", "andorra", "belgium"],
+    # borders listed on a single side are symmetric
+    "belgium": [],
+    "iceland": [""],
+}
+
+
+class TestCountryGraph:
+    def test_adjacency(self):
+        graph = CountryGraph(NEIGHBORS)
+        assert len(graph) == 6
+        assert graph.neighbors("France") == ["andorra", "belgium", "spain"]
+        assert graph.neighbors("belgium") == ["france"]
+        assert graph.neighbors("iceland") == []
+        assert graph.neighbors("atlantis") == []
+
+    def test_k_hop_closures(self):
+        graph = CountryGraph(NEIGHBORS, max_hops=2)
+        assert graph.neighbors("portugal", hops=2) == ["andorra", "france", "spain"]
+        assert graph.hop("portugal", "portugal") == 0
+        assert graph.hop("portugal", "france") == 2
+        # beyond max_hops
+        assert graph.hop("portugal", "belgium") is None
+        assert graph.hop("portugal", "atlantis") is None
+
+        assert graph.hops_many(
+            ["portugal", "spain", "iceland", "atlantis"],
+            ["spain", "belgium", "spain", "spain"],
+        ).tolist() == [1, 2, -1, -1]
+        assert graph.within_hops(
+            ["portugal", "portugal", "belgium"], ["spain", "france", "Andorra"], 1
+        ).tolist() == [True, False, False]
+
+    def test_hops_beyond_max_hops_are_rejected(self):
+        graph = CountryGraph(NEIGHBORS, max_hops=2)
+        with pytest.raises(ValueError):
+            graph.neighbors("portugal", hops=3)
+        with pytest.raises(ValueError):
+            graph.within_hops(["portugal"], ["belgium"], 3)
+
+
+class TestNearestCountries:
+    def test_nearest_boxes(self):
+        index = BoundingBoxIndex(
+            [[0, 10, 10, 0], [20, 10, 30, 0], [172.0, -12.0, -178.5, -22.0]]
+        )
+        indexes, distances = index.nearest_many(
+            [[5, 5, 5, 5], [14, 5, 14, 5], [-170, -17, -170, -17]], k=2
+        )
+        assert indexes[:, 0].tolist() == [0, 0, 2]
+        assert distances[0, 0] == 0
+        assert distances[1, 0] < distances[1, 1]
+        # the nearest side of Fiji is across the antimeridian
+        assert distances[2, 0] == pytest.approx(
+            8.5 * 111195 * np.cos(np.radians(17)), rel=0.01
+        )
+        assert index.nearest_many([[5, 5, 5, 5]], k=10)[0].shape == (1, 3)
+
+    def test_geocoder_nearest_countries(self):
+        nearest = geocoder.get_nearest_countries([2.3522, 48.8566], k=2)
+        assert nearest[0] == ("france", 0)
+        assert nearest[1][1] > 0
+
+        results = geocoder.get_nearest_countries_many(
+            [[-140.0, -40.0], [151.2093, -33.8688]]
+        )
+        assert results[0][0][0] == "french polynesia"
+        assert results[1] == [("australia", 0)]
+        assert geocoder.get_nearest_countries([2.2, 48.9, 2.5, 48.8]) == [("france", 0)]
+
+
+class TestGeocoderCountryNeighbors:
+    def test_get_country_neighbors(self):
+        assert "spain" in geocoder.get_country_neighbors("france")
+        assert geocoder.get_country_neighbors("France") == (
+            geocoder.country_graph.neighbors("france")
+        )
+        assert geocoder.get_country_neighbors("atlantis") == []
+        two_hops = geocoder.get_country_neighbors("portugal", hops=2)
+        assert {"spain", "france", "andorra"} <= set(two_hops)
+        with pytest.raises(ValueError):
+            geocoder.get_country_neighbors("portugal", hops=4)
+
+    def test_countries_within_hops(self):
+        assert geocoder.countries_within_hops(
+            ["portugal", "portugal", "france"], ["spain", "germany", "atlantis"], 2
+        ).tolist() == [True, False, False]
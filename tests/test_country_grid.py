@@ -0,0 +1,78 @@
+import numpy as np
+
+from geocoder_module.country_grid import CountryGrid
+from geocoder_module.geocoder import Geocoder
+
+geocoder = Geocoder()
+
+# capitals and large cities close to a border, whose coordinates are
+# contained in the bounding boxes of several countries
+BORDER_CITIES = [
+    ("vienna", 48.2082, 16.3738, "austria", "hungary"),
+    ("buenos aires", -34.6037, -58.3816, "argentina", "uruguay"),
+    ("lagos", 6.5244, 3.3792, "nigeria", "benin"),
+    ("toronto", 43.6532, -79.3832, "canada", "united states"),
+    ("oslo", 59.9139, 10.7522, "norway", "sweden"),
+]
+
+
+def brute_force(grid, lat, lon):
+    point = np.array([lon, lat])
+    inside = ((grid.mins <= point) & (point <= grid.maxs)).all(axis=1)
+    return sorted(set(grid.countries[inside].tolist()))
+
+
+class TestCountryGrid:
+    def test_overlapping_boxes_are_not_guessed(self):
+        grid = CountryGrid(
+            [[0, 10, 10, 0], [2, 4, 3, 3], [172.0, -12.0, -178.5, -22.0]],
+            cell_size=2.0,
+        )
+        assert grid.lookup(5, 5) == 0
+        assert grid.lookup(3.5, 2.5) == -1
+        assert grid.candidates_many([3.5], [2.5]) == [[0, 1]]
+        assert grid.lookup(20, 5) == -1
+        assert grid.candidates_many([20], [5]) == [[]]
+        # both sides of the antimeridian
+        assert grid.lookup(-17, 179) == 2
+        assert grid.lookup(-17, -179) == 2
+        assert grid.lookup(90, 180) == -1
+
+    def test_matches_brute_force(self):
+        bounding_boxes = list(geocoder.country_bbox.values())
+        grid = CountryGrid(bounding_boxes, cell_size=5.0)
+        rng = np.random.default_rng(0)
+        latitudes = rng.uniform(-90, 90, 2000)
+        longitudes = rng.uniform(-180, 180, 2000)
+
+        expected = [
+            brute_force(grid, lat, lon) for lat, lon in zip(latitudes, longitudes)
+        ]
+        assert grid.candidates_many(latitudes, longitudes) == expected
+        assert grid.lookup_many(latitudes, longitudes).tolist() == [
+            countries[0] if len(countries) == 1 else -1 for countries in expected
+        ]
+        assert len(grid.lookup_many([], [])) == 0
+
+
+class TestCountryFromCoordinates:
+    def test_country_from_coordinates(self):
+        assert geocoder.get_country_from_coordinates(48.8566, 2.3522) == "france"
+        assert geocoder.get_country_from_coordinates(-35.2809, 149.13) == ("australia")
+        assert geocoder.get_country_from_coordinates(-17.7134, 178.065) == "fiji"
+        assert geocoder.get_country_from_coordinates(-40.0, -140.0) is None
+
+    def test_capitals_near_borders_are_not_guessed(self):
+        for _, lat, lon, country, other_country in BORDER_CITIES:
+            assert geocoder.get_country_from_coordinates(lat, lon) is None
+            candidates = geocoder.get_country_candidates_from_coordinates(lat, lon)
+            assert country in candidates
+            assert other_country in candidates
+
+    def test_batch(self):
+        assert geocoder.get_countries_from_coordinates(
+            np.array([48.8566, 48.2082, -40.0]), np.array([2.3522, 16.3738, -140.0])
+        ) == ["france", None, None]
+        assert geocoder.get_country_candidates_from_coordinates_many(
+            [48.8566, 48.2082, -40.0], [2.3522, 16.3738, -140.0]
+        ) == [["france"], ["austria", "hungary"], []]
@@ -0,0 +1,96 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from geocoder_module.async_geocoder import AsyncGeocoder
+from geocoder_module.disambiguation import CandidateLattice
+from geocoder_module.geocoder import Geocoder
+
+geocoder = Geocoder(config={"double_check_mode": "lattice"})
+
+paris_france = {"name": "Paris", "country": "France"}
+paris_us = {"name": "Paris", "country": "United States"}
+houston_us = {"name": "Houston", "country": "United States"}
+houston_canada = {"name": "Houston", "country": "Canada"}
+san_antonio_us = {"name": "San Antonio", "country": "United States"}
+san_antonio_chile = {"name": "San Antonio", "country": "Chile"}
+
+candidates = {
+    "Paris": [paris_france, paris_us],
+    "Houston": [houston_us, houston_canada],
+    "San Antonio": [san_antonio_us, san_antonio_chile],
+}
+
+
+def get_candidates(location, **kwargs):
+    return candidates[location]
+
+
+class TestCandidateLattice:
+    def test_majority_country_is_assigned(self):
+        lattice = CandidateLattice(
+            [candidates["Paris"], candidates["Houston"], candidates["San Antonio"]]
+        )
+        assert lattice.assign() == ["united states"] * 3
+
+    def test_best_ranked_candidate_wins_without_context(self):
+        lattice = CandidateLattice([candidates["Paris"], []])
+        assert lattice.assign() == ["france", None]
+
+    def test_ner_countries_and_neighbors(self):
+        brussels = [{"name": "Brussels", "country": "Belgium"}]
+        assert CandidateLattice(
+            [candidates["Paris"]], ner_countries=["United States"]
+        ).assign() == ["united states"]
+        # France borders Belgium, the United States do not
+        lattice = CandidateLattice(
+            [[paris_us, paris_france], brussels],
+            country_neighbors={"france": ["belgium"], "belgium": ["france"]},
+        )
+        assert lattice.assign() == ["france", "belgium"]
+
+
+class TestDisambiguateCountries:
+    @patch("geocoder_module.geocoder.Geocoder.get_location_info")
+    def test_locations_are_assigned_with_one_query_each(self, mock_get_location_info):
+        mock_get_location_info.side_effect = get_candidates
+        locations = [paris_france, houston_us, san_antonio_us, houston_us, {}]
+
+        response = geocoder.double_check_countries(locations, [])
+
+        assert response == [paris_us, houston_us, san_antonio_us, houston_us, {}]
+        assert sorted(call[0][0] for call in mock_get_location_info.call_args_list) == [
+            "Houston",
+            "Paris",
+            "San Antonio",
+        ]
+        assert all(
+            call[1]["best_matching"] is False and call[1]["validate"] is True
+            for call in mock_get_location_info.call_args_list
+        )
+
+    @patch("geocoder_module.geocoder.Geocoder.get_location_info")
+    def test_country_mentions_are_not_queried(self, mock_get_location_info):
+        mock_get_location_info.side_effect = get_candidates
+        france = {"name": "France", "country": "France"}
+
+        response = geocoder.disambiguate_countries(
+            [paris_us, france], [{"name": "France", "label": "location"}]
+        )
+
+        assert response == [paris_france, france]
+        assert mock_get_location_info.call_count == 1
+
+    @patch(
+        "geocoder_module.async_geocoder.AsyncGeocoder.get_location_info",
+        new_callable=AsyncMock,
+    )
+    def test_async_locations_are_assigned(self, mock_get_location_info):
+        mock_get_location_info.side_effect = get_candidates
+        async_geocoder = AsyncGeocoder(config={"double_check_mode": "lattice"})
+
+        response = asyncio.run(
+            async_geocoder.double_check_countries([paris_france, houston_us], [])
+        )
+
+        assert response[1] == houston_us
+        assert mock_get_location_info.call_count == 2
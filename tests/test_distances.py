@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from geocoder_module.distances import (
+    bounding_box_distance_matrix,
+    bounding_box_distances,
+    distance_matrix,
+    haversine,
+    pairwise_distances,
+)
+from geocoder_module.geocoder import Geocoder
+from geocoder_module.utils import calculate_distance
+
+geocoder = Geocoder()
+
+LONDON = [-0.1277653, 51.5074456]
+PARIS = [2.3514616, 48.8566969]
+SYDNEY = [151.2082848, -33.8688197]
+SUVA = [178.4418, -18.1416]
+APIA = [-171.7513, -13.8333]
+
+
+class TestDistances:
+    def test_haversine_matches_scalar_distance(self):
+        assert haversine(LONDON[1], LONDON[0], PARIS[1], PARIS[0]) == pytest.approx(
+            calculate_distance(LONDON, PARIS)
+        )
+        assert haversine(10.0, 20.0, 10.0, 20.0) == 0
+
+    def test_pairwise_distances(self):
+        distances = pairwise_distances([LONDON, SUVA], [PARIS, APIA])
+
+        assert distances.shape == (2,)
+        assert distances == pytest.approx(
+            [calculate_distance(LONDON, PARIS), calculate_distance(SUVA, APIA)]
+        )
+        # across the antimeridian
+        assert distances[1] < 1200000
+
+    def test_distance_matrix(self):
+        coordinates_1 = [LONDON, PARIS, SYDNEY]
+        coordinates_2 = [SUVA, LONDON]
+        matrix = distance_matrix(coordinates_1, coordinates_2)
+
+        assert matrix.shape == (3, 2)
+        for i, coordinates_a in enumerate(coordinates_1):
+            for j, coordinates_b in enumerate(coordinates_2):
+                assert matrix[i, j] == pytest.approx(
+                    calculate_distance(coordinates_a, coordinates_b)
+                )
+
+    def test_bounding_box_distances(self):
+        bounding_boxes_1 = [[-0.5, 51.7, 0.3, 51.3], [2.2, 48.9, 2.5, 48.8]]
+        bounding_boxes_2 = [[2.2, 48.9, 2.5, 48.8], [150.5, -33.4, 151.3, -34.1]]
+        distances = bounding_box_distances(bounding_boxes_1, bounding_boxes_2)
+
+        assert distances == pytest.approx(
+            [
+                calculate_distance(box_1, box_2)
+                for box_1, box_2 in zip(bounding_boxes_1, bounding_boxes_2)
+            ]
+        )
+        matrix = bounding_box_distance_matrix(bounding_boxes_1, bounding_boxes_2)
+        assert matrix.shape == (2, 2)
+        assert np.diag(matrix) == pytest.approx(distances)
+        assert matrix[1, 0] == 0
+
+    def test_wrong_shapes(self):
+        with pytest.raises(ValueError):
+            pairwise_distances([LONDON, PARIS], [PARIS])
+        with pytest.raises(ValueError):
+            distance_matrix([[1.0, 2.0, 3.0]], [PARIS])
+        with pytest.raises(ValueError):
+            bounding_box_distances([[1.0, 2.0, 3.0, 4.0]], [])
+
+    def test_geocoder_wrappers(self):
+        assert geocoder.get_distance(LONDON, PARIS) == pytest.approx(343556, rel=1e-3)
+        assert geocoder.get_distances([LONDON], [PARIS]) == pytest.approx(
+            [geocoder.get_distance(LONDON, PARIS)]
+        )
+        bounding_box = [-0.5, 51.7, 0.3, 51.3]
+        assert geocoder.get_distances([bounding_box], [bounding_box]) == [0]
+        assert geocoder.get_distance_matrix([LONDON, PARIS], [PARIS]).shape == (2, 1)
+        assert geocoder.get_distance_matrix([bounding_box], [bounding_box]) == [[0]]
@@ -0,0 +1,124 @@
+from unittest.mock import patch
+import pytest
+
+from geocoder_module.gazetteer import (
+    Gazetteer,
+    country_names_from_acronyms,
+    normalize_name,
+)
+from geocoder_module.geocoder import Geocoder
+
+GAZETTEER_DUMP = """name\talternatenames\tcountry\tlatitude\tlongitude\tbbox\tpopulation
+Paris\tParigi,Paname\tFR\t48.8566969\t2.3514616\t2.224122,48.902156,2.4697602,48.8155755\t2138551
+Paris\t\tUS\t33.6617962\t-95.555513\t-95.6279396,33.7383866,-95.4354115,33.6206345\t24171
+Parisot\t\tFR\t44.26\t1.86\t\t500
+São Paulo\tSao Paulo\tBrazil\t-23.5475\t-46.63611\t\t10021295
+Atlantis\t\tXX\tnot a latitude\t0\t\t0
+"""
+
+
+@pytest.fixture
+def gazetteer_path(tmp_path):
+    path = tmp_path / "gazetteer.tsv"
+    path.write_text(GAZETTEER_DUMP, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def gazetteer(gazetteer_path):
+    return Gazetteer.load(gazetteer_path, {"fr": "France", "us": "United States"})
+
+
+class TestGazetteer:
+    def test_normalize_name(self):
+        assert normalize_name("  São  PAULO ") == "sao paulo"
+
+    def test_country_names_from_acronyms(self):
+        country_names = country_names_from_acronyms(
+            {"united kingdom": ["uk", "gb"], "bosnia and herzegovina": ["ba"]}
+        )
+        assert country_names == {
+            "uk": "United Kingdom",
+            "gb": "United Kingdom",
+            "ba": "Bosnia and Herzegovina",
+        }
+
+    def test_invalid_records_are_skipped(self, gazetteer):
+        assert len(gazetteer) == 4
+
+    def test_records_with_out_of_range_population_are_skipped(self):
+        gazetteer = Gazetteer(
+            [
+                {
+                    "name": "Nowhere",
+                    "country": "XX",
+                    "latitude": "0",
+                    "longitude": "0",
+                    "population": "-1",
+                },
+                {
+                    "name": "Everywhere",
+                    "country": "XX",
+                    "latitude": "0",
+                    "longitude": "0",
+                    "population": str(2**64),
+                },
+                {
+                    "name": "Somewhere",
+                    "country": "XX",
+                    "latitude": "0",
+                    "longitude": "0",
+                    "population": "10",
+                },
+            ]
+        )
+        assert len(gazetteer) == 1
+        assert list(gazetteer.population) == [10]
+        assert gazetteer.lookup("somewhere")[0]["coordinates"] == [0.0, 0.0]
+
+    def test_exact_lookup_ranks_by_population(self, gazetteer):
+        assert gazetteer.lookup("paris") == [
+            {
+                "bounding_box": [2.224122, 48.902156, 2.4697602, 48.8155755],
+                "name": "Paris",
+                "country": "France",
+                "coordinates": [2.3514616, 48.8566969],
+            }
+        ]
+        results = gazetteer.lookup("Paris", best_matching=False)
+        assert [result["country"] for result in results] == ["France", "United States"]
+
+    def test_lookup_by_alternate_name_and_country(self, gazetteer):
+        assert gazetteer.lookup("parigi")[0]["name"] == "Paris"
+        assert gazetteer.lookup("sao paulo")[0]["country"] == "Brazil"
+        assert gazetteer.lookup("paris", country="united states")[0]["coordinates"] == [
+            -95.555513,
+            33.6617962,
+        ]
+        assert gazetteer.lookup("paris", country="Spain") == []
+
+    def test_prefix_lookup(self, gazetteer):
+        results = gazetteer.lookup("pari", best_matching=False, prefix=True)
+        assert [result["name"] for result in results] == ["Paris", "Paris", "Parisot"]
+        assert gazetteer.lookup("pari", best_matching=False) == []
+
+    def test_place_without_bbox_gets_default_extent(self, gazetteer):
+        bounding_box = gazetteer.lookup("parisot")[0]["bounding_box"]
+        assert bounding_box[0] < 1.86 < bounding_box[2]
+        assert bounding_box[3] < 44.26 < bounding_box[1]
+
+
+class TestGazetteerBackend:
+    @patch("requests.Session.get")
+    def test_known_locations_skip_photon(self, mock_get, gazetteer_path):
+        offline_geocoder = Geocoder(config={"gazetteer_path": gazetteer_path})
+        mock_get.return_value.json.return_value = {"features": []}
+
+        results = offline_geocoder._get_geocode_info("Paris")
+        assert results[0]["country"] == "France"
+        assert not mock_get.called
+
+        # unknown locations and searches biased towards coordinates go to Photon
+        assert offline_geocoder._get_geocode_info("Madrid") == []
+        offline_geocoder._get_geocode_info("Paris", lat=33.6, lon=-95.5)
+        assert mock_get.call_count == 2
@@ -4,10 +4,11 @@ import pytest
 from geocoder_module.geocoder import Geocoder
 
 geocoder = Geocoder()
+photon_geocoder = Geocoder(config={"backend_chains": {"search": ["photon"]}})
 
 
 class TestGetGeocoderInfo:
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_returns_a_location_when_queried(
         self,
         mock_get,
@@ -81,7 +82,7 @@ class TestGetGeocoderInfo:
         assert mock_get.called
         assert response == expected_output
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_returns_location_when_country_queried_but_result_has_no_extent(
         self, mock_get
     ):
@@ -124,12 +125,13 @@ class TestGetGeocoderInfo:
                 ]["coordinates"],
             }
         ]
-        response = geocoder._get_geocode_info("Australia")
+        # countries are resolved locally unless Photon is the only search tier
+        response = photon_geocoder._get_geocode_info("Australia")
 
         assert mock_get.called
         assert response == expected_output
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_returns_empty_location_when_local_location_result_has_no_extent(
         self, mock_get
     ):
@@ -164,7 +166,7 @@ class TestGetGeocoderInfo:
         assert mock_get.called
         assert response == expected_output
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_returns_right_location_when_country_queried_with_country_field_but_result_has_no_extent(
         self, mock_get
     ):
@@ -207,14 +209,32 @@ class TestGetGeocoderInfo:
                 ]["coordinates"],
             }
         ]
-        response = geocoder._get_geocode_info("Australia", country="Australia")
+        response = photon_geocoder._get_geocode_info("Australia", country="Australia")
 
         assert mock_get.called
         assert response == expected_output
 
+    @patch("requests.Session.get")
+    def test_limit_and_country_are_pushed_to_photon(self, mock_get):
+        mock_get.return_value.json.return_value = {"features": []}
+
+        geocoder._get_geocode_info("Sydney", country="Australia")
+        params = mock_get.call_args[1]["params"]
+        assert params["limit"] == 5
+        assert params["bbox"] == "72.2460938,-55.3228175,168.2249543,-9.0882278"
+
+        geocoder._get_geocode_info("Sydney", best_matching=False)
+        params = mock_get.call_args[1]["params"]
+        assert "limit" not in params
+        assert "bbox" not in params
+
+    def test_country_bbox_is_skipped_when_unknown_or_across_antimeridian(self):
+        assert geocoder._country_search_bbox("Atlantis") is None
+        assert geocoder._country_search_bbox("Fiji") is None
+
 
 class TestGetGeonames:
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_geonames_info_returns_right_location_when_queried(
         self,
         mock_get,
@@ -243,7 +263,7 @@ class TestGetGeonames:
 
 
 class TestGetLocationInfo:
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_location_info_returns_right_location_when_found_by_geocoder_and_geonames(
         self,
         mock_get,
@@ -305,7 +325,7 @@ class TestGetLocationInfo:
         assert mock_get.called
         assert response == expected_output
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_location_info_returns_empty_list_when_location_found_by_geocoder_cant_be_validated_by_geonames(
         self,
         mock_get,
@@ -345,7 +365,7 @@ class TestGetLocationInfo:
 
 
 class TestValidateLocations:
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_returns_validated_location(self, mock_get):
         location_input = [
             {
@@ -381,7 +401,7 @@ class TestValidateLocations:
         response = geocoder._validate_locations(location_input, "Sydney")
         assert response == expected_output
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_returns_empty_value_when_given_empty_value(self, mock_get):
         expected_output = []
         expected_get_geonames_api_output = {}
@@ -396,6 +416,51 @@ class TestValidateLocations:
         response = geocoder._validate_locations([], "Paris")
         assert response == expected_output
 
+    @patch("requests.Session.get")
+    def test_hits_with_same_name_and_country_are_validated_once(self, mock_get):
+        location_input = [
+            {"name": "Sydney", "country": "Australia", "coordinates": [151.2, -33.8]},
+            {"name": "Sydney", "country": "Australia", "coordinates": [151.2, -33.8]},
+            {"name": "sydney", "country": "Australia", "coordinates": [151.1, -33.9]},
+        ]
+        expected_get_geonames_api_output = {
+            "name": "Sydney",
+            "latitude": "-33.86778",
+            "longitude": "151.20844",
+            "country": "Australia",
+        }
+        mock_get.return_value.json.side_effect = [expected_get_geonames_api_output]
+        response = geocoder._validate_locations(location_input, "Sydney")
+
+        assert mock_get.call_count == 1
+        assert response == [location_input[0], location_input[2]]
+
+    @patch("requests.Session.get")
+    def test_distinct_hits_are_validated_separately(self, mock_get):
+        location_input = [
+            {"name": "Sydney", "country": "Australia"},
+            {"name": "Sydney", "country": "Canada"},
+        ]
+
+        def geonames_output(url, params, **kwargs):
+            response = Mock()
+            if params["country"] == "canada":
+                response.json.return_value = {}
+            else:
+                response.json.return_value = {
+                    "name": "Sydney",
+                    "latitude": "-33.86778",
+                    "longitude": "151.20844",
+                    "country": "Australia",
+                }
+            return response
+
+        mock_get.side_effect = geonames_output
+        response = geocoder._validate_locations(location_input, "Sydney")
+
+        assert mock_get.call_count == 2
+        assert response == [location_input[0]]
+
 
 class TestBlacklist:
     def test_get_location_blacklist_returns_empty_location(self):
@@ -436,7 +501,7 @@ class TestHandleAcronyms:
         assert response == "madrid"
 
     class TestReverseEndpoint:
-        @patch("requests.get")
+        @patch("requests.Session.get")
         def test_get_hit_from_coordinates(self, mock_get):
             latitude = -33.8548157
             longitude = 151.2164539
@@ -488,7 +553,7 @@ class TestHandleAcronyms:
             assert mock_get.called
             assert response == expected_output
 
-        @patch("requests.get")
+        @patch("requests.Session.get")
         def test_get_no_result_from_coordinates(self, mock_get):
             latitude = 80.8548157
             longitude = 151.2164539
@@ -501,3 +566,79 @@ class TestHandleAcronyms:
 
             assert mock_get.called
             assert response == expected_output
+
+
+class TestGetLocationInfoMany:
+    @patch("geocoder_module.geocoder.Geocoder.get_location_info")
+    def test_results_are_returned_in_input_order_and_queries_deduplicated(
+        self, mock_get_location_info
+    ):
+        mock_get_location_info.side_effect = lambda location, **kwargs: [
+            {"name": location, "country": kwargs["country"]}
+        ]
+        locations = [
+            "London",
+            {"location": "Paris", "country": "France"},
+            "London",
+            {"location": "Paris", "country": "United States"},
+        ]
+        response = geocoder.get_location_info_many(locations, max_workers=2)
+
+        expected_output = [
+            [{"name": "London", "country": None}],
+            [{"name": "Paris", "country": "France"}],
+            [{"name": "London", "country": None}],
+            [{"name": "Paris", "country": "United States"}],
+        ]
+
+        assert mock_get_location_info.call_count == 3
+        assert response == expected_output
+
+    @patch("geocoder_module.geocoder.Geocoder.get_location_info")
+    def test_failing_query_returns_empty_result(self, mock_get_location_info):
+        mock_get_location_info.side_effect = [KeyError("features")]
+        response = geocoder.get_location_info_many(["London"])
+
+        assert response == [[]]
+
+    @patch("geocoder_module.geocoder.Geocoder.get_location_info")
+    def test_iter_yields_every_input_position(self, mock_get_location_info):
+        mock_get_location_info.side_effect = lambda location, **kwargs: [
+            {"name": location}
+        ]
+        response = dict(geocoder.iter_location_info_many(["Paris", "Rome", "Paris"]))
+
+        assert response == {
+            0: [{"name": "Paris"}],
+            1: [{"name": "Rome"}],
+            2: [{"name": "Paris"}],
+        }
+
+    @patch("geocoder_module.geocoder.Geocoder.get_location_info")
+    def test_duplicates_get_their_own_copy(self, mock_get_location_info):
+        mock_get_location_info.side_effect = lambda location, **kwargs: [
+            {"name": location}
+        ]
+        response = geocoder.get_location_info_many(["Paris", "Paris"])
+        response[0][0]["name"] = "Lutetia"
+
+        assert response[1] == [{"name": "Paris"}]
+
+    @patch("geocoder_module.geocoder.Geocoder.get_location_info")
+    def test_queries_run_on_the_geocoder_pool(self, mock_get_location_info):
+        mock_get_location_info.side_effect = lambda location, **kwargs: [
+            {"name": location}
+        ]
+        locations = [f"location {index}" for index in range(10)]
+        with patch(
+            "geocoder_module.geocoder.ThreadPoolExecutor"
+        ) as mock_executor_class:
+            first_response = geocoder.get_location_info_many(locations, max_workers=3)
+            second_response = geocoder.get_location_info_many(locations)
+
+        assert not mock_executor_class.called
+        assert first_response == second_response
+        assert [result[0]["name"] for result in first_response] == locations
+
+    def test_empty_list_returns_empty_list(self):
+        assert geocoder.get_location_info_many([]) == []
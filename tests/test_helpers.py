@@ -1,4 +1,11 @@
-from geocoder_module.helpers import check_location_can_be_processed
+import json
+import pytest
+
+from geocoder_module.helpers import (
+    check_location_can_be_processed,
+    get_json_decoder,
+    load_json_file,
+)
 
 
 class TestCheckFormat:
@@ -27,3 +34,22 @@ class TestCheckFormat:
         location = "Fukushima-city2"
         response = check_location_can_be_processed(location)
         assert response == False
+
+
+class TestJsonDecoder:
+    def test_decoders_return_same_document(self):
+        document = b'{"features": [{"properties": {"name": "Z\xc3\xbcrich"}}]}'
+        assert get_json_decoder("json")(document) == get_json_decoder()(document)
+        assert get_json_decoder("json") is json.loads
+
+    def test_unknown_decoder(self):
+        with pytest.raises(ValueError):
+            get_json_decoder("yaml")
+
+    def test_reference_files_are_loaded(self):
+        assert load_json_file("countries_bbox.json")["aruba"] == [
+            -70.2809842,
+            12.8102998,
+            -69.6409842,
+            12.1702998,
+        ]
@@ -0,0 +1,162 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+import numpy as np
+import pytest
+
+from geocoder_module.async_geocoder import AsyncGeocoder
+from geocoder_module.gazetteer import Gazetteer
+from geocoder_module.geocoder import Geocoder
+from geocoder_module.reverse import ReverseGeocoder, chord_to_meters, to_unit_vectors
+from geocoder_module.utils import calculate_distance
+
+GAZETTEER_DUMP = """name\tcountry\tlatitude\tlongitude\tpopulation
+London\tGB\t51.5074456\t-0.1277653\t8961989
+Croydon\tGB\t51.3713049\t-0.101957\t192064
+Paris\tFR\t48.8566969\t2.3514616\t2138551
+Versailles\tFR\t48.8035403\t2.1266886\t85205
+Suva\tFJ\t-18.1415884\t178.4421662\t93970
+"""
+
+
+@pytest.fixture
+def gazetteer_path(tmp_path):
+    path = tmp_path / "gazetteer.tsv"
+    path.write_text(GAZETTEER_DUMP, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def gazetteer(gazetteer_path):
+    return Gazetteer.load(gazetteer_path, {"gb": "United Kingdom", "fr": "France"})
+
+
+class TestReverseGeocoder:
+    def test_chord_distance_matches_haversine(self):
+        points = to_unit_vectors([51.5074456, 48.8566969], [-0.1277653, 2.3514616])
+        meters = chord_to_meters(np.linalg.norm(points[0] - points[1]))
+        assert meters == pytest.approx(
+            calculate_distance([-0.1277653, 51.5074456], [2.3514616, 48.8566969]),
+            rel=1e-6,
+        )
+
+    def test_nearest_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, 2000)))
+        longitudes = rng.uniform(-180, 180, 2000)
+        gazetteer = Gazetteer(
+            {"name": str(place), "country": "XX", "latitude": lat, "longitude": lon}
+            for place, (lat, lon) in enumerate(zip(latitudes, longitudes))
+        )
+        reverse_geocoder = ReverseGeocoder(gazetteer, leaf_size=8, chunk_size=100)
+
+        query_latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, 500)))
+        query_longitudes = rng.uniform(-180, 180, 500)
+        places, distances = reverse_geocoder.nearest(query_latitudes, query_longitudes)
+        chords = np.linalg.norm(
+            to_unit_vectors(query_latitudes, query_longitudes)[:, None, :]
+            - to_unit_vectors(latitudes, longitudes)[None, :, :],
+            axis=-1,
+        )
+        assert (places == chords.argmin(axis=1)).all()
+        assert distances == pytest.approx(chord_to_meters(chords.min(axis=1)))
+
+    def test_lookup(self, gazetteer):
+        reverse_geocoder = ReverseGeocoder(gazetteer)
+        location = reverse_geocoder.lookup(51.38, -0.1)
+        assert location["city"] == "Croydon"
+        assert location["country"] == "United Kingdom"
+        assert location["coordinates"] == [-0.101957, 51.3713049]
+        assert location["distance"] < 1500
+
+        # across the antimeridian
+        assert reverse_geocoder.lookup(-18.1, -179.9, radius=200)["city"] == "Suva"
+        # nothing within the radius
+        assert reverse_geocoder.lookup(0, 0) == {}
+        assert reverse_geocoder.lookup(51.38, -0.1, radius=0.5) == {}
+
+    def test_min_population(self, gazetteer):
+        reverse_geocoder = ReverseGeocoder(gazetteer, min_population=1000000)
+        assert len(reverse_geocoder) == 2
+        cities = reverse_geocoder.lookup_many([51.38, 48.8], [-0.1, 2.12])
+        assert [city["city"] for city in cities] == ["London", "Paris"]
+
+    def test_empty_gazetteer(self, gazetteer):
+        reverse_geocoder = ReverseGeocoder(gazetteer, min_population=10**9)
+        assert reverse_geocoder.lookup_many([51.38], [-0.1]) == [{}]
+
+
+class TestOfflineReverse:
+    @patch("requests.Session.get")
+    def test_coordinates_are_resolved_offline(self, mock_get, gazetteer_path):
+        offline_geocoder = Geocoder(
+            config={"gazetteer_path": gazetteer_path, "offline_reverse": True}
+        )
+
+        location = offline_geocoder.get_location_from_coordinates(48.8, 2.12)
+        assert location["city"] == "Versailles"
+        locations = offline_geocoder.get_locations_from_coordinates(
+            [(48.8, 2.12), (51.5, -0.12)]
+        )
+        assert [location["city"] for location in locations] == [
+            "Versailles",
+            "London",
+        ]
+        assert offline_geocoder.get_locations_from_coordinates([]) == []
+        assert not mock_get.called
+
+    @patch("requests.Session.get")
+    def test_misses_are_sent_to_photon(self, mock_get, gazetteer_path):
+        offline_geocoder = Geocoder(
+            config={"gazetteer_path": gazetteer_path, "offline_reverse": True}
+        )
+        mock_get.return_value.json.return_value = {
+            "features": [
+                {
+                    "geometry": {"coordinates": [-0.2, 5.6]},
+                    "properties": {"city": "Accra", "country": "Ghana"},
+                }
+            ]
+        }
+
+        assert offline_geocoder.get_location_from_coordinates(5.6, -0.2)["city"] == (
+            "Accra"
+        )
+        locations = offline_geocoder.get_locations_from_coordinates(
+            [(48.8, 2.12), (5.6, -0.2)]
+        )
+        assert [location["city"] for location in locations] == ["Versailles", "Accra"]
+        assert mock_get.call_count == 2
+        stats = offline_geocoder.backend_stats()["reverse"]
+        assert stats["gazetteer"]["misses"] == 1
+        assert stats["photon"]["hits"] == 2
+
+    def test_coordinates_are_resolved_offline_by_async_geocoder(self, gazetteer_path):
+        async def run():
+            async with AsyncGeocoder(
+                config={"gazetteer_path": gazetteer_path, "offline_reverse": True}
+            ) as offline_geocoder:
+                return await offline_geocoder.get_locations_from_coordinates(
+                    [(48.8, 2.12)]
+                )
+
+        assert asyncio.run(run())[0]["city"] == "Versailles"
+
+    def test_misses_are_sent_to_photon_by_async_geocoder(self, gazetteer_path):
+        async def run():
+            async with AsyncGeocoder(
+                config={"gazetteer_path": gazetteer_path, "offline_reverse": True}
+            ) as offline_geocoder:
+                with patch.object(
+                    offline_geocoder,
+                    "_reverse_photon",
+                    new_callable=AsyncMock,
+                    return_value={"city": "Accra"},
+                ) as mock_reverse:
+                    locations = await offline_geocoder.get_locations_from_coordinates(
+                        [(48.8, 2.12), (5.6, -0.2)]
+                    )
+                    return locations, mock_reverse.call_count
+
+        locations, calls = asyncio.run(run())
+        assert [location["city"] for location in locations] == ["Versailles", "Accra"]
+        assert calls == 1
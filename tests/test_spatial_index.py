@@ -0,0 +1,89 @@
+import numpy as np
+
+from geocoder_module.geocoder import Geocoder
+from geocoder_module.spatial_index import BoundingBoxIndex, split_antimeridian
+
+geocoder = Geocoder()
+
+
+def random_bounding_boxes(rng, size, width):
+    lon = rng.uniform(-180, 180, size)
+    lat = rng.uniform(-80, 80, size)
+    max_lon = lon + rng.uniform(0, width, size)
+    # some boxes cross the antimeridian
+    max_lon = np.where(max_lon > 180, max_lon - 360, max_lon)
+    return np.stack([lon, lat + rng.uniform(0, width, size), max_lon, lat], axis=1)
+
+
+def brute_force(bounding_boxes, bounding_box):
+    mins, maxs, boxes = split_antimeridian(bounding_boxes)
+    query_mins, query_maxs, _ = split_antimeridian([bounding_box])
+    found = set()
+    for query_min, query_max in zip(query_mins, query_maxs):
+        hit = ((mins <= query_max) & (query_min <= maxs)).all(axis=1)
+        found.update(boxes[hit].tolist())
+    return sorted(found)
+
+
+class TestBoundingBoxIndex:
+    def test_split_antimeridian(self):
+        mins, maxs, boxes = split_antimeridian(
+            [[172.0, -12.0, -178.5, -22.0], [2.2, 48.8, 2.5, 48.9]]
+        )
+        assert mins.tolist() == [[-180.0, -22.0], [2.2, 48.8], [172.0, -22.0]]
+        assert maxs.tolist() == [[-178.5, -12.0], [2.5, 48.9], [180.0, -12.0]]
+        assert boxes.tolist() == [0, 1, 0]
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        bounding_boxes = random_bounding_boxes(rng, 300, 30)
+        queries = random_bounding_boxes(rng, 500, 5)
+        index = BoundingBoxIndex(bounding_boxes, node_capacity=4, chunk_size=128)
+
+        results = index.query_many(queries)
+        assert len(results) == len(queries)
+        for query, result in zip(queries, results):
+            assert result == brute_force(bounding_boxes, query)
+
+        queries_ids, boxes = index.intersect_many(queries)
+        assert len(boxes) == sum(len(result) for result in results)
+        assert (np.diff(queries_ids) >= 0).all()
+
+    def test_small_and_empty_indexes(self):
+        assert BoundingBoxIndex([[0, 1, 1, 0]]).query([0.5, 2, 2, 0.5]) == [0]
+        assert BoundingBoxIndex([[0, 1, 1, 0]]).query([2, 3, 3, 2]) == []
+        assert BoundingBoxIndex(np.empty((0, 4))).query([0, 1, 1, 0]) == []
+        assert BoundingBoxIndex([[0, 1, 1, 0]]).query_many(np.empty((0, 4))) == []
+
+
+class TestReverseGeocodeBoundingBox:
+    def test_countries_in_bounding_box(self):
+        assert geocoder.reverse_geocode_bounding_box([2.2, 48.9, 2.5, 48.8]) == [
+            "france"
+        ]
+        # Fiji crosses the antimeridian, on both sides
+        assert "fiji" in geocoder.reverse_geocode_bounding_box([179.0, -16, 179.5, -17])
+        assert "fiji" in geocoder.reverse_geocode_bounding_box(
+            [-179.0, -16, -178.8, -17]
+        )
+        assert "fiji" in geocoder.reverse_geocode_bounding_box(
+            [179.0, -16, -179.5, -17]
+        )
+        assert (
+            geocoder.reverse_geocode_bounding_box([-140.0, -40.0, -139.5, -40.5]) == []
+        )
+
+    def test_batch(self):
+        bounding_boxes = [
+            [2.2, 48.9, 2.5, 48.8],
+            [150.5, -33.4, 151.3, -34.1],
+            [5.5, 50.5, 6.5, 49.5],
+        ]
+        results = geocoder.reverse_geocode_bounding_boxes(bounding_boxes)
+
+        assert results == [
+            geocoder.reverse_geocode_bounding_box(bounding_box)
+            for bounding_box in bounding_boxes
+        ]
+        assert results[1] == ["australia"]
+        assert {"belgium", "luxembourg", "germany"} <= set(results[2])
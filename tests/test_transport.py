@@ -0,0 +1,338 @@
+import time
+from unittest.mock import Mock, patch
+import pytest
+import requests
+
+from geocoder_module.geocoder import Geocoder
+from geocoder_module.transport import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    EndpointPool,
+    JSONResponse,
+    TokenBucket,
+    backoff_delay,
+    create_session,
+    endpoint_urls,
+    get_rate_limiter,
+    is_retryable,
+    is_upstream_failure,
+)
+
+geocoder = Geocoder()
+# base urls of the replicas configured by the environment
+PHOTON_URL = endpoint_urls("photon")[0]
+GEONAMES_URL = endpoint_urls("geonames")[0]
+
+
+class TestCreateSession:
+    def test_session_is_mounted_with_pool_size(self):
+        session = create_session(pool_size=4, pool_block=True)
+        for prefix in ["http://", "https://"]:
+            adapter = session.get_adapter(prefix + "photon.example")
+            assert adapter._pool_maxsize == 4
+            assert adapter._pool_block == True
+
+    def test_geocoder_uses_pool_size_from_config(self):
+        custom_geocoder = Geocoder(config={"pool_size": 3})
+        adapter = custom_geocoder.sessions["photon"].get_adapter(
+            "http://photon.example"
+        )
+        assert adapter._pool_maxsize == 3
+        assert custom_geocoder.sessions["photon"] is not (
+            custom_geocoder.sessions["geonames"]
+        )
+
+    def test_session_decodes_with_given_decoder_and_asks_for_gzip(self):
+        loads = Mock(return_value={"features": []})
+        session = create_session(loads=loads)
+        assert "gzip" in session.headers["Accept-Encoding"]
+        assert session.get_adapter("http://photon.example").loads is loads
+
+        response = JSONResponse()
+        response._content = b'{"features": []}'
+        response.loads = loads
+        assert response.json() == {"features": []}
+        loads.assert_called_once_with(b'{"features": []}')
+
+
+class TestQueryUpstream:
+    @patch("requests.Session.get")
+    def test_photon_queries_go_through_pooled_session(self, mock_get):
+        mock_get.return_value.json.return_value = {"features": []}
+        geocoder._get_geocode_info("sydney")
+        geocoder._get_geocode_info("madrid")
+
+        assert mock_get.call_count == 2
+        assert mock_get.call_args[0][0] == PHOTON_URL + "/api?"
+
+
+class TestCircuitBreaker:
+    @patch("geocoder_module.transport.time.monotonic")
+    def test_breaker_opens_and_recovers(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.allow_request() == False
+
+        mock_monotonic.return_value = 10
+        assert breaker.state == "half_open"
+        assert breaker.allow_request() == True
+        # only one trial query is let through
+        assert breaker.allow_request() == False
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    @patch("geocoder_module.transport.time.monotonic")
+    def test_failed_trial_query_opens_breaker_again(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        breaker.record_failure()
+        mock_monotonic.return_value = 10
+        assert breaker.allow_request() == True
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+
+class TestRetries:
+    def test_backoff_delay_is_bounded(self):
+        for attempt in range(10):
+            assert 0 <= backoff_delay(attempt, 0.5, 8) <= min(8, 0.5 * 2**attempt)
+
+    def test_only_temporary_errors_are_retryable(self):
+        unavailable = requests.HTTPError(response=Mock(status_code=503))
+        not_found = requests.HTTPError(response=Mock(status_code=404))
+
+        assert is_retryable(requests.ConnectTimeout()) == True
+        assert is_retryable(requests.ConnectionError()) == True
+        assert is_retryable(unavailable) == True
+        assert is_retryable(not_found) == False
+        assert is_retryable(ValueError()) == False
+
+    def test_server_errors_are_upstream_failures(self):
+        server_error = requests.HTTPError(response=Mock(status_code=500))
+        not_found = requests.HTTPError(response=Mock(status_code=404))
+
+        assert is_retryable(server_error) == False
+        assert is_upstream_failure(server_error) == True
+        assert is_upstream_failure(requests.ReadTimeout()) == True
+        assert is_upstream_failure(not_found) == False
+        assert is_upstream_failure(ValueError()) == False
+
+    @patch("geocoder_module.geocoder.time.sleep")
+    @patch("requests.Session.get")
+    def test_server_error_is_not_retried_but_counted(self, mock_get, mock_sleep):
+        geocoder = Geocoder(
+            config={
+                "endpoints": {"photon": ["http://a", "http://b"]},
+                "breaker_failure_threshold": 2,
+                "endpoint_failure_threshold": 1,
+            }
+        )
+        mock_get.return_value.raise_for_status.side_effect = requests.HTTPError(
+            response=Mock(status_code=500)
+        )
+
+        with pytest.raises(requests.HTTPError):
+            geocoder._query_upstream("photon", "url_api_endpoint", {"q": "sydney"})
+        assert mock_get.call_count == 1
+        assert mock_sleep.call_count == 0
+        assert geocoder.endpoint_states()["photon"]["http://a"]["healthy"] == False
+
+        with pytest.raises(requests.HTTPError):
+            geocoder._query_upstream("photon", "url_api_endpoint", {"q": "sydney"})
+        assert geocoder.breaker_states()["photon"] == "open"
+
+    @patch("requests.Session.get")
+    def test_client_error_does_not_count_as_failure(self, mock_get):
+        geocoder = Geocoder(config={"breaker_failure_threshold": 1})
+        mock_get.return_value.raise_for_status.side_effect = requests.HTTPError(
+            response=Mock(status_code=400)
+        )
+
+        with pytest.raises(requests.HTTPError):
+            geocoder._query_upstream("photon", "url_api_endpoint", {"q": "sydney"})
+        assert geocoder.breaker_states()["photon"] == "closed"
+
+    @patch("geocoder_module.geocoder.time.sleep")
+    @patch("requests.Session.get")
+    def test_query_is_retried_after_connection_error(self, mock_get, mock_sleep):
+        geocoder = Geocoder()
+        response = Mock()
+        response.json.return_value = {"features": []}
+        mock_get.side_effect = [requests.ConnectionError("reset"), response]
+
+        assert geocoder._get_geocode_info("sydney") == []
+        assert mock_get.call_count == 2
+        assert mock_get.call_args[1]["timeout"] == (3.05, 10)
+        assert mock_sleep.call_count == 1
+
+    @patch("geocoder_module.geocoder.time.sleep")
+    @patch("requests.Session.get")
+    def test_open_breaker_fails_fast(self, mock_get, mock_sleep):
+        geocoder = Geocoder(config={"max_retries": 1, "breaker_failure_threshold": 2})
+        mock_get.side_effect = requests.ReadTimeout("slow")
+
+        assert geocoder.get_location_info("sydney") == []
+        assert geocoder.breaker_states() == {"photon": "open", "geonames": "closed"}
+        assert geocoder.get_location_info("sydney") == []
+        assert mock_get.call_count == 2
+
+
+class TestRateLimiting:
+    @patch("geocoder_module.transport.time.monotonic")
+    def test_token_bucket_allows_burst_then_rate(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        bucket = TokenBucket(rate=2, burst=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0.5
+        assert bucket.reserve() == 1.0
+
+        mock_monotonic.return_value = 10
+        assert bucket.reserve() == 0
+
+    def test_rate_limiter_is_shared_between_geocoders(self):
+        first = Geocoder(config={"rate_limits": {"photon": 5, "geonames": None}})
+        second = Geocoder(config={"rate_limits": {"photon": 5, "geonames": None}})
+        assert first.rate_limiters["photon"] is second.rate_limiters["photon"]
+        assert first.rate_limiters["geonames"] is None
+        assert get_rate_limiter("photon", 5, 10) is first.rate_limiters["photon"]
+
+    @patch("geocoder_module.geocoder.time.sleep")
+    @patch("requests.Session.get")
+    def test_queries_wait_for_rate_limiter(self, mock_get, mock_sleep):
+        limited_geocoder = Geocoder(
+            config={"rate_limits": {"photon": 1000, "geonames": None}}
+        )
+        limited_geocoder.rate_limiters["photon"] = Mock()
+        limited_geocoder.rate_limiters["photon"].reserve.return_value = 0.25
+        mock_get.return_value.json.return_value = {"features": []}
+
+        limited_geocoder._get_geocode_info("sydney")
+        mock_sleep.assert_called_once_with(0.25)
+
+
+class TestAdaptiveConcurrency:
+    def test_limit_grows_on_fast_queries(self):
+        limiter = AdaptiveConcurrencyLimiter(maximum=10, latency_target=1.0)
+        for _ in range(100):
+            limiter.acquire()
+            limiter.release(0.1, failed=False)
+        assert limiter.limit == 10
+        assert limiter.in_flight == 0
+
+    @patch("geocoder_module.transport.time.monotonic")
+    def test_limit_is_cut_once_per_latency_target(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        limiter = AdaptiveConcurrencyLimiter(maximum=10, latency_target=1.0)
+        limiter.acquire()
+        limiter.acquire()
+        limiter.release(0.1, failed=True)
+        limiter.release(2.0, failed=False)
+        assert limiter.limit == 4
+
+        mock_monotonic.return_value = 101
+        limiter.acquire()
+        limiter.release(2.0, failed=False)
+        assert limiter.limit == 2
+
+    @patch("requests.Session.get")
+    def test_geocoder_reports_concurrency_limits(self, mock_get):
+        adaptive_geocoder = Geocoder(config={"adaptive_concurrency": True})
+        mock_get.return_value.json.return_value = {"features": []}
+        adaptive_geocoder._get_geocode_info("sydney")
+
+        limits = adaptive_geocoder.concurrency_limits()
+        assert limits["photon"] > limits["geonames"] == 8
+
+
+class TestEndpointPool:
+    def test_endpoints_are_read_from_environment(self):
+        with patch.dict("os.environ", {"PHOTON_SERVER": "http://a, http://b"}):
+            assert endpoint_urls("photon") == ["http://a", "http://b"]
+        assert endpoint_urls("photon", ["http://c"]) == ["http://c"]
+
+    def test_least_outstanding_endpoint_is_chosen(self):
+        pool = EndpointPool(["a", "b", "c"])
+        first = pool.acquire()
+        second = pool.acquire()
+        third = pool.acquire()
+        assert {first.url, second.url, third.url} == {"a", "b", "c"}
+
+        pool.release(second, 0.1, failed=False)
+        assert pool.acquire() is second
+        assert pool.acquire(exclude=first).url != "a"
+
+    @patch("geocoder_module.transport.time.monotonic")
+    def test_failing_endpoint_is_skipped_until_recovery(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        pool = EndpointPool(["a", "b"], failure_threshold=2, recovery_timeout=10)
+        for _ in range(2):
+            endpoint = pool.acquire(exclude=pool.endpoints[1])
+            pool.release(endpoint, 0.1, failed=True)
+        assert pool.states()["a"] == {"healthy": False, "outstanding": 0}
+        assert [pool.acquire().url for _ in range(3)] == ["b", "b", "b"]
+
+        mock_monotonic.return_value = 10
+        assert pool.acquire().url == "a"
+
+    def test_latency_percentile(self):
+        pool = EndpointPool(["a"])
+        assert pool.latency_percentile(95) is None
+        for latency in range(100):
+            pool.release(pool.acquire(), latency, failed=False)
+        assert pool.latency_percentile(95) == 95
+
+    @patch("requests.Session.get")
+    def test_queries_are_spread_across_replicas(self, mock_get):
+        replicated_geocoder = Geocoder(
+            config={"endpoints": {"photon": ["http://a", "http://b"]}}
+        )
+        mock_get.return_value.json.return_value = {"features": []}
+        replicated_geocoder._get_geocode_info("sydney")
+        replicated_geocoder._get_geocode_info("madrid")
+
+        urls = [call[0][0] for call in mock_get.call_args_list]
+        assert urls == ["http://a/api?", "http://b/api?"]
+
+    @patch("requests.Session.get")
+    def test_slow_query_is_hedged_to_another_replica(self, mock_get):
+        hedged_geocoder = Geocoder(
+            config={
+                "endpoints": {"photon": ["http://slow", "http://fast"]},
+                "hedged_requests": True,
+                "hedge_delay": 0.01,
+            }
+        )
+
+        def photon_output(url, **kwargs):
+            if url.startswith("http://slow"):
+                time.sleep(0.2)
+            response = Mock()
+            response.json.return_value = {"features": [], "url": url}
+            return response
+
+        mock_get.side_effect = photon_output
+        response = hedged_geocoder._query_upstream(
+            "photon", "url_api_endpoint", {"q": "sydney"}
+        )
+        assert response["url"] == "http://fast/api?"
+        assert mock_get.call_count == 2
+
+    @patch("requests.Session.get")
+    def test_check_endpoints_marks_unreachable_replicas(self, mock_get):
+        replicated_geocoder = Geocoder(
+            config={"endpoints": {"photon": ["http://a", "http://b"]}}
+        )
+        mock_get.side_effect = [
+            Mock(status_code=200),
+            requests.ConnectionError("refused"),
+            Mock(status_code=404),
+        ]
+        states = replicated_geocoder.check_endpoints()
+        assert states["photon"]["http://a"]["healthy"] == True
+        assert states["photon"]["http://b"]["healthy"] == False
+        assert states["geonames"][GEONAMES_URL]["healthy"] == True
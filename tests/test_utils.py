@@ -0,0 +1,15 @@
+from geocoder_module.utils import geohash
+
+
+class TestGeohash:
+    def test_geohash_of_known_coordinates(self):
+        assert geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+        assert geohash(51.5074456, -0.1277653) == "gcpvj0"
+
+    def test_close_coordinates_share_the_cell(self):
+        assert geohash(51.5074, -0.1278, 6) == geohash(51.5072, -0.1275, 6)
+        assert geohash(51.5074, -0.1278, 6) != geohash(51.5174, -0.1278, 6)
+
+    def test_precision_sets_the_length(self):
+        assert len(geohash(0, 0, 3)) == 3
+        assert geohash(51.5074, -0.1278, 9).startswith(geohash(51.5074, -0.1278, 4))
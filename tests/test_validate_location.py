@@ -300,13 +300,14 @@ class TestDoubleCheckCountries:
         ner_tags = [ner_tag_united_kingdom]
         # Generate expected output from nlp-api response and add it to mock
 
-        mock_get_location_info.side_effect = [
-            [location_output_united_kingdom],
-            [location_output_london_uk],
-            [location_output_crewe_uk],
-            [location_output_london_uk],
-            [location_output_crewe_uk],
-        ]
+        resolved_locations = {
+            "United Kingdom": [location_output_united_kingdom],
+            "London": [location_output_london_uk],
+            "Crewe": [location_output_crewe_uk],
+        }
+        mock_get_location_info.side_effect = (
+            lambda location, **kwargs: resolved_locations[location]
+        )
 
         # Get response
         response = geocoder.double_check_countries(locations, ner_tags)
@@ -319,6 +320,35 @@ class TestDoubleCheckCountries:
         ]
 
         assert response == expected_output
+        # every (name, country) lookup is resolved only once
+        assert mock_get_location_info.call_count == 3
+
+
+class TestDoubleCheckCountriesPlan:
+    @patch("geocoder_module.geocoder.Geocoder.get_location_info")
+    def test_lookups_are_deduplicated_and_reused(self, mock_get_location_info):
+        locations = [
+            {"name": f"Town {i % 5}", "country": "United States"} for i in range(12)
+        ] + [{"name": f"Town {i}", "country": "France"} for i in range(8)]
+        ner_tags = [ner_tag_belgium] + [
+            {"name": location["name"], "label": "location"} for location in locations
+        ]
+        mock_get_location_info.side_effect = lambda location, **kwargs: [
+            {"name": location, "country": kwargs["country"]}
+        ]
+
+        response = geocoder.double_check_countries(locations, ner_tags)
+
+        assert [location["country"] for location in response] == ["United States"] * 20
+        # one lookup per distinct location moved to the majority country,
+        # NER countries are not normalized as there is no tie to break
+        assert sorted(call[0][0] for call in mock_get_location_info.call_args_list) == [
+            f"Town {i}" for i in range(8)
+        ]
+        assert all(
+            call[1]["country"] == "United States"
+            for call in mock_get_location_info.call_args_list
+        )
 
 
 class TestFilterNerCountries:
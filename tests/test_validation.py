@@ -0,0 +1,172 @@
+from unittest.mock import patch
+
+from geocoder_module.backends import Backend
+from geocoder_module.cache import LRUCache
+from geocoder_module.geocoder import Geocoder
+from geocoder_module.validation import (
+    OsmValuePolicy,
+    ValidationPolicies,
+)
+
+
+def photon_feature(name, country, osm_value, importance=None):
+    properties = {
+        "osm_type": "R",
+        "osm_id": 1,
+        "extent": [1.0, 2.0, 3.0, 0.0],
+        "country": country,
+        "osm_key": "place",
+        "osm_value": osm_value,
+        "name": name,
+        "type": osm_value,
+    }
+    if importance is not None:
+        properties["importance"] = importance
+    return {
+        "geometry": {"coordinates": [2.0, 1.0], "type": "Point"},
+        "type": "Feature",
+        "properties": properties,
+    }
+
+
+class TestValidationPolicies:
+    def test_first_deciding_policy_is_counted(self):
+        hints = LRUCache(10)
+        hints.set(("bavaria", "germany"), {"osm_value": "state", "importance": 0.3})
+        hints.set(("munich", "germany"), {"osm_value": "city", "importance": 0.8})
+        policies = ValidationPolicies([OsmValuePolicy(hints, ["state"], 0.5)])
+
+        verdicts, pending = policies.decide(
+            {
+                ("bavaria", "germany"): {},
+                ("munich", "germany"): {},
+                ("dachau", "germany"): {},
+            }
+        )
+
+        assert verdicts == {("bavaria", "germany"): True, ("munich", "germany"): True}
+        assert pending == [("dachau", "germany")]
+        assert policies.stats() == {"osm_value": 2, "validated": 1}
+
+    def test_authoritative_backend_hits_are_not_validated(self):
+        geocoder = Geocoder()
+        verdicts, pending = geocoder.validation_policies.decide(
+            {("sydney", "australia"): {}}, Backend(authoritative=True)
+        )
+
+        assert verdicts == {("sydney", "australia"): True}
+        assert pending == []
+        assert geocoder.validation_stats()["authoritative"] == 1
+
+
+class TestGeocoderValidationPolicies:
+    @patch("requests.Session.get")
+    def test_country_hits_skip_geonames(self, mock_get):
+        geocoder = Geocoder()
+        response = geocoder._validate_locations(
+            [{"name": "France", "country": "France"}], "France"
+        )
+
+        assert response == [{"name": "France", "country": "France"}]
+        assert not mock_get.called
+        assert geocoder.validation_stats()["country"] == 1
+
+    @patch("requests.Session.get")
+    def test_osm_value_policy_is_opt_in(self, mock_get):
+        geocoder = Geocoder(config={"backend_chains": {"search": ["photon"]}})
+        mock_get.return_value.json.side_effect = [
+            {"features": [photon_feature("Bavaria", "Germany", "state")]},
+            {
+                "name": "Bavaria",
+                "latitude": "48.95",
+                "longitude": "11.40",
+                "country": "Germany",
+            },
+        ]
+
+        response = geocoder.get_location_info("Bavaria", validate=True)
+
+        assert [hit["name"] for hit in response] == ["Bavaria"]
+        # the Photon search and the Geonames validation
+        assert mock_get.call_count == 2
+        assert geocoder.validation_hints is None
+        assert "osm_value" not in geocoder.validation_stats()
+
+    @patch("requests.Session.get")
+    def test_trusted_osm_value_skips_geonames(self, mock_get):
+        geocoder = Geocoder(
+            config={
+                "backend_chains": {"search": ["photon"]},
+                "validation_policies": ["authoritative", "country", "osm_value"],
+            }
+        )
+        mock_get.return_value.json.return_value = {
+            "features": [photon_feature("Bavaria", "Germany", "state")]
+        }
+
+        response = geocoder.get_location_info("Bavaria", validate=True)
+
+        assert [hit["name"] for hit in response] == ["Bavaria"]
+        # only the Photon search was sent
+        assert mock_get.call_count == 1
+        assert geocoder.validation_stats() == {
+            "authoritative": 0,
+            "country": 0,
+            "osm_value": 1,
+            "validated": 0,
+        }
+
+    @patch("requests.Session.get")
+    def test_other_osm_values_are_validated_then_cached(self, mock_get):
+        geocoder = Geocoder(
+            config={
+                "backend_chains": {"search": ["photon"]},
+                "validation_cache_size": 10,
+            }
+        )
+        mock_get.return_value.json.side_effect = [
+            {"features": [photon_feature("Dachau", "Germany", "town")]},
+            {
+                "name": "Dachau",
+                "latitude": "48.26",
+                "longitude": "11.43",
+                "country": "Germany",
+            },
+        ]
+
+        response = geocoder.get_location_info("Dachau", validate=True)
+        assert [hit["name"] for hit in response] == ["Dachau"]
+        assert mock_get.call_count == 2
+
+        response = geocoder._validate_locations(response, "Dachau")
+        assert [hit["name"] for hit in response] == ["Dachau"]
+        assert mock_get.call_count == 2
+        assert geocoder.validation_stats()["validated"] == 1
+        assert geocoder.validation_stats()["cached"] == 1
+        # the miss of the first validation is counted once, by the policy
+        assert geocoder.cache_stats()["validation"]["misses"] == 1
+        assert geocoder.cache_stats()["validation"]["hits"] == 1
+        assert geocoder.backend_stats()["validate"]["cache"]["misses"] == 0
+
+    def test_disabled_and_unknown_policies(self):
+        geocoder = Geocoder(
+            config={
+                "validation_policies": [
+                    "authoritative",
+                    "country",
+                    "cached",
+                    "osm_value",
+                ],
+                "validation_hints_size": 0,
+            }
+        )
+        assert list(geocoder.validation_stats()) == [
+            "authoritative",
+            "country",
+            "validated",
+        ]
+        try:
+            Geocoder(config={"validation_policies": ["unknown"]})
+            assert False
+        except ValueError:
+            pass